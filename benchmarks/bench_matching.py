@@ -0,0 +1,128 @@
+"""Benchmark interpreted, compiled and per-page condition evaluation.
+
+Run with ``python benchmarks/bench_matching.py``.
+"""
+
+import time
+from collections.abc import Callable, Sequence
+
+from feedly_entries_processor.conditions import (
+    MatchAllCondition,
+    RegexPartialMatchCondition,
+    StreamIdGlobMatchCondition,
+    StreamIdInListCondition,
+)
+from feedly_entries_processor.conditions.base_condition import BaseCondition
+from feedly_entries_processor.feedly_client import (
+    STREAM_PAGE_SIZE,
+    Entry,
+    Origin,
+    Summary,
+)
+
+_PAGES = 20
+_REPEATS = 5
+
+
+def _make_page(page_number: int) -> list[Entry]:
+    return [
+        Entry(
+            id=f"entry-{page_number}-{i}",
+            title=f"Entry {i} about python" if i % 7 == 0 else f"Entry {i}",
+            author=f"author-{i % 13}",
+            canonical_url=f"https://example.com/{page_number}/{i}",
+            origin=Origin(
+                html_url="https://example.com",
+                stream_id=f"feed/https://example.com/{i % 50}",
+                title="Example",
+            ),
+            published=1_700_000_000_000 + i,
+            summary=Summary(content=f"<p>Summary for entry {i}.</p>" * 20),
+        )
+        for i in range(STREAM_PAGE_SIZE)
+    ]
+
+
+def _per_entry(condition: BaseCondition, page: Sequence[Entry]) -> list[bool]:
+    return [condition.matches(entry) for entry in page]
+
+
+def _make_compiled(
+    compile_condition: Callable[[BaseCondition], Callable[[Entry], bool]],
+) -> Callable[[BaseCondition, Sequence[Entry]], list[bool]]:
+    cache: dict[BaseCondition, Callable[[Entry], bool]] = {}
+
+    def evaluate(condition: BaseCondition, page: Sequence[Entry]) -> list[bool]:
+        predicate = cache.get(condition)
+        if predicate is None:
+            predicate = cache[condition] = compile_condition(condition)
+        return [predicate(entry) for entry in page]
+
+    return evaluate
+
+
+def _make_per_page() -> Callable[[BaseCondition, Sequence[Entry]], list[bool]]:
+    cache: dict[BaseCondition, Callable[[Sequence[Entry]], list[bool]]] = {}
+
+    def evaluate(condition: BaseCondition, page: Sequence[Entry]) -> list[bool]:
+        matches_batch = cache.get(condition)
+        if matches_batch is None:
+            matches_batch = cache[condition] = condition.compile_batch()
+        return matches_batch(page)
+
+    return evaluate
+
+
+def _entries_per_second(
+    evaluate: Callable[[BaseCondition, Sequence[Entry]], list[bool]],
+    condition: BaseCondition,
+    pages: Sequence[Sequence[Entry]],
+) -> float:
+    best = float("inf")
+    for _ in range(_REPEATS):
+        start = time.perf_counter()
+        for page in pages:
+            evaluate(condition, page)
+        best = min(best, time.perf_counter() - start)
+    return sum(len(page) for page in pages) / best
+
+
+def main() -> None:
+    """Print entries/sec for each condition type and evaluation strategy."""
+    pages = [_make_page(page_number) for page_number in range(_PAGES)]
+    conditions: dict[str, BaseCondition] = {
+        "match_all": MatchAllCondition(),
+        "stream_id_in_list": StreamIdInListCondition(
+            stream_ids=frozenset(f"feed/https://example.com/{i}" for i in range(25)),
+        ),
+        "stream_id_glob_match": StreamIdGlobMatchCondition(
+            patterns=frozenset(f"feed/https://example.com/{i}*" for i in range(25)),
+        ),
+        "regex_title": RegexPartialMatchCondition(
+            fields=("title",),
+            patterns=("python",),
+        ),
+        "regex_summary": RegexPartialMatchCondition(
+            fields=("title", "summary_contents"),
+            patterns=("(?i)rust", "python", r"\bgo\b"),
+        ),
+    }
+
+    strategies = {
+        "interpreted": _per_entry,
+        "compiled": _make_compiled(lambda condition: condition.compile()),
+        "per page": _make_per_page(),
+    }
+
+    print(f"{'condition':<22}" + "".join(f"{name:>16}" for name in strategies))
+    for name, condition in conditions.items():
+        expected = _per_entry(condition, pages[0])
+        rates = []
+        for evaluate in strategies.values():
+            assert evaluate(condition, pages[0]) == expected  # noqa: S101
+            rates.append(_entries_per_second(evaluate, condition, pages))
+        print(f"{name:<22}" + "".join(f"{rate:>14,.0f}/s" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark serial versus process-pool matching for CPU-bound rule sets.
+
+Run with ``python benchmarks/bench_parallel_matching.py [WORKERS ...]``.
+"""
+
+import sys
+import time
+from itertools import batched
+
+from feedly_entries_processor.actions import LogAction
+from feedly_entries_processor.conditions import RegexPartialMatchCondition
+from feedly_entries_processor.config_loader import Rule
+from feedly_entries_processor.feedly_client import STREAM_PAGE_SIZE, Entry, Summary
+from feedly_entries_processor.matching import create_matcher
+from feedly_entries_processor.sources import AllSource
+
+_RULES = 200
+_ENTRIES = 2 * STREAM_PAGE_SIZE
+
+
+def _make_entries() -> list[Entry]:
+    return [
+        Entry(
+            id=f"entry-{i}",
+            title=f"Entry {i}",
+            summary=Summary(content=f"<p>Paragraph {i} of a long summary.</p>" * 40),
+        )
+        for i in range(_ENTRIES)
+    ]
+
+
+def _make_rules() -> tuple[Rule, ...]:
+    return tuple(
+        Rule(
+            name=f"rule-{i}",
+            source=AllSource(),
+            condition=RegexPartialMatchCondition(
+                fields=("title", "summary_contents"),
+                patterns=(rf"(?i)\bkeyword{i}\b", rf"topic-{i}-[a-z]+"),
+            ),
+            action=LogAction(),
+        )
+        for i in range(_RULES)
+    )
+
+
+def main() -> None:
+    """Print entries/sec for serial matching and for each worker count given."""
+    entries = _make_entries()
+    rules = _make_rules()
+    pages = list(batched(entries, STREAM_PAGE_SIZE, strict=False))
+    worker_counts = [int(arg) for arg in sys.argv[1:]] or [0, 2, 4]
+
+    print(f"{len(rules)} regex rules, {len(entries)} entries")
+    for workers in worker_counts:
+        with create_matcher(rules, workers=workers) as matcher:
+            matcher.match_page(pages[0][:1])  # start the workers before timing
+            start = time.perf_counter()
+            for page in pages:
+                matcher.match_page(page)
+            elapsed = time.perf_counter() - start
+        label = "serial" if workers == 0 else f"{workers} workers"
+        print(f"{label:<12}{len(entries) / elapsed:>12,.0f} entries/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """CLI application."""
 
 import json
+from datetime import UTC, datetime
 from pathlib import Path
 from typing import Annotated
 
@@ -10,7 +11,9 @@ from logzero import logger
 
 from feedly_entries_processor.config_loader import Config, load_config
 from feedly_entries_processor.exceptions import ConfigError, FeedlyEntriesProcessorError
+from feedly_entries_processor.ledger import open_ledger, rule_fingerprint
 from feedly_entries_processor.process import process
+from feedly_entries_processor.settings import ProcessingSettings
 
 app = typer.Typer()
 
@@ -29,8 +32,50 @@ def show_config_schema_callback(*, value: bool) -> None:
     raise typer.Exit
 
 
+def _format_time(timestamp: float | None) -> str:
+    if timestamp is None:
+        return "-"
+    return datetime.fromtimestamp(timestamp, tz=UTC).isoformat(timespec="seconds")
+
+
+def manage_ledger(config_files: list[Path], *, show_stats: bool, prune: bool) -> None:
+    """Prune the ledger configured by LEDGER_PATH and/or show what it records.
+
+    Records are attributed to the rules of the given configuration; records
+    of rules no longer configured are what pruning removes besides expired
+    ones.
+    """
+    try:
+        config = load_config(config_files)
+    except ConfigError:
+        logger.exception("Configuration validation failed.")
+        raise typer.Exit(code=1) from None
+
+    ledger = open_ledger(ProcessingSettings())
+    if ledger is None:
+        logger.error("LEDGER_PATH must be set to use the ledger options.")
+        raise typer.Exit(code=1)
+
+    if prune:
+        deleted = ledger.prune(keep=config.rules)
+        typer.echo(f"Deleted {deleted} ledger records.")
+
+    if show_stats:
+        stats = ledger.stats()
+        names = {rule_fingerprint(rule): rule.name for rule in config.rules}
+        typer.echo(
+            f"{stats.entries} ledger records "
+            f"(oldest: {_format_time(stats.oldest)}, newest: {_format_time(stats.newest)})"
+        )
+        for fingerprint, count in stats.by_rule.items():
+            name = names.get(
+                fingerprint, f"rule no longer configured ({fingerprint[:12]})"
+            )
+            typer.echo(f"  {count}\t{name}")
+
+
 @app.command()
-def main(
+def main(  # noqa: PLR0913
     config_files: Annotated[
         list[Path],
         typer.Argument(exists=True, file_okay=True, dir_okay=True),
@@ -56,11 +101,32 @@ def main(
             callback=show_config_schema_callback,
         ),
     ] = False,
+    ledger_stats: Annotated[
+        bool,
+        typer.Option(
+            "--ledger-stats",
+            help="Show how many entries each rule has recorded in the ledger and exit.",
+        ),
+    ] = False,
+    prune_ledger: Annotated[
+        bool,
+        typer.Option(
+            "--prune-ledger",
+            help=(
+                "Delete expired ledger records, and those of rules that are no "
+                "longer configured, and exit."
+            ),
+        ),
+    ] = False,
 ) -> None:
     """A CLI application to process Feedly entries."""  # noqa: D401
     if json_log:
         logzero.json()
 
+    if ledger_stats or prune_ledger:
+        manage_ledger(config_files, show_stats=ledger_stats, prune=prune_ledger)
+        raise typer.Exit
+
     if validate_config:
         try:
             load_config(config_files)
@@ -4,20 +4,38 @@ from feedly_entries_processor.actions.add_todoist_task_action import (
     AddTodoistTaskAction,
 )
 from feedly_entries_processor.actions.log_action import LogAction
+from feedly_entries_processor.actions.mark_feedly_entries_action import (
+    MarkFeedlyEntriesAction,
+)
 from feedly_entries_processor.actions.remove_from_feedly_tag_action import (
     RemoveFromFeedlyTagAction,
 )
+from feedly_entries_processor.actions.run_in_parallel_action import RunInParallelAction
 from feedly_entries_processor.actions.run_in_sequence_action import RunInSequenceAction
+from feedly_entries_processor.actions.webhook_action import WebhookAction
+from feedly_entries_processor.actions.write_ndjson_action import WriteNdjsonAction
 
 __all__ = [
     "AddTodoistTaskAction",
     "LogAction",
+    "MarkFeedlyEntriesAction",
     "RemoveFromFeedlyTagAction",
+    "RunInParallelAction",
     "RunInSequenceAction",
+    "WebhookAction",
+    "WriteNdjsonAction",
 ]
 
 Action = (
-    LogAction | AddTodoistTaskAction | RemoveFromFeedlyTagAction | RunInSequenceAction
+    LogAction
+    | AddTodoistTaskAction
+    | RemoveFromFeedlyTagAction
+    | MarkFeedlyEntriesAction
+    | WriteNdjsonAction
+    | WebhookAction
+    | RunInSequenceAction
+    | RunInParallelAction
 )
 
 RunInSequenceAction.model_rebuild()
+RunInParallelAction.model_rebuild()
@@ -1,40 +1,112 @@
 """Add Todoist task action."""
 
-from typing import Literal
+from collections.abc import Sequence
+from itertools import batched
+from typing import Any, Literal, NoReturn
+from uuid import NAMESPACE_URL, uuid5
 
 from logzero import logger
 from pydantic import Field
-from todoist_api_python.api import TodoistAPI
 
 from feedly_entries_processor.actions.base_action import BaseAction
-from feedly_entries_processor.exceptions import TodoistApiError
+from feedly_entries_processor.exceptions import (
+    InvalidEntryError,
+    PartialFailureError,
+    TodoistApiError,
+)
 from feedly_entries_processor.feedly_client import Entry
 from feedly_entries_processor.settings import TodoistSettings
-from feedly_entries_processor.todoist_client import add_task_with_retry
+from feedly_entries_processor.todoist_client import (
+    PERSISTENT_STATUS_CODES,
+    SYNC_COMMAND_LIMIT,
+    SyncStatus,
+    add_task_with_retry,
+    build_item_add_command,
+    sync_commands_with_retry,
+    todoist_clients,
+)
+
+# Namespace of the uuids of ``item_add`` commands, derived from the action and entry.
+_COMMAND_NAMESPACE = uuid5(NAMESPACE_URL, "feedly-entries-processor/add_todoist_task")
 
 
 class AddTodoistTaskAction(BaseAction):
-    """An action that adds Feedly entries as tasks in Todoist."""
+    """An action that adds Feedly entries as tasks in Todoist.
+
+    With ``use_sync_api``, the matches of a page are sent as ``item_add``
+    commands through the Todoist Sync API, up to `SYNC_COMMAND_LIMIT` per
+    request, instead of one REST request per entry. A command's uuid is
+    derived from the action's configuration and the entry, so that an entry
+    retried, in this run or a later one, is not added twice.
+
+    With ``skip_existing``, the URLs in the open tasks of the project are
+    fetched once per run; entries whose URL is already there, or was added
+    earlier in the run, are skipped without an API call.
+    """
 
     name: Literal["add_todoist_task"] = "add_todoist_task"
     project_id: str
     due_string: str | None = None
     priority: Literal[1, 2, 3, 4] | None = None
     labels: frozenset[str] | None = None
+    use_sync_api: bool = False
+    skip_existing: bool = False
     todoist_settings: TodoistSettings = Field(default_factory=TodoistSettings)
 
-    def _process(self, entry: Entry) -> None:
-        """Process a Feedly entry by adding it as a task to Todoist."""
+    @property
+    def supports_batch(self) -> bool:
+        """Return True if tasks are added in batches through the Sync API."""
+        return self.use_sync_api
+
+    @property
+    def entries_per_request(self) -> int:
+        """Return the number of entries one Sync API request covers, or 1 without it."""
+        return SYNC_COMMAND_LIMIT if self.use_sync_api else 1
+
+    def _api_token(self) -> str:
         if self.todoist_settings.todoist_api_token is None:
             error_message = "TODOIST_API_TOKEN must be set (e.g. via environment or .env) when using add_todoist_task action"
             raise ValueError(error_message)
+        return self.todoist_settings.todoist_api_token.get_secret_value()
+
+    def _raise_api_error(self, exc: TodoistApiError) -> NoReturn:
+        if exc.details.get("status_code") in PERSISTENT_STATUS_CODES:
+            self._set_persistent_error(exc)
+        raise exc
+
+    def _reserve_url(self, api_token: str, url: str) -> bool:
+        """Reserve a URL in the shared index of the project, if enabled.
+
+        Returns False if the URL is already in Todoist, or reserved by
+        another worker or an earlier entry.
+        """
+        if not self.skip_existing:
+            return True
+        try:
+            return todoist_clients.reserve_url(api_token, self.project_id, url)
+        except TodoistApiError as exc:
+            self._raise_api_error(exc)
+
+    def _release_url(self, api_token: str, url: str) -> None:
+        """Release a URL reserved for a task that could not be created."""
+        if self.skip_existing:
+            todoist_clients.release_url(api_token, self.project_id, url)
+
+    def _process(self, entry: Entry) -> None:
+        """Process a Feedly entry by adding it as a task to Todoist."""
+        api_token = self._api_token()
 
         if entry.effective_url is None:
             error_message = "Entry must have a URL (canonical_url or alternate) to be processed by AddTodoistTaskAction."
-            raise ValueError(error_message)
+            raise InvalidEntryError(error_message)
 
-        api_token = self.todoist_settings.todoist_api_token.get_secret_value()
-        client = TodoistAPI(api_token)
+        if not self._reserve_url(api_token, entry.effective_url):
+            logger.info(
+                f"Skipped entry already in Todoist: {entry.title!r} (URL: {entry.effective_url})"
+            )
+            return
+
+        client = todoist_clients.client(api_token)
 
         task_content = f"{entry.title} - {entry.effective_url}"
 
@@ -49,8 +121,137 @@ class AddTodoistTaskAction(BaseAction):
                 labels=self.labels,
             )
         except TodoistApiError as exc:
-            if exc.details.get("status_code") in {401, 403}:
-                self._persistent_error = exc
-            raise
+            self._release_url(api_token, entry.effective_url)
+            self._raise_api_error(exc)
 
         logger.info(f"Added task to Todoist: {task.content} (ID: {task.id})")
+
+    def _build_commands(
+        self,
+        entries: Sequence[Entry],
+        api_token: str,
+        errors: dict[str, Exception],
+    ) -> dict[str, tuple[Entry, dict[str, Any]]]:
+        """Build ``item_add`` commands keyed by uuid, recording entries without a URL.
+
+        With ``skip_existing``, the URL of each command is reserved; entries
+        whose URL is already present, or repeated within the batch, are
+        skipped.
+        """
+        action_key = self.model_dump_json()
+        commands: dict[str, tuple[Entry, dict[str, Any]]] = {}
+        for entry in entries:
+            if entry.effective_url is None:
+                errors[entry.id] = InvalidEntryError(
+                    "Entry has no URL (canonical_url or alternate)."
+                )
+                logger.error(
+                    f"Skipped entry {entry.title!r} (entry ID: {entry.id}): it has no URL."
+                )
+                continue
+            if not self._reserve_url(api_token, entry.effective_url):
+                logger.info(
+                    f"Skipped entry already in Todoist: {entry.title!r} (URL: {entry.effective_url})"
+                )
+                continue
+            command = build_item_add_command(
+                content=f"{entry.title} - {entry.effective_url}",
+                project_id=self.project_id,
+                priority=self.priority,
+                due_string=self.due_string,
+                description=entry.summary.content if entry.summary else None,
+                labels=self.labels,
+                command_uuid=str(
+                    uuid5(_COMMAND_NAMESPACE, f"{action_key}\0{entry.id}")
+                ),
+            )
+            commands[command["uuid"]] = (entry, command)
+        return commands
+
+    def _record_statuses(
+        self,
+        commands: dict[str, tuple[Entry, dict[str, Any]]],
+        statuses: dict[str, SyncStatus],
+        api_token: str,
+        errors: dict[str, Exception],
+    ) -> None:
+        """Map each command's status back to its entry, recording failures.
+
+        The URL of a failed command is released.
+        """
+        for uuid, (entry, command) in commands.items():
+            status = statuses.get(uuid, {"error": "No status returned"})
+            if status == "ok":
+                logger.info(
+                    f"Added task to Todoist: {command['args']['content']} (temp ID: {command['temp_id']})"
+                )
+                continue
+            logger.error(
+                f"Failed to add task to Todoist for entry {entry.title!r} (URL: {entry.effective_url}): {status}"
+            )
+            self._release_command_url(api_token, entry)
+            error = TodoistApiError(
+                f"Todoist API command failed: {status.get('error', status)}",
+                details={
+                    "status_code": status.get("http_code"),
+                    "error_body": status,
+                    "project_id": self.project_id,
+                },
+            )
+            errors[entry.id] = error
+            if status.get("http_code") in PERSISTENT_STATUS_CODES:
+                self._set_persistent_error(error)
+
+    def _release_command_url(self, api_token: str, entry: Entry) -> None:
+        if entry.effective_url is not None:
+            self._release_url(api_token, entry.effective_url)
+
+    def _process_batch(self, entries: Sequence[Entry]) -> None:
+        """Process Feedly entries by adding them as tasks through the Sync API.
+
+        Every entry is attempted; failed commands are logged against their
+        entry and reported together once the batch is done. A 401 or 403,
+        for the request or a command, stops the batch and skips later calls;
+        the entries not sent yet fail with it.
+
+        Raises
+        ------
+            PartialFailureError: If some entries failed; it lists them, and
+                the tasks of the others were added.
+        """
+        api_token = self._api_token()
+        errors: dict[str, Exception] = {}
+
+        chunks = list(batched(entries, SYNC_COMMAND_LIMIT, strict=False))
+        for index, chunk in enumerate(chunks):
+            commands = self._build_commands(chunk, api_token, errors)
+            if commands:
+                try:
+                    statuses = sync_commands_with_retry(
+                        api_token,
+                        [command for _, command in commands.values()],
+                        project_id=self.project_id,
+                    )
+                except TodoistApiError as exc:
+                    if exc.details.get("status_code") in PERSISTENT_STATUS_CODES:
+                        self._set_persistent_error(exc)
+                    for entry, _ in commands.values():
+                        errors[entry.id] = exc
+                        self._release_command_url(api_token, entry)
+                else:
+                    self._record_statuses(commands, statuses, api_token, errors)
+            if self._persistent_error is not None:
+                errors.update(
+                    (entry.id, self._persistent_error)
+                    for unsent in chunks[index + 1 :]
+                    for entry in unsent
+                )
+                break
+
+        if errors:
+            message = (
+                f"{len(errors)} of {len(entries)} Todoist tasks could not be added"
+            )
+            raise PartialFailureError(message, errors=errors) from next(
+                iter(errors.values())
+            )
@@ -1,19 +1,91 @@
 """Base class for rule actions."""
 
+import threading
+import weakref
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Sequence
 
 from pydantic import BaseModel, ConfigDict, PrivateAttr
 
-from feedly_entries_processor.exceptions import ActionSkippedDueToPersistentError
+from feedly_entries_processor.exceptions import (
+    ActionSkippedDueToPersistentError,
+    PartialFailureError,
+)
 from feedly_entries_processor.feedly_client import Entry
 
+# Locks of action instances, by id; see `BaseAction._instance_lock`.
+_instance_locks: dict[int, threading.RLock] = {}
+_instance_locks_guard = threading.Lock()
+
 
 class BaseAction(ABC, BaseModel):
-    """Base class for rule actions."""
+    """Base class for rule actions.
+
+    Actions process matched entries one at a time with `process`. An action
+    that can handle many entries in one request sets `supports_batch`; the
+    engine then hands it each page's matches with `process_batch`. Actions may
+    defer work until `flush`, which the engine calls once a source has been
+    fully read. An action whose entries are only processed once `flush` has
+    returned sets `completes_on_flush`; its `flush` raises
+    `PartialFailureError` for the entries it failed to process.
+
+    Actions may be called from several threads at once. A persistent error
+    (e.g. an authentication failure) is recorded with `_set_persistent_error`;
+    once set, every later call from any thread is skipped.
+    """
 
     model_config = ConfigDict(frozen=True)
     _persistent_error: Exception | None = PrivateAttr(default=None)
 
+    @property
+    def supports_batch(self) -> bool:
+        """Return True if the engine should pass matches with `process_batch`."""
+        return False
+
+    @property
+    def entries_per_request(self) -> int:
+        """Return the number of entries one request of the action covers, e.g. for budgets."""
+        return 1
+
+    @property
+    def completes_on_flush(self) -> bool:
+        """Return True if entries are only known to be processed once `flush` returns.
+
+        The engine then records an entry as handled after the flush, unless
+        the flush reports it as failed.
+        """
+        return False
+
+    def _instance_lock(self) -> threading.RLock:
+        """Return the lock guarding the state this action shares between threads.
+
+        Actions are frozen models whose equality compares private attributes,
+        so the lock is not one of them; it is kept outside the model, by
+        instance, and forgotten with the instance. It is reentrant, so that
+        code holding it may call back into the action, e.g. a callback of a
+        request that is already done.
+        """
+        key = id(self)
+        with _instance_locks_guard:
+            lock = _instance_locks.get(key)
+            if lock is None:
+                lock = _instance_locks[key] = threading.RLock()
+                weakref.finalize(self, _instance_locks.pop, key, None)
+        return lock
+
+    def _set_persistent_error(self, error: Exception) -> None:
+        """Record an error that makes every later call fail; the first one is kept."""
+        with self._instance_lock():
+            if self._persistent_error is None:
+                self._persistent_error = error
+
+    def _raise_if_persistent_error(self) -> None:
+        with self._instance_lock():
+            error = self._persistent_error
+        if error is not None:
+            msg = f"Action skipped because a persistent error occurred previously: {error}"
+            raise ActionSkippedDueToPersistentError(msg) from error
+
     def process(self, entry: Entry) -> None:
         """Process a single Feedly entry.
 
@@ -21,12 +93,60 @@ class BaseAction(ABC, BaseModel):
         ------
             ActionSkippedDueToPersistentError: If a persistent error occurred previously.
         """
-        if self._persistent_error is not None:
-            msg = f"Action skipped because a persistent error occurred previously: {self._persistent_error}"
-            raise ActionSkippedDueToPersistentError(msg) from self._persistent_error
-
+        self._raise_if_persistent_error()
         self._process(entry)
 
+    def process_batch(self, entries: Sequence[Entry]) -> None:
+        """Process several Feedly entries, in order.
+
+        Raises
+        ------
+            ActionSkippedDueToPersistentError: If a persistent error occurred previously.
+        """
+        self._raise_if_persistent_error()
+        self._process_batch(entries)
+
+    def flush(self) -> None:
+        """Complete any work deferred by `process` or `process_batch`.
+
+        Raises
+        ------
+            PartialFailureError: If the deferred work failed for some entries.
+        """
+
     @abstractmethod
     def _process(self, entry: Entry) -> None:
         """Process a single Feedly entry (implementation)."""
+
+    def _process_batch(self, entries: Sequence[Entry]) -> None:
+        """Process several Feedly entries (implementation); one by one by default."""
+        for entry in entries:
+            self._process(entry)
+
+
+def flush_actions(actions: Iterable[BaseAction]) -> None:
+    """Flush every action in order, even if an earlier one fails.
+
+    Raises
+    ------
+        PartialFailureError: If actions only failed for some entries; it
+            lists the failed entries of every action.
+        Exception: The first other error raised by an action.
+    """
+    errors: dict[str, Exception] = {}
+    first_error: Exception | None = None
+    for action in actions:
+        try:
+            action.flush()
+        except PartialFailureError as e:
+            errors.update(e.errors)
+            first_error = first_error or e
+        except Exception as e:  # noqa: BLE001
+            if first_error is None or isinstance(first_error, PartialFailureError):
+                first_error = e
+    if first_error is None:
+        return
+    if isinstance(first_error, PartialFailureError):
+        msg = f"Deferred actions failed for {len(errors)} entries"
+        raise PartialFailureError(msg, errors=errors) from first_error
+    raise first_error
@@ -0,0 +1,130 @@
+"""Mark Feedly entries action."""
+
+from collections.abc import Sequence
+from functools import cached_property
+from itertools import batched
+from typing import Literal
+
+from logzero import logger
+from pydantic import Field, PrivateAttr
+
+from feedly_entries_processor.actions.base_action import BaseAction
+from feedly_entries_processor.exceptions import (
+    FeedlyEntriesProcessorError,
+    PartialFailureError,
+)
+from feedly_entries_processor.feedly_client import (
+    MARKERS_CHUNK_SIZE,
+    Entry,
+    FeedlyClient,
+    MarkerAction,
+    create_feedly_client,
+)
+from feedly_entries_processor.settings import FeedlySettings
+
+Marker = Literal["read", "unread", "saved", "unsaved"]
+
+_MARKER_ACTIONS: dict[Marker, MarkerAction] = {
+    "read": "markAsRead",
+    "unread": "keepUnread",
+    "saved": "markAsSaved",
+    "unsaved": "markAsUnsaved",
+}
+
+
+class MarkFeedlyEntriesAction(BaseAction):
+    """An action that marks Feedly entries as read, unread, saved or unsaved.
+
+    Matched entries are accumulated and sent to ``/v3/markers``, up to
+    `MARKERS_CHUNK_SIZE` entries per request. Full chunks of read and unread
+    markers are sent at page boundaries, the rest on `flush`. Saved markers
+    change the saved stream, so, like
+    `RemoveFromFeedlyTagAction`, they wait for `flush` to avoid disturbing
+    its pagination. Entries of chunks that failed at page boundaries are
+    reported by `flush` too, so an entry is only handled once `flush` has
+    succeeded for it.
+    """
+
+    name: Literal["mark_feedly_entries"] = "mark_feedly_entries"
+    marker: Marker
+    feedly_settings: FeedlySettings = Field(default_factory=FeedlySettings)
+    _pending: dict[str, Entry] = PrivateAttr(default_factory=dict)
+    _failed: dict[str, Exception] = PrivateAttr(default_factory=dict)
+
+    @cached_property
+    def _feedly_client(self) -> FeedlyClient:
+        """Initialize and cache the Feedly API client."""
+        return create_feedly_client(self.feedly_settings.token_dir)
+
+    @property
+    def supports_batch(self) -> bool:
+        """Return True; matches are accumulated a page at a time."""
+        return True
+
+    @property
+    def entries_per_request(self) -> int:
+        """Return `MARKERS_CHUNK_SIZE`, the entries marked per request."""
+        return MARKERS_CHUNK_SIZE
+
+    @property
+    def completes_on_flush(self) -> bool:
+        """Return True; entries are only known to be marked on `flush`."""
+        return True
+
+    @property
+    def _defers_to_flush(self) -> bool:
+        return self.marker in {"saved", "unsaved"}
+
+    def _process(self, entry: Entry) -> None:
+        """Record a Feedly entry to be marked."""
+        self._process_batch([entry])
+
+    def _process_batch(self, entries: Sequence[Entry]) -> None:
+        """Record Feedly entries to be marked, and send full chunks of read markers."""
+        with self._instance_lock():
+            self._pending.update((entry.id, entry) for entry in entries)
+            if self._defers_to_flush or len(self._pending) < MARKERS_CHUNK_SIZE:
+                return
+            pending = list(self._pending.values())
+            # Keep the remainder for the next page, so that chunks stay full.
+            sent = len(pending) - len(pending) % MARKERS_CHUNK_SIZE
+            for entry in pending[:sent]:
+                del self._pending[entry.id]
+        errors = self._send(pending[:sent])
+        with self._instance_lock():
+            self._failed.update(errors)
+
+    def flush(self) -> None:
+        """Mark every recorded entry.
+
+        Every chunk is sent, even after one fails.
+
+        Raises
+        ------
+            PartialFailureError: If some chunks failed, here or at a page
+                boundary; it lists their entries.
+        """
+        with self._instance_lock():
+            pending = list(self._pending.values())
+            self._pending.clear()
+            errors = dict(self._failed)
+            self._failed.clear()
+        errors.update(self._send(pending))
+        if errors:
+            msg = f"Failed to mark {len(errors)} Feedly entries as {self.marker}"
+            raise PartialFailureError(msg, errors=errors) from next(
+                iter(errors.values())
+            )
+
+    def _send(self, entries: Sequence[Entry]) -> dict[str, Exception]:
+        """Mark entries a chunk at a time; return the error of each entry not marked."""
+        action = _MARKER_ACTIONS[self.marker]
+        errors: dict[str, Exception] = {}
+        for chunk in batched(entries, MARKERS_CHUNK_SIZE, strict=False):
+            try:
+                self._feedly_client.mark_entries(action, [entry.id for entry in chunk])
+            except FeedlyEntriesProcessorError as e:
+                errors.update((entry.id, e) for entry in chunk)
+                continue
+            logger.info(f"Marked {len(chunk)} Feedly entries as {self.marker}.")
+        return errors
@@ -1,14 +1,21 @@
 """Remove from Feedly tag action."""
 
+from collections.abc import Sequence
 from functools import cached_property
+from itertools import batched
 from typing import Annotated, Literal
 
 from logzero import logger
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 from pydantic.types import StringConstraints
 
 from feedly_entries_processor.actions.base_action import BaseAction
+from feedly_entries_processor.exceptions import (
+    FeedlyEntriesProcessorError,
+    PartialFailureError,
+)
 from feedly_entries_processor.feedly_client import (
+    UNTAG_CHUNK_SIZE,
     Entry,
     FeedlyClient,
     create_feedly_client,
@@ -17,20 +24,77 @@ from feedly_entries_processor.settings import FeedlySettings
 
 
 class RemoveFromFeedlyTagAction(BaseAction):
-    """An action that removes Feedly entries from a Feedly tag (e.g. saved)."""
+    """An action that removes Feedly entries from a Feedly tag (e.g. saved).
+
+    Matched entries are only recorded while their source is read. They are
+    removed on `flush`, in chunks of entry ids per request; removing them
+    earlier would shift the continuation of the tag's stream while it is
+    still being paginated, and some entries would be skipped. An entry is
+    therefore only handled once `flush` has removed it.
+    """
 
     name: Literal["remove_from_feedly_tag"] = "remove_from_feedly_tag"
     tag: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
     feedly_settings: FeedlySettings = Field(default_factory=FeedlySettings)
+    _pending: dict[str, Entry] = PrivateAttr(default_factory=dict)
 
     @cached_property
     def _feedly_client(self) -> FeedlyClient:
         """Initialize and cache the Feedly API client."""
         return create_feedly_client(self.feedly_settings.token_dir)
 
+    @property
+    def supports_batch(self) -> bool:
+        """Return True; matches are recorded a page at a time."""
+        return True
+
+    @property
+    def entries_per_request(self) -> int:
+        """Return `UNTAG_CHUNK_SIZE`, the entries removed per request."""
+        return UNTAG_CHUNK_SIZE
+
+    @property
+    def completes_on_flush(self) -> bool:
+        """Return True; entries are removed from the tag on `flush`."""
+        return True
+
     def _process(self, entry: Entry) -> None:
-        """Process a Feedly entry by removing it from the configured tag."""
-        self._feedly_client.remove_entry_from_tag(self.tag, entry.id)
-        logger.info(
-            f"Removed entry from Feedly tag: {entry.title!r} (entry ID: {entry.id})"
-        )
+        """Record a Feedly entry for removal from the configured tag."""
+        self._pending[entry.id] = entry
+
+    def _process_batch(self, entries: Sequence[Entry]) -> None:
+        """Record Feedly entries for removal from the configured tag."""
+        self._pending.update((entry.id, entry) for entry in entries)
+
+    def flush(self) -> None:
+        """Remove the recorded entries from the configured tag.
+
+        Every chunk is sent, even after one fails.
+
+        Raises
+        ------
+            PartialFailureError: If some chunks failed; it lists their entries.
+        """
+        pending = list(self._pending.values())
+        self._pending.clear()
+        errors: dict[str, Exception] = {}
+        for chunk in batched(pending, UNTAG_CHUNK_SIZE, strict=False):
+            try:
+                self._feedly_client.remove_entries_from_tag(
+                    self.tag, [entry.id for entry in chunk]
+                )
+            except FeedlyEntriesProcessorError as e:
+                errors.update((entry.id, e) for entry in chunk)
+                continue
+            for entry in chunk:
+                logger.info(
+                    f"Removed entry from Feedly tag: {entry.title!r} (entry ID: {entry.id})"
+                )
+        if errors:
+            msg = (
+                f"Failed to remove {len(errors)} of {len(pending)} entries "
+                f"from Feedly tag {self.tag!r}"
+            )
+            raise PartialFailureError(msg, errors=errors) from next(
+                iter(errors.values())
+            )
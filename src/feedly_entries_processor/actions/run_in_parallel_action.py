@@ -0,0 +1,85 @@
+"""Run in parallel action."""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from functools import cached_property
+from typing import TYPE_CHECKING, Literal
+
+from pydantic import Field
+
+from feedly_entries_processor.actions.base_action import BaseAction, flush_actions
+
+if TYPE_CHECKING:
+    from feedly_entries_processor.actions import Action
+    from feedly_entries_processor.feedly_client import Entry
+
+# Number of entries whose sub-actions can run at once, e.g. with ACTION_WORKERS;
+# the sub-actions of further entries wait for a free thread.
+PARALLEL_ENTRIES = 4
+
+
+class RunInParallelAction(BaseAction):
+    """An action that runs multiple independent actions concurrently.
+
+    Each sub-action runs in its own thread, so an entry takes as long as the
+    slowest sub-action rather than the sum of all of them. The threads are
+    shared by every entry, and stopped on `flush`.
+
+    Sub-actions are never left running once the entry is done. With
+    ``on_error: fail_fast``, sub-actions that have not started when one fails
+    are cancelled, and its exception is propagated once those already
+    running have finished. With ``collect_all``, every sub-action runs to
+    completion; a single exception is propagated as is, several together as
+    an ExceptionGroup.
+    """
+
+    name: Literal["run_in_parallel"] = "run_in_parallel"
+    actions: tuple[Action, ...] = Field(min_length=1)
+    on_error: Literal["fail_fast", "collect_all"] = "collect_all"
+
+    @cached_property
+    def _executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(
+            max_workers=len(self.actions) * PARALLEL_ENTRIES,
+            thread_name_prefix="run_in_parallel",
+        )
+
+    def _process(self, entry: Entry) -> None:
+        """Process a Feedly entry by running every sub-action concurrently."""
+        with self._instance_lock():
+            executor = self._executor
+        futures = [executor.submit(action.process, entry) for action in self.actions]
+        if self.on_error == "fail_fast":
+            _, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in not_done:
+                future.cancel()
+        wait(futures)
+
+        errors = [
+            error
+            for future in futures
+            if not future.cancelled() and (error := future.exception()) is not None
+        ]
+        if len(errors) == 1 or (self.on_error == "fail_fast" and errors):
+            raise errors[0]
+        if errors:
+            msg = f"{len(errors)} of {len(self.actions)} parallel actions failed"
+            raise BaseExceptionGroup(msg, errors)
+
+    @property
+    def completes_on_flush(self) -> bool:
+        """Return True if any sub-action completes its entries on `flush`."""
+        return any(action.completes_on_flush for action in self.actions)
+
+    def flush(self) -> None:
+        """Complete the deferred work of each sub-action, in order, and stop the threads."""
+        try:
+            flush_actions(self.actions)
+        finally:
+            with self._instance_lock():
+                executor: ThreadPoolExecutor | None = self.__dict__.pop(
+                    "_executor", None
+                )
+            if executor is not None:
+                executor.shutdown()
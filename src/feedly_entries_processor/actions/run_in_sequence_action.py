@@ -6,7 +6,7 @@ from typing import TYPE_CHECKING, Literal
 
 from pydantic import Field
 
-from feedly_entries_processor.actions.base_action import BaseAction
+from feedly_entries_processor.actions.base_action import BaseAction, flush_actions
 
 if TYPE_CHECKING:
     from feedly_entries_processor.actions import Action
@@ -27,3 +27,12 @@ class RunInSequenceAction(BaseAction):
         """Process a Feedly entry by running each sub-action in sequence."""
         for action in self.actions:
             action.process(entry)
+
+    @property
+    def completes_on_flush(self) -> bool:
+        """Return True if any sub-action completes its entries on `flush`."""
+        return any(action.completes_on_flush for action in self.actions)
+
+    def flush(self) -> None:
+        """Complete the deferred work of each sub-action, in sequence."""
+        flush_actions(self.actions)
@@ -0,0 +1,211 @@
+"""Webhook action."""
+
+import time
+from collections.abc import Mapping, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from functools import cached_property, partial
+from typing import Any, Literal
+
+import requests
+from logzero import logger
+from pydantic import AnyHttpUrl, Field, PrivateAttr, field_validator
+from requests.adapters import HTTPAdapter
+from tenacity import (
+    RetryCallState,
+    Retrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+from feedly_entries_processor.actions.base_action import BaseAction
+from feedly_entries_processor.exceptions import PartialFailureError
+from feedly_entries_processor.feedly_client import Entry
+from feedly_entries_processor.rate_limit import is_retryable_error
+
+# Longest wait a Retry-After header is honoured for.
+MAX_RETRY_AFTER = 60.0
+
+_backoff = wait_exponential(multiplier=0.5, max=10)
+
+
+def retry_after(response: requests.Response | None) -> float | None:
+    """Return the delay asked for by a response's Retry-After header, in seconds."""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if value is None:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(delay, 0.0), MAX_RETRY_AFTER)
+
+
+def _wait(retry_state: RetryCallState) -> float:
+    """Wait as long as the server asks with Retry-After, else back off exponentially."""
+    outcome = retry_state.outcome
+    exc = outcome.exception() if outcome is not None else None
+    delay = retry_after(getattr(exc, "response", None))
+    return delay if delay is not None else _backoff(retry_state)
+
+
+class WebhookAction(BaseAction):
+    """An action that POSTs Feedly entries to a URL, in batches.
+
+    Each request has a JSON body ``{"entries": [...]}`` with the entries
+    serialised with Feedly's field names. A batch is sent once
+    ``batch_size`` entries are pending, or, when entries are added, once the
+    oldest pending entry has waited ``max_batch_age`` seconds; the rest are
+    sent on `flush`, which waits for every request. Up to ``concurrency``
+    requests are in flight at once, over one keep-alive connection pool;
+    `flush` closes the pool and its threads, which the next entries reopen.
+
+    Connection errors, timeouts, 429 and 5xx responses are retried up to
+    ``max_attempts`` times, waiting as long as a Retry-After header asks. The
+    entries of a batch that still fails are reported by `flush`, so an entry
+    is only handled once `flush` has succeeded for it.
+    """
+
+    name: Literal["webhook"] = "webhook"
+    url: AnyHttpUrl
+    headers: tuple[tuple[str, str], ...] = ()
+    batch_size: int = Field(default=100, gt=0)
+    max_batch_age: float = Field(default=5.0, ge=0)
+    concurrency: int = Field(default=4, gt=0)
+    timeout: float = Field(default=10.0, gt=0)
+    max_attempts: int = Field(default=5, gt=0)
+    _pending: list[Entry] = PrivateAttr(default_factory=list)
+    _oldest: float | None = PrivateAttr(default=None)
+    _futures: set[Future[None]] = PrivateAttr(default_factory=set)
+    _failed: dict[str, Exception] = PrivateAttr(default_factory=dict)
+
+    @field_validator("headers", mode="before")
+    @classmethod
+    def _headers_from_mapping(cls, headers: Any) -> Any:  # noqa: ANN401
+        if isinstance(headers, Mapping):
+            return tuple(sorted(headers.items()))
+        return headers
+
+    @cached_property
+    def _session(self) -> requests.Session:
+        """Return a session whose connection pool fits the concurrency."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update(dict(self.headers))
+        session.headers["Content-Type"] = "application/json"
+        return session
+
+    @cached_property
+    def _executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="webhook"
+        )
+
+    @property
+    def supports_batch(self) -> bool:
+        """Return True; entries are collected a page at a time."""
+        return True
+
+    @property
+    def entries_per_request(self) -> int:
+        """Return ``batch_size``, the most entries posted per request."""
+        return self.batch_size
+
+    @property
+    def completes_on_flush(self) -> bool:
+        """Return True; requests are only known to have succeeded on `flush`."""
+        return True
+
+    def _process(self, entry: Entry) -> None:
+        """Add a Feedly entry to the pending batch."""
+        self._process_batch([entry])
+
+    def _process_batch(self, entries: Sequence[Entry]) -> None:
+        """Add Feedly entries to the pending batch, sending the batches that are due."""
+        now = time.monotonic()
+        with self._instance_lock():
+            if self._oldest is None and entries:
+                self._oldest = now
+            self._pending.extend(entries)
+            while len(self._pending) >= self.batch_size:
+                self._submit(self._pending[: self.batch_size])
+                del self._pending[: self.batch_size]
+                self._oldest = now if self._pending else None
+            if self._oldest is not None and now - self._oldest >= self.max_batch_age:
+                self._submit(self._pending)
+                self._pending = []
+                self._oldest = None
+
+    def _submit(self, batch: Sequence[Entry]) -> None:
+        batch = list(batch)
+        future = self._executor.submit(self._send, self._session, batch)
+        self._futures.add(future)
+        future.add_done_callback(partial(self._done, batch))
+
+    def _done(self, batch: Sequence[Entry], future: Future[None]) -> None:
+        """Forget a completed request, keeping the entries of a failed one for `flush`."""
+        error = future.exception()
+        with self._instance_lock():
+            self._futures.discard(future)
+            if isinstance(error, Exception):
+                self._failed.update((entry.id, error) for entry in batch)
+
+    def _send(self, session: requests.Session, batch: Sequence[Entry]) -> None:
+        body = (
+            b'{"entries":['
+            + b",".join(
+                entry.model_dump_json(by_alias=True, exclude_none=True).encode()
+                for entry in batch
+            )
+            + b"]}"
+        )
+        for attempt in Retrying(
+            reraise=True,
+            stop=stop_after_attempt(self.max_attempts),
+            wait=_wait,
+            retry=retry_if_exception(is_retryable_error),
+        ):
+            with attempt:
+                response = session.post(str(self.url), data=body, timeout=self.timeout)
+                response.raise_for_status()
+        logger.info(f"Posted {len(batch)} entries to {self.url}.")
+
+    def flush(self) -> None:
+        """Send the pending entries, wait for every request, and close the pool.
+
+        Raises
+        ------
+            PartialFailureError: If some batches failed; it lists their
+                entries.
+        """
+        with self._instance_lock():
+            if self._pending:
+                self._submit(self._pending)
+            self._pending = []
+            self._oldest = None
+            futures = list(self._futures)
+        wait(futures)
+        with self._instance_lock():
+            errors = self._failed
+            self._failed = {}
+        self._close()
+        if errors:
+            msg = f"Failed to post {len(errors)} entries to {self.url}"
+            raise PartialFailureError(msg, errors=errors) from next(
+                iter(errors.values())
+            )
+
+    def _close(self) -> None:
+        """Shut down the request threads and connections; they are reopened on demand."""
+        executor: ThreadPoolExecutor | None = self.__dict__.pop("_executor", None)
+        if executor is not None:
+            executor.shutdown()
+        session: requests.Session | None = self.__dict__.pop("_session", None)
+        if session is not None:
+            session.close()
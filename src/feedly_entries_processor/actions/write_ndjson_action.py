@@ -0,0 +1,131 @@
+"""Write NDJSON action."""
+
+import gzip
+import io
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Literal
+
+from logzero import logger
+from pydantic import Field, PrivateAttr
+
+from feedly_entries_processor.actions.base_action import BaseAction
+from feedly_entries_processor.feedly_client import Entry
+
+# Size of the write buffer; a page of entries is written in a few system calls.
+WRITE_BUFFER_SIZE = 1 << 20
+
+_clock: Callable[[], float] = time.time
+
+
+def _rotated_path(path: Path, now: float) -> Path:
+    stem, dot, suffixes = path.name.partition(".")
+    stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime(now))
+    rotated = path.with_name(f"{stem}.{stamp}{dot}{suffixes}")
+    counter = 1
+    while rotated.exists():
+        rotated = path.with_name(f"{stem}.{stamp}-{counter}{dot}{suffixes}")
+        counter += 1
+    return rotated
+
+
+class WriteNdjsonAction(BaseAction):
+    """An action that appends Feedly entries to a file as JSON lines.
+
+    Entries are serialised with Feedly's field names, one JSON object per
+    line, through a large write buffer; the buffer is flushed after each
+    page, or entry when not given a page, and the file closed on `flush`.
+    With ``compression: gzip`` the file is a gzip stream, appended to as one
+    gzip member per run. Only the compressed output is flushed then, not the
+    compressor: a sync flush per page would restart compression each time
+    and enlarge the file, at the cost of the last compressed block only
+    reaching the disk when the file is closed or rotated.
+
+    The file is rotated, i.e. renamed with a UTC timestamp and started
+    anew, once it reaches ``max_bytes`` on disk, or once a new period of
+    ``rotate_interval`` seconds has started since it was last written.
+    """
+
+    name: Literal["write_ndjson"] = "write_ndjson"
+    path: Path
+    compression: Literal["gzip"] | None = None
+    max_bytes: int | None = Field(default=None, gt=0)
+    rotate_interval: float | None = Field(default=None, gt=0)
+    _file: io.BufferedIOBase | None = PrivateAttr(default=None)
+    _raw: io.BufferedIOBase | None = PrivateAttr(default=None)
+    _period: int | None = PrivateAttr(default=None)
+
+    @property
+    def supports_batch(self) -> bool:
+        """Return True; a page of entries is written at once."""
+        return True
+
+    def _current_period(self, timestamp: float) -> int | None:
+        if self.rotate_interval is None:
+            return None
+        return int(timestamp // self.rotate_interval)
+
+    def _open(self) -> io.BufferedIOBase:
+        path = self.path.expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists() and self._current_period(
+            path.stat().st_mtime
+        ) != self._current_period(_clock()):
+            self._rotate(path)
+        raw = io.BufferedWriter(io.FileIO(path, "a"), buffer_size=WRITE_BUFFER_SIZE)
+        self._raw = raw
+        self._period = self._current_period(_clock())
+        if self.compression == "gzip":
+            return gzip.GzipFile(fileobj=raw, mode="ab")
+        return raw
+
+    def _close(self) -> None:
+        if self._file is None or self._raw is None:
+            return
+        file, raw = self._file, self._raw
+        self._file = self._raw = None
+        # Closing a GzipFile writes its trailer but leaves its file object open.
+        file.close()
+        raw.close()
+
+    def _rotate(self, path: Path) -> None:
+        rotated = _rotated_path(path, _clock())
+        path.rename(rotated)
+        logger.info(f"Rotated {path} to {rotated}")
+
+    def _write(self, entries: Sequence[Entry]) -> None:
+        data = b"".join(
+            entry.model_dump_json(by_alias=True, exclude_none=True).encode() + b"\n"
+            for entry in entries
+        )
+        with self._instance_lock():
+            if (
+                self._file is not None
+                and self._current_period(_clock()) != self._period
+            ):
+                self._close()
+                self._rotate(self.path.expanduser())
+            if self._file is None:
+                self._file = self._open()
+            self._file.write(data)
+            # The raw file: with gzip, what has been compressed, not the compressor.
+            if self._raw is not None:
+                self._raw.flush()
+            path = self.path.expanduser()
+            if self.max_bytes is not None and path.stat().st_size >= self.max_bytes:
+                self._close()
+                self._rotate(path)
+
+    def _process(self, entry: Entry) -> None:
+        """Append a Feedly entry to the file and flush the buffer."""
+        self._write([entry])
+
+    def _process_batch(self, entries: Sequence[Entry]) -> None:
+        """Append a page of Feedly entries to the file and flush the buffer."""
+        self._write(entries)
+
+    def flush(self) -> None:
+        """Write any buffered entries and close the file."""
+        with self._instance_lock():
+            self._close()
@@ -6,6 +6,12 @@ from feedly_entries_processor.conditions.match_all_condition import (
 from feedly_entries_processor.conditions.regex_partial_match_condition import (
     RegexPartialMatchCondition,
 )
+from feedly_entries_processor.conditions.similar_to_examples_condition import (
+    SimilarToExamplesCondition,
+)
+from feedly_entries_processor.conditions.stream_id_glob_match_condition import (
+    StreamIdGlobMatchCondition,
+)
 from feedly_entries_processor.conditions.stream_id_in_list_condition import (
     StreamIdInListCondition,
 )
@@ -13,7 +19,15 @@ from feedly_entries_processor.conditions.stream_id_in_list_condition import (
 __all__ = [
     "MatchAllCondition",
     "RegexPartialMatchCondition",
+    "SimilarToExamplesCondition",
+    "StreamIdGlobMatchCondition",
     "StreamIdInListCondition",
 ]
 
-Condition = MatchAllCondition | StreamIdInListCondition | RegexPartialMatchCondition
+Condition = (
+    MatchAllCondition
+    | StreamIdInListCondition
+    | StreamIdGlobMatchCondition
+    | RegexPartialMatchCondition
+    | SimilarToExamplesCondition
+)
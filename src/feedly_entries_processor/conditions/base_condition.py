@@ -1,10 +1,15 @@
 """BaseCondition module."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
 
 from pydantic import BaseModel, ConfigDict
 
 from feedly_entries_processor.feedly_client import Entry
+from feedly_entries_processor.stream_id_trie import StreamIdTrie
+
+type Predicate = Callable[[Entry], bool]
+type BatchPredicate = Callable[[Sequence[Entry]], list[bool]]
 
 
 class BaseCondition(ABC, BaseModel):
@@ -15,3 +20,39 @@ class BaseCondition(ABC, BaseModel):
     @abstractmethod
     def matches(self, entry: Entry) -> bool:
         """Return True if the entry matches the condition."""
+
+    def matches_batch(self, entries: Sequence[Entry]) -> list[bool]:
+        """Return a mask telling, for each entry of a page, whether it matches."""
+        return self.compile_batch()(entries)
+
+    def compile(self) -> Predicate:
+        """Lower the condition into a plain function equivalent to `matches`.
+
+        The default returns `matches` itself. Subclasses override it to bind
+        their parameters as constants and access entry fields directly, which
+        avoids model attribute lookups on every call.
+        """
+        return self.matches
+
+    def compile_batch(self) -> BatchPredicate:
+        """Lower the condition into a function equivalent to `matches_batch`.
+
+        The default applies `compile` to each entry of the page. Subclasses
+        override it when a whole page can be evaluated more cheaply.
+        """
+        predicate = self.compile()
+
+        def matches_batch(entries: Sequence[Entry]) -> list[bool]:
+            return [predicate(entry) for entry in entries]
+
+        return matches_batch
+
+    def add_to_stream_id_trie(self, trie: StreamIdTrie[int], key: int) -> bool:  # noqa: ARG002
+        """Register the condition in a trie shared by the rules of a source.
+
+        Conditions that depend only on an entry's stream id add their
+        patterns under ``key`` and return True; they then match exactly the
+        entries whose stream id looks up ``key`` in the trie. Other conditions
+        return False, which is the default.
+        """
+        return False
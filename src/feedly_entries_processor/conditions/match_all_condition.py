@@ -1,11 +1,24 @@
 """MatchAllCondition module."""
 
+from collections.abc import Sequence
 from typing import Literal
 
-from feedly_entries_processor.conditions.base_condition import BaseCondition
+from feedly_entries_processor.conditions.base_condition import (
+    BaseCondition,
+    BatchPredicate,
+    Predicate,
+)
 from feedly_entries_processor.feedly_client import Entry
 
 
+def _always_true(entry: Entry) -> bool:  # noqa: ARG001
+    return True
+
+
+def _all_true(entries: Sequence[Entry]) -> list[bool]:
+    return [True] * len(entries)
+
+
 class MatchAllCondition(BaseCondition):
     """Condition that matches all entries."""
 
@@ -14,3 +27,11 @@ class MatchAllCondition(BaseCondition):
     def matches(self, entry: Entry) -> bool:  # noqa: ARG002
         """Return True (always true for MatchAllCondition)."""
         return True
+
+    def compile(self) -> Predicate:
+        """Return a predicate that is always true."""
+        return _always_true
+
+    def compile_batch(self) -> BatchPredicate:
+        """Return a batch predicate producing an all-true mask."""
+        return _all_true
@@ -1,23 +1,52 @@
 """RegexPartialMatchCondition module."""
 
-import re
+import time
+from collections.abc import Callable
 from functools import cached_property
-from typing import Literal, assert_never
+from operator import attrgetter
+from typing import Literal
 
+import regex
+from logzero import logger
 from pydantic import Field, field_validator
 
-from feedly_entries_processor.conditions.base_condition import BaseCondition
+from feedly_entries_processor.conditions.base_condition import (
+    BaseCondition,
+    Predicate,
+)
+from feedly_entries_processor.exceptions import ConditionTimeBudgetExceededError
 from feedly_entries_processor.feedly_client import Entry
+from feedly_entries_processor.regex_safety import has_nested_unbounded_quantifier
 
 FieldName = Literal["title", "author", "summary_contents"]
 
 
+def _get_summary_contents(entry: Entry) -> str | None:
+    summary = entry.summary
+    return summary.content if summary is not None else None
+
+
+FIELD_GETTERS: dict[FieldName, Callable[[Entry], str | None]] = {
+    "title": attrgetter("title"),
+    "author": attrgetter("author"),
+    "summary_contents": _get_summary_contents,
+}
+
+
 class RegexPartialMatchCondition(BaseCondition):
-    """Condition that matches when any of the patterns are found in any of the specified fields."""
+    """Condition that matches when any of the patterns are found in any of the specified fields.
+
+    Patterns use the syntax of the `regex` module, a superset of `re`. The
+    searches of one entry share a budget of ``match_time_budget`` seconds,
+    so that matching it stops in time even if a pattern backtracks
+    catastrophically. `matches`, `compile` and `matches_batch` all charge
+    the budget per entry.
+    """
 
     name: Literal["regex_partial_match"] = "regex_partial_match"
     fields: tuple[FieldName, ...] = Field(min_length=1)
     patterns: tuple[str, ...] = Field(min_length=1)
+    match_time_budget: float = Field(default=1.0, gt=0)
 
     @field_validator("patterns", mode="after")
     @classmethod
@@ -27,32 +56,91 @@ class RegexPartialMatchCondition(BaseCondition):
     ) -> tuple[str, ...]:
         for pattern in patterns:
             try:
-                re.compile(pattern)
-            except re.error as exc:
+                regex.compile(pattern)
+            except regex.error as exc:
                 msg = f"Invalid regular expression pattern: {pattern!r}"
                 raise ValueError(msg) from exc
         return patterns
 
-    @staticmethod
-    def _get_field_value(entry: Entry, field_name: FieldName) -> str | None:
-        if field_name == "title":
-            return entry.title
-        if field_name == "author":
-            return entry.author
-        if field_name == "summary_contents":
-            return entry.summary.content if entry.summary else None
+    @field_validator("patterns", mode="after")
+    @classmethod
+    def _warn_about_backtracking_patterns(
+        cls,
+        patterns: tuple[str, ...],
+    ) -> tuple[str, ...]:
+        for pattern in patterns:
+            if has_nested_unbounded_quantifier(pattern):
+                logger.warning(
+                    f"Regular expression pattern {pattern!r} repeats a group that "
+                    "itself repeats without bound and may backtrack catastrophically "
+                    "on long input. Consider a possessive quantifier (e.g. 'a++') or "
+                    "an atomic group ('(?>...)')."
+                )
+        return patterns
 
-        assert_never(field_name)
+    @cached_property
+    def _compiled_patterns(self) -> tuple[regex.Pattern[str], ...]:
+        return tuple(regex.compile(pattern) for pattern in self.patterns)
 
     @cached_property
-    def _compiled_patterns(self) -> tuple[re.Pattern[str], ...]:
-        return tuple(re.compile(pattern) for pattern in self.patterns)
+    def _compiled(self) -> Predicate:
+        return self.compile()
 
     def matches(self, entry: Entry) -> bool:
-        """Return True if any of the entry's specified fields match any of the patterns."""
-        return any(
-            pattern.search(value)
-            for field_name in self.fields
-            if (value := self._get_field_value(entry, field_name)) is not None
-            for pattern in self._compiled_patterns
-        )
+        """Return True if any of the entry's specified fields match any of the patterns.
+
+        Raises
+        ------
+            ConditionTimeBudgetExceededError: If the searches of the entry take
+                longer than ``match_time_budget``.
+        """
+        return self._compiled(entry)
+
+    def compile(self) -> Predicate:
+        """Return a predicate with field getters and pattern searches bound.
+
+        The searches of one entry share ``match_time_budget`` seconds; the
+        predicate raises ConditionTimeBudgetExceededError as soon as they
+        run out of it.
+        """
+        getters = tuple(FIELD_GETTERS[field_name] for field_name in self.fields)
+        searches = tuple(pattern.search for pattern in self._compiled_patterns)
+        budget = self.match_time_budget
+        perf_counter = time.perf_counter
+
+        def over_budget(entry: Entry) -> ConditionTimeBudgetExceededError:
+            msg = (
+                f"Matching patterns {self.patterns!r} against entry {entry.id!r} "
+                f"took over the budget of {budget}s."
+            )
+            return ConditionTimeBudgetExceededError(msg)
+
+        if len(getters) == 1 and len(searches) == 1:
+            (get,) = getters
+            (search,) = searches
+
+            def matches_single(entry: Entry) -> bool:
+                value = get(entry)
+                if value is None:
+                    return False
+                try:
+                    return search(value, timeout=budget) is not None
+                except TimeoutError:
+                    raise over_budget(entry) from None
+
+            return matches_single
+
+        def matches(entry: Entry) -> bool:
+            deadline = perf_counter() + budget
+            try:
+                return any(
+                    search(value, timeout=max(deadline - perf_counter(), 0.0))
+                    is not None
+                    for get in getters
+                    if (value := get(entry)) is not None
+                    for search in searches
+                )
+            except TimeoutError:
+                raise over_budget(entry) from None
+
+        return matches
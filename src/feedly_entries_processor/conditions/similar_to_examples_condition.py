@@ -0,0 +1,87 @@
+"""SimilarToExamplesCondition module."""
+
+from collections.abc import Sequence
+from functools import cached_property
+from typing import Literal
+
+from pydantic import Field
+
+from feedly_entries_processor.conditions.base_condition import (
+    BaseCondition,
+    BatchPredicate,
+    Predicate,
+)
+from feedly_entries_processor.conditions.regex_partial_match_condition import (
+    FIELD_GETTERS,
+    FieldName,
+)
+from feedly_entries_processor.feedly_client import Entry
+from feedly_entries_processor.settings import ProcessingSettings
+from feedly_entries_processor.tfidf import TfidfModel, load_or_build
+
+
+class SimilarToExamplesCondition(BaseCondition):
+    """Condition that matches entries whose text is similar to example texts.
+
+    The examples form a TF-IDF model, built when the condition is first
+    compiled or evaluated, not when the configuration is validated, and
+    cached in ``MODEL_CACHE_DIR``. An entry matches when the cosine
+    similarity of its fields to the examples' centroid is at least
+    ``threshold``.
+    """
+
+    name: Literal["similar_to_examples"] = "similar_to_examples"
+    examples: tuple[str, ...] = Field(min_length=1)
+    fields: tuple[FieldName, ...] = Field(
+        default=("title", "summary_contents"), min_length=1
+    )
+    threshold: float = Field(default=0.2, gt=0, le=1)
+
+    @cached_property
+    def _model(self) -> TfidfModel:
+        return load_or_build(self.examples, ProcessingSettings().model_cache_dir)
+
+    @cached_property
+    def _compiled_batch(self) -> BatchPredicate:
+        return self.compile_batch()
+
+    def _text(self, entry: Entry) -> str:
+        return " ".join(
+            value
+            for field_name in self.fields
+            if (value := FIELD_GETTERS[field_name](entry)) is not None
+        )
+
+    def matches(self, entry: Entry) -> bool:
+        """Return True if the entry is similar enough to the examples."""
+        return self._compiled_batch([entry])[0]
+
+    def matches_batch(self, entries: Sequence[Entry]) -> list[bool]:
+        """Return a mask telling, for each entry of a page, whether it is similar enough."""
+        return self._compiled_batch(entries)
+
+    def compile(self) -> Predicate:
+        """Return a predicate scoring one entry with the model bound."""
+        matches_batch = self.compile_batch()
+
+        def matches(entry: Entry) -> bool:
+            return matches_batch([entry])[0]
+
+        return matches
+
+    def compile_batch(self) -> BatchPredicate:
+        """Return a batch predicate scoring a whole page against the centroid at once.
+
+        The model is loaded, or built and cached, on the first call.
+        """
+        score_batch = self._model.score_batch
+        text = self._text
+        threshold = self.threshold
+
+        def matches_batch(entries: Sequence[Entry]) -> list[bool]:
+            return [
+                score >= threshold
+                for score in score_batch(text(entry) for entry in entries)
+            ]
+
+        return matches_batch
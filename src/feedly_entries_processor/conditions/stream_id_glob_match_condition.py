@@ -0,0 +1,58 @@
+"""StreamIdGlobMatchCondition module."""
+
+import re
+from functools import cached_property
+from typing import Literal
+
+from pydantic import Field
+
+from feedly_entries_processor.conditions.base_condition import (
+    BaseCondition,
+    Predicate,
+)
+from feedly_entries_processor.feedly_client import Entry
+from feedly_entries_processor.stream_id_trie import GLOB_WILDCARD, StreamIdTrie
+
+
+class StreamIdGlobMatchCondition(BaseCondition):
+    """Condition that matches when stream_id matches any of the given glob patterns.
+
+    In a pattern, ``*`` matches any sequence of characters, so a prefix such as
+    ``feed/https://example.com/*`` matches every feed of a site. A pattern
+    without ``*`` must equal the stream id.
+    """
+
+    name: Literal["stream_id_glob_match"] = "stream_id_glob_match"
+    patterns: frozenset[str] = Field(min_length=1)
+
+    @cached_property
+    def _compiled_patterns(self) -> tuple[re.Pattern[str], ...]:
+        return tuple(
+            re.compile(".*".join(map(re.escape, pattern.split(GLOB_WILDCARD))))
+            for pattern in self.patterns
+        )
+
+    def matches(self, entry: Entry) -> bool:
+        """Return True if the entry's stream_id matches any of the patterns."""
+        return entry.origin is not None and any(
+            pattern.fullmatch(entry.origin.stream_id)
+            for pattern in self._compiled_patterns
+        )
+
+    def compile(self) -> Predicate:
+        """Return a predicate backed by a trie of the patterns."""
+        trie: StreamIdTrie[int] = StreamIdTrie()
+        self.add_to_stream_id_trie(trie, 0)
+        lookup = trie.lookup
+
+        def matches(entry: Entry) -> bool:
+            origin = entry.origin
+            return origin is not None and bool(lookup(origin.stream_id))
+
+        return matches
+
+    def add_to_stream_id_trie(self, trie: StreamIdTrie[int], key: int) -> bool:
+        """Register the glob patterns."""
+        for pattern in self.patterns:
+            trie.add(pattern, key)
+        return True
@@ -1,9 +1,15 @@
 """StreamIdInListCondition module."""
 
+from collections.abc import Sequence
 from typing import Literal
 
-from feedly_entries_processor.conditions.base_condition import BaseCondition
+from feedly_entries_processor.conditions.base_condition import (
+    BaseCondition,
+    BatchPredicate,
+    Predicate,
+)
 from feedly_entries_processor.feedly_client import Entry
+from feedly_entries_processor.stream_id_trie import StreamIdTrie
 
 
 class StreamIdInListCondition(BaseCondition):
@@ -15,3 +21,34 @@ class StreamIdInListCondition(BaseCondition):
     def matches(self, entry: Entry) -> bool:
         """Return True if the entry's stream_id is in the provided set."""
         return entry.origin is not None and entry.origin.stream_id in self.stream_ids
+
+    def compile(self) -> Predicate:
+        """Return a predicate with the stream id set bound as a constant."""
+        stream_ids = self.stream_ids
+
+        def matches(entry: Entry) -> bool:
+            origin = entry.origin
+            return origin is not None and origin.stream_id in stream_ids
+
+        return matches
+
+    def compile_batch(self) -> BatchPredicate:
+        """Return a batch predicate working on the page's column of stream ids."""
+        stream_ids = self.stream_ids
+
+        def matches_batch(entries: Sequence[Entry]) -> list[bool]:
+            return [
+                stream_id in stream_ids
+                for stream_id in (
+                    entry.origin.stream_id if entry.origin is not None else None
+                    for entry in entries
+                )
+            ]
+
+        return matches_batch
+
+    def add_to_stream_id_trie(self, trie: StreamIdTrie[int], key: int) -> bool:
+        """Register the stream ids as exact patterns."""
+        for stream_id in self.stream_ids:
+            trie.add(stream_id, key)
+        return True
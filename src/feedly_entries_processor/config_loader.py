@@ -22,12 +22,17 @@ from feedly_entries_processor.sources import StreamSource
 
 
 class Rule(BaseModel):
-    """Defines a single processing rule for Feedly entries."""
+    """Defines a single processing rule for Feedly entries.
+
+    Rules with a higher ``priority`` are processed first, and their queued
+    actions are the first to use a limited action budget.
+    """
 
     name: str
     source: StreamSource = Field(discriminator="name")
     condition: Condition = Field(discriminator="name")
     action: Action = Field(discriminator="name")
+    priority: int = 0
     model_config = ConfigDict(frozen=True)
 
 
@@ -1,5 +1,6 @@
 """Custom exceptions for the application."""
 
+from collections.abc import Mapping
 from typing import Any
 
 
@@ -19,10 +20,33 @@ class FetchEntriesError(FeedlyEntriesProcessorError):
     """Raised when there is an error fetching entries from Feedly."""
 
 
+class ConditionTimeBudgetExceededError(FeedlyEntriesProcessorError):
+    """Raised when evaluating a condition for one entry takes longer than allowed."""
+
+
 class ActionSkippedDueToPersistentError(FeedlyEntriesProcessorError):
     """Raised when an action is skipped because it previously encountered a persistent error."""
 
 
+class PartialFailureError(FeedlyEntriesProcessorError):
+    """Raised when an action failed for some of its entries and processed the others.
+
+    Attributes
+    ----------
+    errors
+        The error of each failed entry, by entry id. Entries not listed were
+        processed, and must not be processed again.
+    """
+
+    def __init__(self, message: str, *, errors: Mapping[str, Exception]) -> None:
+        super().__init__(message)
+        self.errors = dict(errors)
+
+
+class InvalidEntryError(FeedlyEntriesProcessorError, ValueError):
+    """Raised when an action cannot process an entry because of the entry itself (e.g. it has no URL)."""
+
+
 class TodoistApiError(FeedlyEntriesProcessorError):
     """Raised when there is an error communicating with the Todoist API.
 
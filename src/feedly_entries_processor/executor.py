@@ -0,0 +1,121 @@
+"""Execution of matched actions, inline or on a pool of worker threads."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager, nullcontext
+from typing import TYPE_CHECKING, Protocol
+
+from logzero import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator, Mapping, Sequence
+
+# One action call, labelled with the name of the action type that limits it.
+type Step = tuple[str, Callable[[], None]]
+
+
+class ActionExecutor(Protocol):
+    """Runs chains of action calls."""
+
+    def submit(self, steps: Sequence[Step]) -> None:
+        """Schedule steps to run one after the other, in order."""
+        ...
+
+    def wait(self) -> None:
+        """Block until every submitted chain has finished."""
+        ...
+
+
+class InlineActionExecutor:
+    """Executor that runs each chain immediately, in the calling thread."""
+
+    def submit(self, steps: Sequence[Step]) -> None:
+        """Run steps one after the other, in order."""
+        for _, call in steps:
+            call()
+
+    def wait(self) -> None:
+        """Return immediately; chains have already run."""
+
+
+class ThreadPoolActionExecutor:
+    """Executor that runs chains concurrently on a thread pool.
+
+    The steps of one chain run in order in a single worker, so the actions
+    of an entry keep their rule order. A step holds the semaphore of its
+    action type while it runs, so that at most ``concurrency[name]`` calls
+    to one action type are in flight across all workers.
+    """
+
+    def __init__(
+        self,
+        executor: ThreadPoolExecutor,
+        concurrency: Mapping[str, int],
+    ) -> None:
+        self._executor = executor
+        self._semaphores = {
+            name: threading.BoundedSemaphore(limit)
+            for name, limit in concurrency.items()
+        }
+        self._futures: list[Future[None]] = []
+
+    def _run(self, steps: Sequence[Step]) -> None:
+        for name, call in steps:
+            semaphore = self._semaphores.get(name)
+            with semaphore if semaphore is not None else nullcontext():
+                call()
+
+    def submit(self, steps: Sequence[Step]) -> None:
+        """Schedule steps to run one after the other, in order, in one worker."""
+        self._futures.append(self._executor.submit(self._run, steps))
+
+    def wait(self) -> None:
+        """Block until every chain submitted so far has finished.
+
+        A chain stops at its first failing step; the other chains still run
+        to the end.
+
+        Raises
+        ------
+            Exception: The error of the earliest submitted chain that failed,
+                raised only after all chains have finished.
+        """
+        futures, self._futures = self._futures, []
+        wait(futures)
+        for future in futures:
+            future.result()
+
+
+@contextmanager
+def create_action_executor(
+    *,
+    workers: int = 0,
+    concurrency: Mapping[str, int] | None = None,
+) -> Generator[ActionExecutor]:
+    """Create an executor for matched actions.
+
+    Parameters
+    ----------
+    workers
+        Number of worker threads. 0 runs actions inline, one at a time.
+    concurrency
+        Maximum number of concurrent calls per action name (e.g.
+        ``{"add_todoist_task": 2}``); unlisted actions are limited only by
+        ``workers``.
+
+    Yields
+    ------
+    ActionExecutor
+        The executor; the thread pool is shut down when the context exits.
+    """
+    if workers == 0:
+        yield InlineActionExecutor()
+        return
+
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="action"
+    ) as executor:
+        logger.info(f"Running actions in {workers} worker threads.")
+        yield ThreadPoolActionExecutor(executor, concurrency or {})
@@ -1,7 +1,8 @@
 """Feedly client for fetching entries."""
 
-from collections.abc import Generator
+from collections.abc import Generator, Sequence
 from pathlib import Path
+from typing import Literal
 from urllib.parse import quote
 
 from feedly.api_client.session import FeedlySession, FileAuthStore
@@ -15,6 +16,15 @@ from feedly_entries_processor.exceptions import (
     FeedlyEntriesProcessorError,
     FetchEntriesError,
 )
+from feedly_entries_processor.rate_limit import rate_limiters
+
+STREAM_PAGE_SIZE = 1000
+# Entry ids are sent comma-joined in the URL path; this keeps URLs short.
+UNTAG_CHUNK_SIZE = 50
+# Entry ids are sent in the JSON body of /v3/markers, which takes far more.
+MARKERS_CHUNK_SIZE = 1000
+
+type MarkerAction = Literal["markAsRead", "keepUnread", "markAsSaved", "markAsUnsaved"]
 
 
 class Summary(BaseModel):
@@ -135,7 +145,7 @@ class FeedlyClient:
                         params=(
                             {
                                 "streamId": stream_id,
-                                "count": "1000",
+                                "count": str(STREAM_PAGE_SIZE),
                                 "ranked": "newest",
                             }
                             | ({"continuation": continuation} if continuation else {})
@@ -168,15 +178,60 @@ class FeedlyClient:
         ------
             FeedlyEntriesProcessorError: If there is an error removing the entry.
         """
+        self.remove_entries_from_tag(tag_id, [entry_id])
+
+    def remove_entries_from_tag(self, tag_id: str, entry_ids: Sequence[str]) -> None:
+        """Remove several entries from a Feedly tag in one request.
+
+        Parameters
+        ----------
+            tag_id: The tag identifier (e.g. global.saved, or a user tag label like tech).
+            entry_ids: The IDs of the entries to remove; at most `UNTAG_CHUNK_SIZE`
+                keep the request URL within common length limits.
+
+        Raises
+        ------
+            FeedlyEntriesProcessorError: If there is an error removing the entries.
+        """
+        if not entry_ids:
+            return
         stream_id_encoded = quote(f"user/{self.user_id}/tag/{tag_id}", safe="")
-        entry_encoded = quote(entry_id, safe="")
+        entries_encoded = ",".join(quote(entry_id, safe="") for entry_id in entry_ids)
         try:
             self.feedly_session.do_api_request(
-                relative_url=f"/v3/tags/{stream_id_encoded}/{entry_encoded}",
+                relative_url=f"/v3/tags/{stream_id_encoded}/{entries_encoded}",
                 method="DELETE",
             )
         except RequestException as e:
-            msg = f"Failed to remove entry {entry_id!r} from tag {tag_id!r}."
+            if len(entry_ids) == 1:
+                msg = f"Failed to remove entry {entry_ids[0]!r} from tag {tag_id!r}."
+            else:
+                msg = f"Failed to remove {len(entry_ids)} entries from tag {tag_id!r}."
+            raise FeedlyEntriesProcessorError(msg) from e
+
+    def mark_entries(self, action: MarkerAction, entry_ids: Sequence[str]) -> None:
+        """Mark several entries as read, unread, saved or unsaved in one request.
+
+        Parameters
+        ----------
+            action: The marker action, e.g. markAsRead or markAsUnsaved.
+            entry_ids: The IDs of the entries to mark; at most `MARKERS_CHUNK_SIZE`
+                per request.
+
+        Raises
+        ------
+            FeedlyEntriesProcessorError: If there is an error marking the entries.
+        """
+        if not entry_ids:
+            return
+        try:
+            self.feedly_session.do_api_request(
+                relative_url="/v3/markers",
+                method="POST",
+                data={"action": action, "type": "entries", "entryIds": list(entry_ids)},
+            )
+        except RequestException as e:
+            msg = f"Failed to {action} {len(entry_ids)} entries."
             raise FeedlyEntriesProcessorError(msg) from e
 
 
@@ -201,6 +256,10 @@ def create_feedly_client(token_dir: Path) -> FeedlyClient:
     try:
         auth = FileAuthStore(token_dir=token_dir)
         feedly_session = FeedlySession(auth=auth)
+        # Same retry setting as FeedlySession's own adapter, plus rate limiting.
+        feedly_session.session.mount(
+            "https://feedly.com", rate_limiters.adapter("feedly", max_retries=1)
+        )
         return FeedlyClient(feedly_session=feedly_session)
     except (ValueError, FileNotFoundError, PermissionError) as e:
         msg = (
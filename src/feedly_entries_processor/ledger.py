@@ -0,0 +1,345 @@
+"""Persistent ledger of (rule, entry) pairs already handled in earlier runs."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import batched
+from typing import TYPE_CHECKING
+
+from logzero import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Iterable, Sequence
+    from pathlib import Path
+
+    from feedly_entries_processor.config_loader import Rule
+    from feedly_entries_processor.feedly_client import Entry
+    from feedly_entries_processor.matching import Match, Matcher
+    from feedly_entries_processor.settings import ProcessingSettings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger (
+    rule_fingerprint TEXT NOT NULL,
+    entry_id TEXT NOT NULL,
+    handled_at REAL NOT NULL,
+    PRIMARY KEY (rule_fingerprint, entry_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ledger_handled_at ON ledger (handled_at);
+"""
+
+SECONDS_PER_DAY = 86_400
+
+# Maximum number of entry ids per IN (...) query; SQLite limits host parameters.
+_QUERY_CHUNK_SIZE = 500
+
+
+@lru_cache(maxsize=1024)
+def rule_fingerprint(rule: Rule) -> str:
+    """Return a key that changes whenever the rule's behaviour may change.
+
+    Everything but the priority is included, so editing a rule's source,
+    condition or action makes it evaluate every entry again. Fingerprints
+    are cached per rule.
+    """
+    payload = rule.model_dump_json(exclude={"priority"})
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class BloomFilter:
+    """Probabilistic set of strings: no false negatives, rare false positives.
+
+    Parameters
+    ----------
+    capacity
+        Number of items for which the false-positive rate stays at
+        ``error_rate``; it grows beyond that.
+    error_rate
+        Target false-positive rate.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self._bits = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self._hashes = max(1, round(self._bits / capacity * math.log(2)))
+        self._array = bytearray((self._bits + 7) // 8)
+        self._count = 0
+
+    def _positions(self, item: str) -> list[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self._bits for i in range(self._hashes)]
+
+    def add(self, item: str) -> None:
+        """Add an item."""
+        for position in self._positions(item):
+            self._array[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+
+    def __contains__(self, item: object) -> bool:
+        """Return True if the item may have been added, False if it certainly was not."""
+        if not isinstance(item, str):
+            return False
+        return all(
+            self._array[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def __len__(self) -> int:
+        """Return the number of items added, counting repeats."""
+        return self._count
+
+
+def _bloom_key(fingerprint: str, entry_id: str) -> str:
+    return f"{fingerprint}\0{entry_id}"
+
+
+@dataclass(frozen=True)
+class LedgerStats:
+    """Summary of the contents of a ledger."""
+
+    entries: int
+    by_rule: dict[str, int]
+    oldest: float | None
+    newest: float | None
+
+
+class Ledger:
+    """SQLite ledger of the entries each rule has already handled.
+
+    A pair is recorded once a rule's condition did not match the entry, or
+    once its action succeeded; recorded pairs are neither evaluated nor
+    acted on again until they are older than ``ttl`` seconds. An in-memory
+    Bloom filter answers most lookups of new entries without a query, and
+    records are written in one transaction per `flush`.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        ttl: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._path = path
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pending: dict[tuple[str, str], float] = {}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+        self._bloom = self._load_bloom()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path, timeout=30)
+
+    def _cutoff(self) -> float:
+        return self._clock() - self._ttl
+
+    def _load_bloom(self, minimum_capacity: int = 10_000) -> BloomFilter:
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT rule_fingerprint, entry_id FROM ledger WHERE handled_at >= ?",
+                (self._cutoff(),),
+            ).fetchall()
+        bloom = BloomFilter(max(minimum_capacity, 2 * len(rows)))
+        for fingerprint, entry_id in rows:
+            bloom.add(_bloom_key(fingerprint, entry_id))
+        return bloom
+
+    def seen(self, rule: Rule, entry_ids: Collection[str]) -> set[str]:
+        """Return the ids of the entries the rule has handled within the TTL."""
+        fingerprint = rule_fingerprint(rule)
+        with self._lock:
+            bloom = self._bloom
+            seen = {
+                entry_id
+                for entry_id in entry_ids
+                if (fingerprint, entry_id) in self._pending
+            }
+            candidates = [
+                entry_id
+                for entry_id in entry_ids
+                if entry_id not in seen and _bloom_key(fingerprint, entry_id) in bloom
+            ]
+        if not candidates:
+            return seen
+        with closing(self._connect()) as connection:
+            for chunk in batched(candidates, _QUERY_CHUNK_SIZE, strict=False):
+                placeholders = ", ".join("?" * len(chunk))
+                seen.update(
+                    entry_id
+                    for (entry_id,) in connection.execute(
+                        "SELECT entry_id FROM ledger"  # noqa: S608
+                        " WHERE rule_fingerprint = ? AND handled_at >= ?"
+                        f" AND entry_id IN ({placeholders})",
+                        (fingerprint, self._cutoff(), *chunk),
+                    )
+                )
+        return seen
+
+    def record(self, rule: Rule, entry_ids: Iterable[str]) -> None:
+        """Record that the rule has handled the entries; written on `flush`."""
+        fingerprint = rule_fingerprint(rule)
+        now = self._clock()
+        with self._lock:
+            for entry_id in entry_ids:
+                self._pending[fingerprint, entry_id] = now
+                self._bloom.add(_bloom_key(fingerprint, entry_id))
+
+    def flush(self) -> None:
+        """Write the pending records in one transaction."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            grow = len(self._bloom) > self._bloom.capacity
+        if pending:
+            with closing(self._connect()) as connection, connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO ledger"
+                    " (rule_fingerprint, entry_id, handled_at) VALUES (?, ?, ?)",
+                    [
+                        (fingerprint, entry_id, handled_at)
+                        for (fingerprint, entry_id), handled_at in pending.items()
+                    ],
+                )
+        if grow:
+            bloom = self._load_bloom(2 * self._bloom.capacity)
+            with self._lock:
+                self._bloom = bloom
+
+    def prune(self, keep: Collection[Rule] | None = None) -> int:
+        """Delete expired records, and those of rules not in ``keep`` if given.
+
+        Returns
+        -------
+        int
+            The number of records deleted.
+        """
+        self.flush()
+        with closing(self._connect()) as connection, connection:
+            deleted = connection.execute(
+                "DELETE FROM ledger WHERE handled_at < ?", (self._cutoff(),)
+            ).rowcount
+            if keep is not None:
+                fingerprints = {rule_fingerprint(rule) for rule in keep}
+                stale = [
+                    (fingerprint,)
+                    for (fingerprint,) in connection.execute(
+                        "SELECT DISTINCT rule_fingerprint FROM ledger"
+                    )
+                    if fingerprint not in fingerprints
+                ]
+                deleted += connection.executemany(
+                    "DELETE FROM ledger WHERE rule_fingerprint = ?", stale
+                ).rowcount
+        bloom = self._load_bloom()
+        with self._lock:
+            self._bloom = bloom
+        return deleted
+
+    def stats(self) -> LedgerStats:
+        """Return the number of records, per rule fingerprint, and their age range."""
+        self.flush()
+        with closing(self._connect()) as connection:
+            by_rule = dict(
+                connection.execute(
+                    "SELECT rule_fingerprint, COUNT(*) FROM ledger"
+                    " GROUP BY rule_fingerprint ORDER BY COUNT(*) DESC"
+                ).fetchall()
+            )
+            oldest, newest = connection.execute(
+                "SELECT MIN(handled_at), MAX(handled_at) FROM ledger"
+            ).fetchone()
+        return LedgerStats(
+            entries=sum(by_rule.values()),
+            by_rule=by_rule,
+            oldest=oldest,
+            newest=newest,
+        )
+
+
+class LedgerMatcher:
+    """Matcher that skips (rule, entry) pairs recorded in a ledger.
+
+    Entries that every rule has already handled are not evaluated at all;
+    matches of pairs already handled are dropped. Pairs that were evaluated
+    and did not match are recorded at once; matches are recorded by whoever
+    acts on them. Rules disabled for exceeding their time budget, and pairs
+    whose evaluation raised, are never recorded as not matching, so that
+    they are evaluated again in the next run.
+    """
+
+    def __init__(self, matcher: Matcher, ledger: Ledger) -> None:
+        self._matcher = matcher
+        self._ledger = ledger
+
+    @property
+    def rules(self) -> tuple[Rule, ...]:
+        """Return the rules, in the order matches are reported."""
+        return self._matcher.rules
+
+    @property
+    def disabled(self) -> frozenset[Rule]:
+        """Return the rules disabled so far for exceeding their time budget."""
+        return self._matcher.disabled
+
+    @property
+    def errored(self) -> frozenset[tuple[str, Rule]]:
+        """Return the (entry id, rule) pairs whose evaluation raised so far."""
+        return self._matcher.errored
+
+    def match_page(self, page: Sequence[Entry]) -> list[Match]:
+        """Return matched (entry index, rule) pairs not handled before."""
+        entry_ids = [entry.id for entry in page]
+        seen = {rule: self._ledger.seen(rule, entry_ids) for rule in self.rules}
+        indices = [
+            index
+            for index, entry_id in enumerate(entry_ids)
+            if not all(entry_id in rule_seen for rule_seen in seen.values())
+        ]
+        if len(indices) < len(page):
+            logger.debug(
+                f"Skipped {len(page) - len(indices)} entries already handled by every rule."
+            )
+        matched = [
+            (indices[index], rule)
+            for index, rule in self._matcher.match_page([page[i] for i in indices])
+            if entry_ids[indices[index]] not in seen[rule]
+        ]
+
+        matched_pairs = {(index, rule) for index, rule in matched}
+        disabled = self._matcher.disabled
+        errored = self._matcher.errored
+        for rule in self.rules:
+            if rule in disabled:
+                continue
+            self._ledger.record(
+                rule,
+                [
+                    entry_ids[index]
+                    for index in indices
+                    if entry_ids[index] not in seen[rule]
+                    and (index, rule) not in matched_pairs
+                    and (entry_ids[index], rule) not in errored
+                ],
+            )
+        return matched
+
+
+def open_ledger(settings: ProcessingSettings) -> Ledger | None:
+    """Open the ledger configured by ``LEDGER_PATH``, or return None if unset."""
+    if settings.ledger_path is None:
+        return None
+    return Ledger(settings.ledger_path, ttl=settings.ledger_ttl_days * SECONDS_PER_DAY)
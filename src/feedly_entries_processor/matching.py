@@ -0,0 +1,396 @@
+"""Evaluation of rule conditions against pages of Feedly entries."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import batched
+from math import ceil
+from typing import TYPE_CHECKING, NamedTuple, Protocol
+
+from logzero import logger
+
+from feedly_entries_processor.exceptions import ConditionTimeBudgetExceededError
+from feedly_entries_processor.stream_id_trie import StreamIdTrie
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable, Sequence
+
+    from feedly_entries_processor.conditions import Condition
+    from feedly_entries_processor.conditions.base_condition import BatchPredicate
+    from feedly_entries_processor.config_loader import Rule
+    from feedly_entries_processor.feedly_client import Entry
+
+# A matched (entry index within the page, rule) pair.
+type Match = tuple[int, Rule]
+
+
+def evaluate(entry: Entry, rule_name: str, condition: Condition) -> bool | None:
+    """Evaluate a condition for one entry, logging and returning None on error."""
+    try:
+        return condition.matches(entry)
+    except Exception:  # noqa: BLE001
+        logger.exception(
+            f"Error evaluating rule '{rule_name}' for entry '{entry.title}' (URL: {entry.effective_url})."
+        )
+        return None
+
+
+def matches(entry: Entry, rule_name: str, condition: Condition) -> bool:
+    """Evaluate a condition for one entry, logging and returning False on error."""
+    return evaluate(entry, rule_name, condition) is True
+
+
+class CompiledCondition(NamedTuple):
+    """A rule's condition together with its compiled batch predicate."""
+
+    rule_name: str
+    condition: Condition
+    matches_batch: BatchPredicate
+
+
+class _SharedStreamIdLookup:
+    """Looks up the stream ids of a page once for all stream-id conditions.
+
+    The last page and its hits are kept per thread, so that pages matched
+    at once in several threads do not see each other's hits.
+    """
+
+    def __init__(self, trie: StreamIdTrie[int]) -> None:
+        self._trie = trie
+        self._last = threading.local()
+
+    def _hits_for(self, page: Sequence[Entry]) -> list[frozenset[int]]:
+        last: tuple[Sequence[Entry], list[frozenset[int]]] | None = getattr(
+            self._last, "page_hits", None
+        )
+        if last is not None and last[0] is page:
+            return last[1]
+        lookup = self._trie.lookup
+        hits = [
+            lookup(entry.origin.stream_id) if entry.origin is not None else frozenset()
+            for entry in page
+        ]
+        self._last.page_hits = (page, hits)
+        return hits
+
+    def batch_predicate(self, key: int) -> BatchPredicate:
+        """Return a batch predicate for the condition registered under ``key``."""
+
+        def matches_batch(entries: Sequence[Entry]) -> list[bool]:
+            return [key in hits for hits in self._hits_for(entries)]
+
+        return matches_batch
+
+
+def compile_conditions(
+    conditions: Iterable[tuple[str, Condition]],
+) -> tuple[CompiledCondition, ...]:
+    """Compile (rule name, condition) pairs once, before any entry is matched.
+
+    When some conditions use stream-id globs, every condition that depends only
+    on the stream id is dispatched through one shared trie, so each entry's
+    stream id is looked up once per page whatever the number of patterns.
+    """
+    conditions = tuple(conditions)
+    trie: StreamIdTrie[int] = StreamIdTrie()
+    indexed = {
+        key
+        for key, (_, condition) in enumerate(conditions)
+        if condition.add_to_stream_id_trie(trie, key)
+    }
+    shared = _SharedStreamIdLookup(trie) if trie.has_globs else None
+
+    return tuple(
+        CompiledCondition(
+            rule_name,
+            condition,
+            shared.batch_predicate(key)
+            if shared is not None and key in indexed
+            else condition.compile_batch(),
+        )
+        for key, (rule_name, condition) in enumerate(conditions)
+    )
+
+
+def matches_batch(
+    page: Sequence[Entry], compiled: CompiledCondition
+) -> list[bool] | list[bool | None]:
+    """Evaluate a compiled condition for a page of entries.
+
+    If the compiled evaluation fails, the page is re-evaluated entry by entry
+    with the interpreted `evaluate`, so that one bad entry only affects itself;
+    its result is None.
+
+    Raises
+    ------
+        ConditionTimeBudgetExceededError: If an entry took too long to match;
+            such a rule is not re-evaluated.
+    """
+    try:
+        return compiled.matches_batch(page)
+    except ConditionTimeBudgetExceededError:
+        raise
+    except Exception as e:  # noqa: BLE001
+        logger.warning(
+            f"Error evaluating rule '{compiled.rule_name}' for a page of {len(page)} entries; "
+            f"falling back to per-entry evaluation: {e}"
+        )
+        return [
+            evaluate(entry, compiled.rule_name, compiled.condition) for entry in page
+        ]
+
+
+def _match_indices(
+    page: Sequence[Entry],
+    conditions: Sequence[CompiledCondition],
+    disabled: set[int],
+    errored: set[tuple[int, int]],
+) -> list[tuple[int, int]]:
+    """Return (entry index, rule index) pairs, ordered by entry then rule.
+
+    Rules whose index is in ``disabled`` are skipped. A rule that exceeds its
+    time budget is reported and added to ``disabled``, so that it is not
+    evaluated again for the rest of the run while the other rules go on.
+    Pairs whose evaluation raised are added to ``errored``.
+    """
+    masks: list[tuple[int, list[bool] | list[bool | None]]] = []
+    for rule_index, compiled in enumerate(conditions):
+        if rule_index in disabled:
+            continue
+        try:
+            masks.append((rule_index, matches_batch(page, compiled)))
+        except ConditionTimeBudgetExceededError as e:
+            logger.error(
+                f"Rule '{compiled.rule_name}' disabled for the rest of this run: {e}"
+            )
+            disabled.add(rule_index)
+    errored.update(
+        (entry_index, rule_index)
+        for rule_index, mask in masks
+        for entry_index, matched in enumerate(mask)
+        if matched is None
+    )
+    return [
+        (entry_index, rule_index)
+        for entry_index in range(len(page))
+        for rule_index, mask in masks
+        if mask[entry_index]
+    ]
+
+
+class Matcher(Protocol):
+    """Finds the rules that match each entry of a page."""
+
+    @property
+    def rules(self) -> tuple[Rule, ...]:
+        """Return the rules, in the order matches are reported."""
+        ...
+
+    @property
+    def disabled(self) -> frozenset[Rule]:
+        """Return the rules disabled so far for exceeding their time budget."""
+        ...
+
+    @property
+    def errored(self) -> frozenset[tuple[str, Rule]]:
+        """Return the (entry id, rule) pairs whose evaluation raised so far."""
+        ...
+
+    def match_page(self, page: Sequence[Entry]) -> list[Match]:
+        """Return matched (entry index, rule) pairs, ordered by entry then rule."""
+        ...
+
+
+class SerialMatcher:
+    """Matcher that evaluates every condition in the current process.
+
+    Pages may be matched from several threads at once; the rules disabled
+    and the pairs that raised are merged under a lock.
+    """
+
+    def __init__(self, rules: Sequence[Rule]) -> None:
+        self._rules = tuple(rules)
+        self._conditions = compile_conditions(
+            (rule.name, rule.condition) for rule in self._rules
+        )
+        self._disabled: set[int] = set()
+        self._errored: set[tuple[str, Rule]] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def rules(self) -> tuple[Rule, ...]:
+        """Return the rules, in the order matches are reported."""
+        return self._rules
+
+    @property
+    def disabled(self) -> frozenset[Rule]:
+        """Return the rules disabled so far for exceeding their time budget."""
+        with self._lock:
+            return frozenset(self._rules[index] for index in self._disabled)
+
+    @property
+    def errored(self) -> frozenset[tuple[str, Rule]]:
+        """Return the (entry id, rule) pairs whose evaluation raised so far."""
+        with self._lock:
+            return frozenset(self._errored)
+
+    def match_page(self, page: Sequence[Entry]) -> list[Match]:
+        """Return matched (entry index, rule) pairs, ordered by entry then rule."""
+        with self._lock:
+            disabled = set(self._disabled)
+        errored: set[tuple[int, int]] = set()
+        pairs = _match_indices(page, self._conditions, disabled, errored)
+        with self._lock:
+            self._disabled |= disabled
+            self._errored.update(
+                (page[entry_index].id, self._rules[rule_index])
+                for entry_index, rule_index in errored
+            )
+        return [
+            (entry_index, self._rules[rule_index]) for entry_index, rule_index in pairs
+        ]
+
+
+_worker_conditions: tuple[CompiledCondition, ...] = ()
+_worker_disabled: set[int] = set()
+
+
+def _init_worker(conditions: tuple[tuple[str, Condition], ...]) -> None:
+    """Compile the rule conditions in a pool worker once, at start-up."""
+    global _worker_conditions  # noqa: PLW0603
+    _worker_conditions = compile_conditions(conditions)
+
+
+def _match_chunk(
+    offset: int, chunk: Sequence[Entry], disabled: frozenset[int] = frozenset()
+) -> tuple[list[tuple[int, int]], frozenset[int], list[tuple[int, int]]]:
+    """Match a chunk of a page in a pool worker.
+
+    Rules in ``disabled``, which were disabled by any worker, are skipped.
+    Returns page-relative (entry index, rule index) pairs, the indices of
+    the rules this worker has disabled, and the page-relative pairs whose
+    evaluation raised.
+    """
+    _worker_disabled.update(disabled)
+    errored: set[tuple[int, int]] = set()
+    pairs = [
+        (offset + entry_index, rule_index)
+        for entry_index, rule_index in _match_indices(
+            chunk, _worker_conditions, _worker_disabled, errored
+        )
+    ]
+    return (
+        pairs,
+        frozenset(_worker_disabled),
+        [(offset + entry_index, rule_index) for entry_index, rule_index in errored],
+    )
+
+
+class ProcessPoolMatcher:
+    """Matcher that spreads each page over a pool of worker processes.
+
+    Workers receive the rule conditions once, when they start, and compile
+    them there (compiled predicates cannot be pickled); after that they get only
+    entries; they send back (entry index, rule index) pairs, never entries.
+    Actions still run in the parent process, in order. A rule disabled for
+    exceeding its time budget in any worker is disabled for the whole pool:
+    the parent drops its matches from the page where that happened on, as
+    `SerialMatcher` does, and sends the disabled rules with every chunk so
+    that no worker evaluates them again.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[Rule],
+        executor: ProcessPoolExecutor,
+        workers: int,
+    ) -> None:
+        self._rules = tuple(rules)
+        self._executor = executor
+        self._workers = workers
+        self._disabled: set[int] = set()
+        self._errored: set[tuple[str, Rule]] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def rules(self) -> tuple[Rule, ...]:
+        """Return the rules, in the order matches are reported."""
+        return self._rules
+
+    @property
+    def disabled(self) -> frozenset[Rule]:
+        """Return the rules disabled so far, in any worker."""
+        with self._lock:
+            return frozenset(self._rules[index] for index in self._disabled)
+
+    @property
+    def errored(self) -> frozenset[tuple[str, Rule]]:
+        """Return the (entry id, rule) pairs whose evaluation raised so far, in any worker."""
+        with self._lock:
+            return frozenset(self._errored)
+
+    def match_page(self, page: Sequence[Entry]) -> list[Match]:
+        """Return matched (entry index, rule) pairs, ordered by entry then rule."""
+        if not page:
+            return []
+        chunk_size = ceil(len(page) / self._workers)
+        with self._lock:
+            disabled = frozenset(self._disabled)
+        futures = [
+            self._executor.submit(
+                _match_chunk, chunk_index * chunk_size, chunk, disabled
+            )
+            for chunk_index, chunk in enumerate(batched(page, chunk_size, strict=False))
+        ]
+        results = [future.result() for future in futures]
+        with self._lock:
+            for _, worker_disabled, errored in results:
+                self._disabled |= worker_disabled
+                self._errored.update(
+                    (page[entry_index].id, self._rules[rule_index])
+                    for entry_index, rule_index in errored
+                )
+            disabled = frozenset(self._disabled)
+        return [
+            (entry_index, self._rules[rule_index])
+            for pairs, _, _ in results
+            for entry_index, rule_index in pairs
+            if rule_index not in disabled
+        ]
+
+
+@contextmanager
+def create_matcher(
+    rules: Sequence[Rule],
+    *,
+    workers: int = 0,
+) -> Generator[Matcher]:
+    """Create a matcher for the given rules.
+
+    Parameters
+    ----------
+    rules
+        The rules to match entries against.
+    workers
+        Number of worker processes. 0 evaluates conditions in the current
+        process.
+
+    Yields
+    ------
+    Matcher
+        The matcher; a process pool is shut down when the context exits.
+    """
+    if workers == 0:
+        yield SerialMatcher(rules)
+        return
+
+    conditions = tuple((rule.name, rule.condition) for rule in rules)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(conditions,),
+    ) as executor:
+        logger.info(f"Matching rules in {workers} worker processes.")
+        yield ProcessPoolMatcher(rules, executor, workers)
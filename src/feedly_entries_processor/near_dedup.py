@@ -0,0 +1,168 @@
+"""Suppression of entries whose text nearly repeats a recent entry's, by SimHash."""
+
+from __future__ import annotations
+
+import hashlib
+import html
+import re
+from collections import deque
+from itertools import batched, pairwise
+from typing import TYPE_CHECKING
+
+from logzero import logger
+
+from feedly_entries_processor.feedly_client import STREAM_PAGE_SIZE
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from feedly_entries_processor.feedly_client import Entry
+    from feedly_entries_processor.settings import ProcessingSettings
+
+FINGERPRINT_BITS = 64
+_HASH_BYTES = FINGERPRINT_BITS // 8
+
+# Words per shingle, and the fewest shingles a text needs to be fingerprinted;
+# shorter texts are too likely to collide by chance.
+SHINGLE_SIZE = 3
+MIN_SHINGLES = 4
+
+# _BIT_OF[bit] maps a byte to 1 if it has ``bit`` set and to 0 otherwise, so
+# that the hashes having a bit set are counted by `bytes.count`.
+_BIT_OF = tuple(bytes((byte >> bit) & 1 for byte in range(256)) for bit in range(8))
+
+_TAG = re.compile(r"<[^>]*>")
+_WORD = re.compile(r"\w+")
+
+
+def _words(entry: Entry) -> list[str]:
+    text = entry.title or ""
+    if entry.summary is not None:
+        text = f"{text} {html.unescape(_TAG.sub(' ', entry.summary.content))}"
+    return _WORD.findall(text.lower())
+
+
+def simhash(shingles: Iterable[str]) -> int:
+    """Return the 64-bit SimHash of a set of shingles.
+
+    Each bit is set when most shingle hashes have it set, so that texts
+    sharing most shingles get fingerprints differing in few bits. The hashes
+    are concatenated, and the hashes having each bit set are counted over
+    the whole byte string at once rather than shingle by shingle.
+    """
+    unique = dict.fromkeys(shingles)
+    data = b"".join(
+        hashlib.blake2b(shingle.encode(), digest_size=_HASH_BYTES).digest()
+        for shingle in unique
+    )
+    threshold = len(unique) / 2
+    fingerprint = 0
+    for position in range(_HASH_BYTES):
+        column = data[position::_HASH_BYTES]
+        for bit, bit_of in enumerate(_BIT_OF):
+            if column.translate(bit_of).count(1) > threshold:
+                fingerprint |= 1 << (position * 8 + bit)
+    return fingerprint
+
+
+def entry_fingerprint(entry: Entry) -> int | None:
+    """Return the SimHash of an entry's title and summary, or None if too short."""
+    words = _words(entry)
+    shingles = [
+        " ".join(words[i : i + SHINGLE_SIZE])
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    ]
+    if len(shingles) < MIN_SHINGLES:
+        return None
+    return simhash(shingles)
+
+
+class NearDuplicateFilter:
+    """Drops entries whose fingerprint is within ``max_distance`` bits of a recent one.
+
+    The last ``window`` fingerprints are kept, each with the id of its
+    entry, so that the same entry seen again, e.g. in another source, is not
+    dropped as a repeat of itself. They are indexed by
+    ``max_distance + 1`` bands of bits: two fingerprints that differ in at
+    most ``max_distance`` bits agree on at least one band, so only the
+    fingerprints sharing a band are compared. Entries too short to
+    fingerprint are never dropped.
+    """
+
+    def __init__(self, *, max_distance: int = 3, window: int = 50_000) -> None:
+        self._max_distance = max_distance
+        self._window = window
+        bounds = [
+            round(index * FINGERPRINT_BITS / (max_distance + 1))
+            for index in range(max_distance + 2)
+        ]
+        self._bands = [
+            (((1 << (stop - start)) - 1) << start) for start, stop in pairwise(bounds)
+        ]
+        # Band key to the (fingerprint, entry id) pairs sharing it, per band.
+        self._buckets: list[dict[int, list[tuple[int, str]]]] = [
+            {} for _ in self._bands
+        ]
+        self._recent: deque[tuple[int, str]] = deque()
+        self.dropped = 0
+
+    def _add(self, fingerprint: int, entry_id: str) -> None:
+        item = (fingerprint, entry_id)
+        self._recent.append(item)
+        for mask, buckets in zip(self._bands, self._buckets, strict=True):
+            buckets.setdefault(fingerprint & mask, []).append(item)
+        if len(self._recent) > self._window:
+            oldest = self._recent.popleft()
+            for mask, buckets in zip(self._bands, self._buckets, strict=True):
+                bucket = buckets[oldest[0] & mask]
+                bucket.remove(oldest)
+                if not bucket:
+                    del buckets[oldest[0] & mask]
+
+    def is_duplicate(self, fingerprint: int, entry_id: str) -> bool:
+        """Return True if the fingerprint is near a recent one of another entry.
+
+        Otherwise the fingerprint is remembered as the entry's, unless the
+        entry was already seen with a fingerprint near it.
+        """
+        max_distance = self._max_distance
+        seen = False
+        for mask, buckets in zip(self._bands, self._buckets, strict=True):
+            for other, other_id in buckets.get(fingerprint & mask, ()):
+                if (fingerprint ^ other).bit_count() > max_distance:
+                    continue
+                if other_id != entry_id:
+                    self.dropped += 1
+                    return True
+                seen = True
+        if not seen:
+            self._add(fingerprint, entry_id)
+        return False
+
+    def filter(self, entries: Iterable[Entry]) -> Iterator[Entry]:
+        """Yield the entries that do not nearly repeat another recent one, page by page."""
+        for page in batched(entries, STREAM_PAGE_SIZE, strict=False):
+            fingerprints = [entry_fingerprint(entry) for entry in page]
+            kept = [
+                entry
+                for entry, fingerprint in zip(page, fingerprints, strict=True)
+                if fingerprint is None or not self.is_duplicate(fingerprint, entry.id)
+            ]
+            if len(kept) < len(page):
+                logger.debug(
+                    f"Skipped {len(page) - len(kept)} entries nearly repeating "
+                    "a recent entry."
+                )
+            yield from kept
+
+
+def open_near_duplicate_filter(
+    settings: ProcessingSettings,
+) -> NearDuplicateFilter | None:
+    """Create the filter enabled by ``NEAR_DUP_DISTANCE``, or return None if unset."""
+    if settings.near_dup_distance is None:
+        return None
+    return NearDuplicateFilter(
+        max_distance=settings.near_dup_distance,
+        window=settings.near_dup_window,
+    )
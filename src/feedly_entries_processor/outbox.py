@@ -0,0 +1,543 @@
+"""Durable local outbox of matched actions, drained in the background."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from math import ceil
+from typing import TYPE_CHECKING, NamedTuple
+
+from logzero import logger
+
+from feedly_entries_processor.feedly_client import Entry
+from feedly_entries_processor.ledger import SECONDS_PER_DAY
+from feedly_entries_processor.quarantine import (
+    classify_batch_failure,
+    failed_entry_ids,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        Callable,
+        Collection,
+        Generator,
+        Iterable,
+        Mapping,
+    )
+    from pathlib import Path
+
+    from feedly_entries_processor.config_loader import Rule
+    from feedly_entries_processor.settings import ProcessingSettings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    key TEXT PRIMARY KEY,
+    rule_key TEXT NOT NULL,
+    entry TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    published INTEGER,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    seen_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_due ON jobs (status, next_attempt_at);
+"""
+
+# Columns added after the first release, with their definitions.
+_ADDED_COLUMNS = {
+    "priority": "INTEGER NOT NULL DEFAULT 0",
+    "published": "INTEGER",
+    "seen_at": "REAL",
+}
+
+# Retry delays grow from RETRY_BASE_DELAY, doubling per attempt, up to RETRY_MAX_DELAY.
+RETRY_BASE_DELAY = 30.0
+RETRY_MAX_DELAY = 3600.0
+# Jobs whose action completes them on flush are not run again for this long
+# while they wait for it; if the process stops first, they are retried then.
+FLUSH_LEASE = 3600.0
+
+
+class OutboxJob(NamedTuple):
+    """A matched (entry, rule) pair waiting for its action to run."""
+
+    key: str
+    rule_key: str
+    entry: Entry
+    attempts: int
+
+
+def rule_key(rule: Rule) -> str:
+    """Return a key identifying a rule's name and action configuration.
+
+    Jobs refer to their rule by this key, so that no setting (e.g. an API
+    token) is written to the outbox, and a job whose rule has since changed
+    its action is not run with the new one.
+    """
+    payload = f"{rule.name}\0{rule.action.model_dump_json()}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def idempotency_key(entry: Entry, rule: Rule) -> str:
+    """Return the key identifying a match of an entry by a rule's action.
+
+    The same entry matched again by an unchanged rule gets the same key, so
+    its job is neither queued nor run twice.
+    """
+    payload = f"{rule_key(rule)}\0{entry.id}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def retry_delay(attempts: int) -> float:
+    """Return the delay before the next attempt of a job that failed ``attempts`` times."""
+    return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2.0 ** (attempts - 1))
+
+
+class Outbox:
+    """SQLite-backed queue of matched actions.
+
+    Jobs are written when entries match and survive the process; a job
+    stays pending, with exponential backoff, until its action succeeds.
+    Finished jobs are kept, so that their entry is not acted on again, until
+    it has not matched for ``ttl`` seconds; see `prune`. Each operation uses
+    its own connection, so the outbox can be shared between the matching
+    loop and a drain thread.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        ttl: float = 90 * SECONDS_PER_DAY,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._path = path
+        self._ttl = ttl
+        self._clock = clock
+        self._held: dict[str, list[OutboxJob]] = {}
+        self._held_lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(jobs)")}
+            for column, definition in _ADDED_COLUMNS.items():
+                if column not in columns:
+                    connection.execute(
+                        f"ALTER TABLE jobs ADD COLUMN {column} {definition}"
+                    )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path, timeout=30)
+
+    def enqueue(self, matches: Iterable[tuple[Entry, Rule]]) -> int:
+        """Queue the actions of matched entries; return the number of new jobs.
+
+        Matches already queued are only recorded as seen again.
+        """
+        now = self._clock()
+        rows = [
+            (
+                idempotency_key(entry, rule),
+                rule_key(rule),
+                entry.model_dump_json(by_alias=True, exclude_none=True),
+                rule.priority,
+                entry.published,
+                now,
+                now,
+                now,
+                now,
+            )
+            for entry, rule in matches
+        ]
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "UPDATE jobs SET seen_at = ? WHERE key = ?",
+                [(now, row[0]) for row in rows],
+            )
+            cursor = connection.executemany(
+                "INSERT OR IGNORE INTO jobs"
+                " (key, rule_key, entry, priority, published,"
+                " next_attempt_at, created_at, updated_at, seen_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            return cursor.rowcount
+
+    def reprioritize(self, rules: Mapping[str, Rule]) -> None:
+        """Update the priority of pending jobs to that of their rule, keyed by `rule_key`."""
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "UPDATE jobs SET priority = ? WHERE rule_key = ? AND status = 'pending'",
+                [(rule.priority, key) for key, rule in rules.items()],
+            )
+
+    def prune(self, keep: Collection[str]) -> int:
+        """Delete the jobs whose entry has not matched for ``ttl`` seconds.
+
+        Pending jobs of the rules whose `rule_key` is in ``keep`` are kept
+        whatever their age; those of other rules, e.g. removed or whose
+        action changed, are deleted like finished jobs. ``ttl`` should exceed
+        the ledger's, so that an entry the ledger forgets is matched again,
+        and its job seen again, before the job is deleted.
+
+        Returns
+        -------
+        int
+            The number of jobs deleted.
+        """
+        placeholders = ", ".join("?" * len(keep))
+        with closing(self._connect()) as connection, connection:
+            return connection.execute(
+                "DELETE FROM jobs"  # noqa: S608
+                " WHERE COALESCE(seen_at, updated_at) < ?"
+                f" AND (status != 'pending' OR rule_key NOT IN ({placeholders}))",
+                (self._clock() - self._ttl, *keep),
+            ).rowcount
+
+    def due(self, rule_keys: Collection[str], limit: int = 100) -> list[OutboxJob]:
+        """Return pending jobs of the given rules that are due.
+
+        Jobs come in order of rule priority, highest first, then of entry
+        recency, most recently published first.
+        """
+        if not rule_keys:
+            return []
+        placeholders = ", ".join("?" * len(rule_keys))
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT key, rule_key, entry, attempts FROM jobs"  # noqa: S608
+                " WHERE status = 'pending' AND next_attempt_at <= ?"
+                f" AND rule_key IN ({placeholders})"
+                " ORDER BY priority DESC, COALESCE(published, 0) DESC, created_at, rowid"
+                " LIMIT ?",
+                (self._clock(), *rule_keys, limit),
+            ).fetchall()
+        return [
+            OutboxJob(key, job_rule_key, Entry.model_validate_json(entry), attempts)
+            for key, job_rule_key, entry, attempts in rows
+        ]
+
+    def mark_done(self, jobs: Iterable[OutboxJob]) -> None:
+        """Record that the jobs' actions succeeded."""
+        now = self._clock()
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "UPDATE jobs SET status = 'done', last_error = NULL, updated_at = ?"
+                " WHERE key = ?",
+                [(now, job.key) for job in jobs],
+            )
+
+    def hold(self, jobs: Iterable[OutboxJob]) -> None:
+        """Keep jobs, whose action completes them on flush, pending until `release`.
+
+        They are not due again for `FLUSH_LEASE` seconds, so a run that stops
+        before flushing retries them in a later run.
+        """
+        jobs = list(jobs)
+        now = self._clock()
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "UPDATE jobs SET next_attempt_at = ?, updated_at = ? WHERE key = ?",
+                [(now + FLUSH_LEASE, now, job.key) for job in jobs],
+            )
+        with self._held_lock:
+            for job in jobs:
+                self._held.setdefault(job.rule_key, []).append(job)
+
+    def release(self, key: str) -> list[OutboxJob]:
+        """Return, and forget, the jobs held for the rule whose `rule_key` is ``key``."""
+        with self._held_lock:
+            return self._held.pop(key, [])
+
+    def mark_failed(self, jobs: Iterable[OutboxJob], error: BaseException) -> None:
+        """Record a failed attempt and schedule the next one with backoff."""
+        now = self._clock()
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "UPDATE jobs SET attempts = ?, next_attempt_at = ?, last_error = ?,"
+                " updated_at = ? WHERE key = ?",
+                [
+                    (
+                        job.attempts + 1,
+                        now + retry_delay(job.attempts + 1),
+                        repr(error),
+                        now,
+                        job.key,
+                    )
+                    for job in jobs
+                ],
+            )
+
+    def mark_rejected(self, job: OutboxJob, reason: str) -> None:
+        """Record that the job's action failed in a way that will recur; it is not retried."""
+        now = self._clock()
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "UPDATE jobs SET status = 'rejected', attempts = ?, last_error = ?,"
+                " updated_at = ? WHERE key = ?",
+                (job.attempts + 1, reason, now, job.key),
+            )
+
+    def pending_count(self, rule_keys: Collection[str] | None = None) -> int:
+        """Return the number of jobs whose action has not succeeded yet.
+
+        With ``rule_keys``, only jobs of those rules are counted.
+        """
+        query = "SELECT COUNT(*) FROM jobs WHERE status = 'pending'"
+        if rule_keys is not None:
+            placeholders = ", ".join("?" * len(rule_keys))
+            query += f" AND rule_key IN ({placeholders})"
+        with closing(self._connect()) as connection:
+            (count,) = connection.execute(query, tuple(rule_keys or ())).fetchone()
+        return int(count)
+
+
+def open_outbox(
+    settings: ProcessingSettings, rules: Mapping[str, Rule]
+) -> Outbox | None:
+    """Open the outbox configured by ``OUTBOX_PATH``, or return None if unset.
+
+    Stale jobs are deleted (see `Outbox.prune`), and pending jobs take the
+    priority of their rule in ``rules``, keyed by `rule_key`.
+    """
+    if settings.outbox_path is None:
+        return None
+    outbox = Outbox(
+        settings.outbox_path, ttl=settings.outbox_ttl_days * SECONDS_PER_DAY
+    )
+    pruned = outbox.prune(rules)
+    if pruned:
+        logger.info(
+            f"Deleted {pruned} outbox jobs whose entry has not matched recently"
+        )
+    outbox.reprioritize(rules)
+    return outbox
+
+
+def _record_failure(
+    outbox: Outbox, rule: Rule, jobs: list[OutboxJob], error: Exception
+) -> None:
+    """Reject the jobs whose failure will recur, and schedule the others for retry."""
+    reasons = classify_batch_failure(error, [job.entry for job in jobs])
+    rejected = [job for job in jobs if job.entry.id in reasons]
+    retried = [job for job in jobs if job.entry.id not in reasons]
+    for job in rejected:
+        outbox.mark_rejected(job, reasons[job.entry.id])
+    if rejected:
+        logger.warning(
+            f"Rule '{rule.name}' failed for {len(rejected)} queued entries "
+            f"in a way that will recur; they will not be retried: {error!r}"
+        )
+    if retried:
+        logger.warning(
+            f"Rule '{rule.name}' failed for {len(retried)} queued entries; "
+            f"will retry: {error!r}"
+        )
+        outbox.mark_failed(retried, error)
+
+
+def _run_jobs(outbox: Outbox, rule: Rule, jobs: list[OutboxJob]) -> None:
+    """Run the action of a rule for its jobs, recording each outcome.
+
+    Only the jobs listed by a `PartialFailureError` failed. Jobs of an action
+    that completes them on flush are held until then.
+    """
+    batches = [jobs] if rule.action.supports_batch else [[job] for job in jobs]
+    for batch in batches:
+        try:
+            if rule.action.supports_batch:
+                rule.action.process_batch([job.entry for job in batch])
+            else:
+                rule.action.process(batch[0].entry)
+        except Exception as e:  # noqa: BLE001
+            failed = failed_entry_ids(e, [job.entry for job in batch])
+            _record_failure(
+                outbox, rule, [job for job in batch if job.entry.id in failed], e
+            )
+            succeeded = [job for job in batch if job.entry.id not in failed]
+        else:
+            succeeded = batch
+        if rule.action.completes_on_flush:
+            outbox.hold(succeeded)
+        else:
+            outbox.mark_done(succeeded)
+
+
+def _flush_jobs(outbox: Outbox, key: str, rule: Rule) -> None:
+    """Flush the action of a rule, then record the outcome of the jobs it held."""
+    jobs = outbox.release(key)
+    try:
+        rule.action.flush()
+    except Exception as e:  # noqa: BLE001
+        failed = failed_entry_ids(e, [job.entry for job in jobs])
+        if not failed:
+            logger.exception(f"Error completing the actions of rule '{rule.name}'.")
+        _record_failure(
+            outbox, rule, [job for job in jobs if job.entry.id in failed], e
+        )
+        jobs = [job for job in jobs if job.entry.id not in failed]
+    outbox.mark_done(jobs)
+
+
+class ActionBudget:
+    """Number of requests each action may still make in this run.
+
+    Actions are identified by name (e.g. ``add_todoist_task``); unlisted
+    actions are not limited. A job of a batched action costs a share of a
+    request (see `BaseAction.entries_per_request`). Jobs beyond the budget
+    stay queued for the next run.
+    """
+
+    def __init__(self, limits: Mapping[str, int] | None = None) -> None:
+        self._remaining = dict(limits or {})
+        self._lock = threading.Lock()
+
+    def limits(self, action_name: str) -> bool:
+        """Return True if the action has a budget."""
+        return action_name in self._remaining
+
+    def take(self, action_name: str, count: int, per_request: int = 1) -> int:
+        """Take the requests of up to ``count`` jobs from the action's budget.
+
+        ``per_request`` jobs share one request. Returns how many jobs were
+        granted.
+        """
+        with self._lock:
+            remaining = self._remaining.get(action_name)
+            if remaining is None:
+                return count
+            granted = min(count, remaining * per_request)
+            self._remaining[action_name] = remaining - ceil(granted / per_request)
+        if granted < count:
+            logger.info(
+                f"Budget of action '{action_name}' used up; "
+                "its remaining queued entries are deferred to the next run."
+            )
+        return granted
+
+    def exhausted(self, action_name: str) -> bool:
+        """Return True if the action has a budget and none of it is left."""
+        with self._lock:
+            return self._remaining.get(action_name, 1) <= 0
+
+
+def drain_once(
+    outbox: Outbox,
+    rules: Mapping[str, Rule],
+    budget: ActionBudget | None = None,
+    *,
+    include_budgeted: bool = True,
+) -> int:
+    """Run the actions of the jobs that are due now; return the number of jobs run.
+
+    ``rules`` maps `rule_key` to rule; jobs of rules that are no longer
+    configured are left pending. Rules run in order of their most urgent
+    job, and no action makes more requests than ``budget`` grants. Without
+    ``include_budgeted``, actions with a budget are not run at all.
+    """
+    budget = budget if budget is not None else ActionBudget()
+    eligible = [
+        key
+        for key, rule in rules.items()
+        if not budget.exhausted(rule.action.name)
+        and (include_budgeted or not budget.limits(rule.action.name))
+    ]
+    jobs_by_rule: dict[str, list[OutboxJob]] = {}
+    for job in outbox.due(eligible):
+        jobs_by_rule.setdefault(job.rule_key, []).append(job)
+    ran = 0
+    for key, rule_jobs in jobs_by_rule.items():
+        rule = rules[key]
+        granted = budget.take(
+            rule.action.name, len(rule_jobs), rule.action.entries_per_request
+        )
+        if granted:
+            _run_jobs(outbox, rule, rule_jobs[:granted])
+        ran += granted
+    return ran
+
+
+def drain(
+    outbox: Outbox,
+    rules: Mapping[str, Rule],
+    budget: ActionBudget | None = None,
+) -> None:
+    """Run every due job within ``budget``, then flush the actions of the rules."""
+    while drain_once(outbox, rules, budget):
+        pass
+    for key, rule in rules.items():
+        _flush_jobs(outbox, key, rule)
+    pending = outbox.pending_count(rules)
+    if pending:
+        logger.warning(f"{pending} queued actions will be retried in a later run.")
+
+
+def _drain_until(
+    outbox: Outbox,
+    rules: Mapping[str, Rule],
+    budget: ActionBudget | None,
+    stop: threading.Event,
+    poll_interval: float,
+) -> None:
+    while not stop.is_set():
+        try:
+            ran = drain_once(outbox, rules, budget, include_budgeted=False)
+        except Exception:  # noqa: BLE001
+            logger.exception("Error draining the action outbox.")
+            ran = 0
+        if not ran:
+            stop.wait(poll_interval)
+
+
+@contextmanager
+def background_drain(
+    outbox: Outbox,
+    rules: Mapping[str, Rule],
+    budget: ActionBudget | None = None,
+    *,
+    poll_interval: float = 1.0,
+) -> Generator[None]:
+    """Run due jobs in a background thread while the context is active.
+
+    Actions' deferred work (`flush`) is left to the final `drain`, so that,
+    for example, entries are not removed from a tag while it is being read.
+    Actions with a budget are also left to it, so that their budget goes to
+    the most urgent jobs once every match is known.
+
+    Parameters
+    ----------
+    outbox
+        The outbox to drain.
+    rules
+        The configured rules, keyed by `rule_key`.
+    budget
+        Per-action budget; budgeted actions are not run in the background.
+    poll_interval
+        Seconds to wait for new jobs when none is due.
+
+    Yields
+    ------
+    None
+        The thread is stopped, after its current job, when the context exits.
+    """
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=_drain_until,
+        args=(outbox, rules, budget, stop, poll_interval),
+        name="outbox-drain",
+        daemon=True,
+    )
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
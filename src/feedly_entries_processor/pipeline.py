@@ -0,0 +1,137 @@
+"""asyncio pipeline overlapping the fetching, matching and acting on entries.
+
+Stages are connected by bounded queues: fetching stops once ``queue_size``
+pages wait to be matched, and matching stops once enough action chains wait
+to run, so memory stays bounded whatever the speed of each stage. Blocking
+calls (Feedly requests, condition evaluation, actions) run in threads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import batched
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        AsyncGenerator,
+        AsyncIterable,
+        Callable,
+        Coroutine,
+        Iterable,
+        Mapping,
+        Sequence,
+    )
+
+    from feedly_entries_processor.executor import Step
+    from feedly_entries_processor.feedly_client import Entry
+
+# Plans the work of a page: chains of steps, each to run in order.
+type Plan = Callable[[Sequence[Entry]], Sequence[Sequence[Step]]]
+
+
+async def aiter_pages(
+    entries: Iterable[Entry], page_size: int
+) -> AsyncGenerator[tuple[Entry, ...]]:
+    """Yield pages of a blocking iterable of entries, each read in a thread."""
+    pages = batched(entries, page_size, strict=False)
+    while (page := await asyncio.to_thread(next, pages, None)) is not None:
+        yield page
+
+
+def _first_error(error: BaseException) -> BaseException:
+    while isinstance(error, BaseExceptionGroup):
+        error = error.exceptions[0]
+    return error
+
+
+async def run_pipeline(  # noqa: C901, PLR0913
+    pages: AsyncIterable[Sequence[Entry]],
+    plan: Plan,
+    *,
+    match_tasks: int = 1,
+    action_tasks: int = 1,
+    concurrency: Mapping[str, int] | None = None,
+    queue_size: int = 2,
+) -> None:
+    """Plan each page and run its action chains, with all stages in flight at once.
+
+    Parameters
+    ----------
+    pages
+        The pages of entries, read by one task.
+    plan
+        Matches a page and returns its action chains; called in a thread by
+        ``match_tasks`` tasks.
+    match_tasks
+        Number of pages planned at once.
+    action_tasks
+        Number of action chains running at once; the steps of one chain
+        still run in order.
+    concurrency
+        Maximum number of concurrent steps per action name.
+    queue_size
+        Number of pages waiting to be planned, per action task the number of
+        chains waiting to run.
+
+    Raises
+    ------
+        Exception: The first error raised by a stage, after the others are
+            cancelled.
+    """
+    page_queue: asyncio.Queue[Sequence[Entry] | None] = asyncio.Queue(queue_size)
+    chain_queue: asyncio.Queue[Sequence[Step] | None] = asyncio.Queue(
+        action_tasks * queue_size
+    )
+    semaphores = {
+        name: asyncio.Semaphore(limit) for name, limit in (concurrency or {}).items()
+    }
+
+    async def fetch() -> None:
+        async for page in pages:
+            await page_queue.put(page)
+        for _ in range(match_tasks):
+            await page_queue.put(None)
+
+    async def match() -> None:
+        while (page := await page_queue.get()) is not None:
+            for chain in await asyncio.to_thread(plan, page):
+                await chain_queue.put(chain)
+
+    async def act() -> None:
+        while (chain := await chain_queue.get()) is not None:
+            for name, call in chain:
+                semaphore = semaphores.get(name)
+                async with semaphore if semaphore is not None else nullcontext():
+                    await asyncio.to_thread(call)
+
+    try:
+        async with asyncio.TaskGroup() as stages:
+            for _ in range(action_tasks):
+                stages.create_task(act())
+            async with asyncio.TaskGroup() as producers:
+                producers.create_task(fetch())
+                for _ in range(match_tasks):
+                    producers.create_task(match())
+            for _ in range(action_tasks):
+                await chain_queue.put(None)
+    except BaseExceptionGroup as group:
+        raise _first_error(group) from group
+
+
+def run[T](main: Coroutine[None, None, T], *, threads: int) -> T:
+    """Run a pipeline coroutine to completion from synchronous code.
+
+    Blocking calls of the pipeline run on a pool of ``threads`` threads,
+    which should cover every match and action task.
+    """
+
+    async def with_executor() -> T:
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=threads, thread_name_prefix="pipeline")
+        )
+        return await main
+
+    return asyncio.run(with_executor())
@@ -2,50 +2,645 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
+from functools import partial
+from itertools import batched, groupby
+from operator import itemgetter
 from typing import TYPE_CHECKING
 
 from logzero import logger
 
 from feedly_entries_processor.config_loader import Rule, load_config
 from feedly_entries_processor.exceptions import ActionSkippedDueToPersistentError
-from feedly_entries_processor.feedly_client import Entry, create_feedly_client
-from feedly_entries_processor.settings import FeedlySettings
+from feedly_entries_processor.executor import (
+    InlineActionExecutor,
+    create_action_executor,
+)
+from feedly_entries_processor.feedly_client import (
+    STREAM_PAGE_SIZE,
+    Entry,
+    create_feedly_client,
+)
+from feedly_entries_processor.ledger import Ledger, LedgerMatcher, open_ledger
+from feedly_entries_processor.matching import create_matcher, matches
+from feedly_entries_processor.near_dedup import open_near_duplicate_filter
+from feedly_entries_processor.outbox import (
+    ActionBudget,
+    Outbox,
+    background_drain,
+    drain,
+    open_outbox,
+    rule_key,
+)
+from feedly_entries_processor.pipeline import aiter_pages, run, run_pipeline
+from feedly_entries_processor.quarantine import (
+    Quarantine,
+    QuarantineMatcher,
+    classify_batch_failure,
+    classify_failure,
+    failed_entry_ids,
+    open_quarantine,
+)
+from feedly_entries_processor.rate_limit import rate_limiters
+from feedly_entries_processor.settings import FeedlySettings, ProcessingSettings
+from feedly_entries_processor.todoist_client import todoist_clients
+from feedly_entries_processor.url_dedup import open_url_deduplicator
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Iterable, Mapping, Sequence
     from pathlib import Path
 
+    from feedly_entries_processor.actions.base_action import BaseAction
+    from feedly_entries_processor.executor import ActionExecutor, Step
+    from feedly_entries_processor.matching import Matcher
+    from feedly_entries_processor.near_dedup import NearDuplicateFilter
+    from feedly_entries_processor.pipeline import Plan
     from feedly_entries_processor.sources import StreamSource
+    from feedly_entries_processor.url_dedup import UrlDeduplicator
 
 
-def process_entry(entry: Entry, rule: Rule) -> None:
-    """Process a single Feedly entry based on a rule."""
+def _log_match(entry: Entry, rule: Rule) -> None:
+    logger.info(
+        f"Entry '{entry.title}' (URL: {entry.effective_url}) matched rule '{rule.name}'."
+    )
+
+
+def _rule_names(rules: Sequence[Rule]) -> str:
+    return ", ".join(f"'{rule.name}'" for rule in rules)
+
+
+def _action_key(action: BaseAction) -> str:
+    """Return a key equal for actions configured identically.
+
+    Model equality is not used: it also compares private state, such as the
+    entries an action has buffered.
+    """
+    return action.model_dump_json()
+
+
+def _group_by_action(rules: Iterable[Rule]) -> list[tuple[Rule, ...]]:
+    """Group rules whose actions are configured identically, in rule order."""
+    groups: dict[str, list[Rule]] = {}
+    for rule in rules:
+        groups.setdefault(_action_key(rule.action), []).append(rule)
+    return [tuple(group) for group in groups.values()]
+
+
+def _record_handled(
+    ledger: Ledger | None, matched: Sequence[tuple[Entry, Sequence[Rule]]]
+) -> None:
+    """Record in ``ledger``, if given, that the rules have handled their entries."""
+    if ledger is None:
+        return
+    for entry, rules in matched:
+        for rule in rules:
+            ledger.record(rule, [entry.id])
+
+
+class AwaitingFlush:
+    """Matches handed to actions that complete them on `flush`, by action.
+
+    They are recorded in the ledger once the action has been flushed, except
+    for the entries the flush failed for.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._matched: dict[int, list[tuple[Entry, Sequence[Rule]]]] = {}
+
+    def add(
+        self, action: BaseAction, matched: Iterable[tuple[Entry, Sequence[Rule]]]
+    ) -> None:
+        """Hold matches handed to ``action`` until it is flushed."""
+        with self._lock:
+            self._matched.setdefault(id(action), []).extend(matched)
+
+    def pop(self, action: BaseAction) -> list[tuple[Entry, Sequence[Rule]]]:
+        """Return, and forget, the matches held for ``action``."""
+        with self._lock:
+            return self._matched.pop(id(action), [])
+
+
+def _record_success(
+    action: BaseAction,
+    matched: Sequence[tuple[Entry, Sequence[Rule]]],
+    ledger: Ledger | None,
+    awaiting: AwaitingFlush | None,
+) -> None:
+    """Record that ``action`` handled the matches, or hold them until its flush."""
+    if awaiting is not None and action.completes_on_flush:
+        awaiting.add(action, matched)
+    else:
+        _record_handled(ledger, matched)
+
+
+def _quarantine(
+    quarantine: Quarantine,
+    matched: Sequence[tuple[Entry, Sequence[Rule]]],
+    reasons: Mapping[str, str],
+) -> None:
+    """Quarantine, for each of its rules, every entry with a recurring failure."""
+    for entry, rules in matched:
+        if entry.id in reasons:
+            for rule in rules:
+                quarantine.add(rule, {entry.id: reasons[entry.id]})
+
+
+def _run_action(
+    entry: Entry,
+    rules: Sequence[Rule],
+    ledger: Ledger | None = None,
+    quarantine: Quarantine | None = None,
+    awaiting: AwaitingFlush | None = None,
+) -> None:
+    """Run the action shared by ``rules`` once for a matched entry, logging any error.
+
+    Every rule is credited with the match. On success, the pairs are
+    recorded in ``ledger``, if given, or held in ``awaiting`` until the
+    action's flush if it completes entries then. A failure that will recur
+    is recorded in ``quarantine``, if given, instead of logging its
+    traceback.
+    """
+    for rule in rules:
+        _log_match(entry, rule)
+    if len(rules) > 1:
+        logger.info(f"Rules {_rule_names(rules)} share one action; it runs once.")
+    action = rules[0].action
     try:
-        if rule.condition.matches(entry):
-            logger.info(
-                f"Entry '{entry.title}' (URL: {entry.effective_url}) matched rule '{rule.name}'."
+        action.process(entry)
+    except ActionSkippedDueToPersistentError as e:
+        logger.error(
+            f"Rule {_rule_names(rules)} skipped for entry '{entry.title}': {e}"
+        )
+    except Exception as e:  # noqa: BLE001
+        reason = classify_failure(e) if quarantine is not None else None
+        if quarantine is not None and reason is not None:
+            _quarantine(quarantine, [(entry, rules)], {entry.id: reason})
+        else:
+            logger.exception(
+                f"Error processing entry '{entry.title}' (URL: {entry.effective_url}) with rule {_rule_names(rules)}."
             )
-            try:
-                rule.action.process(entry)
-            except ActionSkippedDueToPersistentError as e:
-                logger.error(
-                    f"Rule '{rule.name}' skipped for entry '{entry.title}': {e}"
-                )
-            except Exception:  # noqa: BLE001
-                logger.exception(
-                    f"Error processing entry '{entry.title}' (URL: {entry.effective_url}) with rule '{rule.name}'."
+    else:
+        _record_success(action, [(entry, rules)], ledger, awaiting)
+
+
+def _run_batch_action(
+    matched: Sequence[tuple[Entry, tuple[Rule, ...]]],
+    ledger: Ledger | None = None,
+    quarantine: Quarantine | None = None,
+    awaiting: AwaitingFlush | None = None,
+) -> None:
+    """Run an action once for the entries of a page that matched, logging any error.
+
+    ``matched`` pairs each entry with the rules that matched it and share
+    the action. The pairs of the entries it succeeded for, all of them unless
+    it raised a `PartialFailureError`, are recorded in ``ledger``, if given,
+    or held in ``awaiting`` until the action's flush if it completes entries
+    then. Entries whose failure will recur are recorded in ``quarantine``,
+    if given.
+    """
+    entries = [entry for entry, _ in matched]
+    all_rules = tuple(dict.fromkeys(rule for _, rules in matched for rule in rules))
+    action = all_rules[0].action
+    for entry, rules in matched:
+        for rule in rules:
+            _log_match(entry, rule)
+    try:
+        action.process_batch(entries)
+    except ActionSkippedDueToPersistentError as e:
+        logger.error(
+            f"Rule {_rule_names(all_rules)} skipped for {len(entries)} entries: {e}"
+        )
+    except Exception as e:  # noqa: BLE001
+        failed = failed_entry_ids(e, entries)
+        reasons = classify_batch_failure(e, entries) if quarantine is not None else {}
+        if quarantine is not None:
+            _quarantine(quarantine, matched, reasons)
+        if len(reasons) < len(failed):
+            logger.exception(
+                f"Error processing {len(failed)} of {len(entries)} entries with rule {_rule_names(all_rules)}."
+            )
+        succeeded = [
+            (entry, rules) for entry, rules in matched if entry.id not in failed
+        ]
+        if succeeded:
+            _record_success(action, succeeded, ledger, awaiting)
+    else:
+        _record_success(action, matched, ledger, awaiting)
+
+
+def _flush_action(
+    rule: Rule,
+    ledger: Ledger | None = None,
+    quarantine: Quarantine | None = None,
+    awaiting: AwaitingFlush | None = None,
+) -> None:
+    """Complete the deferred work of a rule's action, logging any error.
+
+    The matches held in ``awaiting`` for the action are then recorded in
+    ``ledger``, if given, except for the entries the flush failed for; those
+    whose failure will recur are recorded in ``quarantine``, if given.
+    """
+    matched = awaiting.pop(rule.action) if awaiting is not None else []
+    try:
+        rule.action.flush()
+    except Exception as e:  # noqa: BLE001
+        failed = failed_entry_ids(e, [entry for entry, _ in matched])
+        reasons = (
+            classify_batch_failure(
+                e, [entry for entry, _ in matched if entry.id in failed]
+            )
+            if quarantine is not None
+            else {}
+        )
+        if quarantine is not None:
+            _quarantine(quarantine, matched, reasons)
+        if not failed or len(reasons) < len(failed):
+            logger.exception(f"Error completing the actions of rule '{rule.name}'.")
+        matched = [(entry, rules) for entry, rules in matched if entry.id not in failed]
+    _record_handled(ledger, matched)
+
+
+def process_entry(entry: Entry, rule: Rule) -> None:
+    """Process a single Feedly entry based on a rule."""
+    if matches(entry, rule.name, rule.condition):
+        _run_action(entry, (rule,))
+
+
+def _plan_page(
+    page: Sequence[Entry],
+    matcher: Matcher,
+    ledger: Ledger | None = None,
+    quarantine: Quarantine | None = None,
+    awaiting: AwaitingFlush | None = None,
+) -> list[list[Step]]:
+    """Match a page and return the chains of action calls it needs.
+
+    There is one chain per matched entry, for its actions that do not
+    support batches, then one single-step chain per batch action.
+    """
+    chains: list[list[Step]] = []
+    batches: dict[str, list[tuple[Entry, tuple[Rule, ...]]]] = {}
+    for entry_index, entry_matches in groupby(
+        matcher.match_page(page), key=itemgetter(0)
+    ):
+        entry = page[entry_index]
+        steps: list[Step] = []
+        for rules in _group_by_action(rule for _, rule in entry_matches):
+            action = rules[0].action
+            if action.supports_batch:
+                batches.setdefault(_action_key(action), []).append((entry, rules))
+            else:
+                steps.append(
+                    (
+                        action.name,
+                        partial(
+                            _run_action, entry, rules, ledger, quarantine, awaiting
+                        ),
+                    )
                 )
-    except Exception:  # noqa: BLE001
-        logger.exception(
-            f"Error evaluating rule '{rule.name}' for entry '{entry.title}' (URL: {entry.effective_url})."
+        if steps:
+            chains.append(steps)
+    chains.extend(
+        [
+            (
+                matched[0][1][0].action.name,
+                partial(_run_batch_action, matched, ledger, quarantine, awaiting),
+            )
+        ]
+        for matched in batches.values()
+    )
+    return chains
+
+
+def process_page(  # noqa: PLR0913
+    page: Sequence[Entry],
+    matcher: Matcher,
+    executor: ActionExecutor | None = None,
+    ledger: Ledger | None = None,
+    quarantine: Quarantine | None = None,
+    awaiting: AwaitingFlush | None = None,
+) -> None:
+    """Process a page of Feedly entries based on configured rules.
+
+    The matcher evaluates each rule's condition for the whole page, then the
+    actions of each matched entry run in rule order. Rules of an entry whose
+    actions are configured identically share one call. Actions that support
+    batches receive all of the page's matches at once, action by action.
+    With a threaded executor, different entries are processed concurrently;
+    this returns once every action of the page has run. Successful actions
+    are recorded in ``ledger``, which is flushed once per page, and failures
+    that will recur in ``quarantine``. Matches of actions that complete them
+    on `flush` are held in ``awaiting`` until then.
+    """
+    _run_chains(
+        _plan_page(page, matcher, ledger, quarantine, awaiting),
+        executor if executor is not None else InlineActionExecutor(),
+        ledger,
+    )
+
+
+def _run_chains(
+    chains: Sequence[Sequence[Step]],
+    executor: ActionExecutor,
+    ledger: Ledger | None,
+) -> None:
+    """Run a page's action chains, then flush ``ledger``, if given."""
+    for chain in chains:
+        executor.submit(chain)
+    try:
+        executor.wait()
+    finally:
+        if ledger is not None:
+            ledger.flush()
+
+
+def enqueue_page(
+    page: Sequence[Entry],
+    matcher: Matcher,
+    outbox: Outbox,
+    ledger: Ledger | None = None,
+) -> None:
+    """Queue the actions of a page's matched entries in the outbox.
+
+    Rules of an entry whose actions are configured identically share one
+    job, queued under the first of them. Queued pairs are recorded in
+    ``ledger``, if given; the outbox retries them from then on.
+    """
+    matched = [
+        (page[entry_index], rules)
+        for entry_index, entry_matches in groupby(
+            matcher.match_page(page), key=itemgetter(0)
         )
+        for rules in _group_by_action(rule for _, rule in entry_matches)
+    ]
+    for entry, rules in matched:
+        for rule in rules:
+            _log_match(entry, rule)
+    queued = outbox.enqueue((entry, rules[0]) for entry, rules in matched)
+    if queued < len(matched):
+        logger.info(f"{len(matched) - queued} matched actions were already queued.")
+    _record_handled(ledger, matched)
+    if ledger is not None:
+        ledger.flush()
+
+
+def _enqueue_plan(
+    page: Sequence[Entry],
+    matcher: Matcher,
+    outbox: Outbox,
+    ledger: Ledger | None,
+) -> list[list[Step]]:
+    enqueue_page(page, matcher, outbox, ledger)
+    return []
+
 
+def _page_plan(
+    matcher: Matcher,
+    outbox: Outbox | None,
+    ledger: Ledger | None,
+    quarantine: Quarantine | None,
+    awaiting: AwaitingFlush,
+) -> Plan:
+    """Return the plan of each page, shared by both engines.
 
-def process_entries(entries: Iterable[Entry], rules: Iterable[Rule]) -> None:
-    """Process Feedly entries based on configured rules."""
-    for entry in entries:
+    With an ``outbox``, a page's matches are queued there and it has no
+    chains to run; otherwise its chains run the matched actions.
+    """
+    if outbox is not None:
+        return partial(_enqueue_plan, matcher=matcher, outbox=outbox, ledger=ledger)
+    return partial(
+        _plan_page,
+        matcher=matcher,
+        ledger=ledger,
+        quarantine=quarantine,
+        awaiting=awaiting,
+    )
+
+
+def _flush_rules(
+    rules: Sequence[Rule],
+    outbox: Outbox | None,
+    ledger: Ledger | None,
+    quarantine: Quarantine | None,
+    awaiting: AwaitingFlush,
+) -> None:
+    """Flush each rule's action, unless left to the outbox, then the ledger."""
+    if outbox is None:
         for rule in rules:
-            process_entry(entry, rule)
+            _flush_action(rule, ledger, quarantine, awaiting)
+    if ledger is not None:
+        ledger.flush()
+
+
+def _skipping_matcher(
+    matcher: Matcher,
+    ledger: Ledger | None,
+    quarantine: Quarantine | None,
+) -> Matcher:
+    """Wrap a matcher to skip pairs recorded in the ledger and quarantine.
+
+    The quarantine wraps the ledger, so that a quarantined match is never
+    recorded in the ledger as not matching.
+    """
+    if ledger is not None:
+        matcher = LedgerMatcher(matcher, ledger)
+    if quarantine is not None:
+        matcher = QuarantineMatcher(matcher, quarantine)
+    return matcher
+
+
+def process_entries(  # noqa: PLR0913
+    entries: Iterable[Entry],
+    rules: Iterable[Rule],
+    *,
+    page_size: int = STREAM_PAGE_SIZE,
+    match_workers: int = 0,
+    action_workers: int = 0,
+    action_concurrency: Mapping[str, int] | None = None,
+    outbox: Outbox | None = None,
+    ledger: Ledger | None = None,
+    quarantine: Quarantine | None = None,
+) -> None:
+    """Process Feedly entries based on configured rules, one page at a time.
+
+    With ``match_workers`` > 0, conditions are evaluated in that many worker
+    processes. With ``action_workers`` > 0, actions run in that many threads,
+    with at most ``action_concurrency[name]`` concurrent calls per action
+    name; the actions of one entry still run in rule order. Once every entry
+    has been processed, each rule's action is flushed.
+
+    With an ``outbox``, matched actions are only queued there; running and
+    flushing them is left to whoever drains the outbox.
+
+    With a ``ledger``, (rule, entry) pairs handled in earlier runs are
+    skipped, and newly handled pairs are recorded. With a ``quarantine``,
+    pairs whose action failed in a way that will recur are skipped too.
+    """
+    rules = tuple(rules)
+    awaiting = AwaitingFlush()
+    with (
+        create_matcher(rules, workers=match_workers) as matcher,
+        create_action_executor(
+            workers=action_workers if outbox is None else 0,
+            concurrency=action_concurrency,
+        ) as executor,
+    ):
+        plan = _page_plan(
+            _skipping_matcher(matcher, ledger, quarantine),
+            outbox,
+            ledger,
+            quarantine,
+            awaiting,
+        )
+        for page in batched(entries, page_size, strict=False):
+            _run_chains(plan(page), executor, ledger)
+    _flush_rules(rules, outbox, ledger, quarantine, awaiting)
+
+
+class _FlushLedgerAfterPage:
+    """Flushes the ledger once the last action chain of a page has run.
+
+    The pipeline plans a page before its chains run, interleaved with the
+    chains of other pages, so the ledger cannot be flushed when planning.
+    """
+
+    def __init__(self, plan: Plan, ledger: Ledger) -> None:
+        self._plan = plan
+        self._ledger = ledger
+        self._lock = threading.Lock()
+
+    def __call__(self, page: Sequence[Entry]) -> list[list[Step]]:
+        """Plan a page, with the ledger flushed after its last chain."""
+        chains = [list(chain) for chain in self._plan(page) if chain]
+        if not chains:
+            self._ledger.flush()
+            return chains
+        remaining = [len(chains)]
+
+        def run_last_step(call: Callable[[], None]) -> None:
+            try:
+                call()
+            finally:
+                with self._lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    self._ledger.flush()
+
+        for chain in chains:
+            name, call = chain[-1]
+            chain[-1] = (name, partial(run_last_step, call))
+        return chains
+
+
+async def process_entries_async(  # noqa: PLR0913
+    entries: Iterable[Entry],
+    rules: Iterable[Rule],
+    *,
+    page_size: int = STREAM_PAGE_SIZE,
+    match_workers: int = 0,
+    match_tasks: int = 1,
+    action_tasks: int = 1,
+    action_concurrency: Mapping[str, int] | None = None,
+    queue_size: int = 2,
+    outbox: Outbox | None = None,
+    ledger: Ledger | None = None,
+    quarantine: Quarantine | None = None,
+) -> None:
+    """Process Feedly entries like `process_entries`, as an asyncio pipeline.
+
+    Fetching the next page, matching pages and running actions overlap:
+    ``match_tasks`` pages are matched at once, and ``action_tasks`` chains of
+    actions run at once, with at most ``action_concurrency[name]`` concurrent
+    calls per action name. At most ``queue_size`` fetched pages wait to be
+    matched. ``entries`` is read in a thread, a page at a time.
+
+    Both engines plan pages, and flush actions and the ledger, through the
+    same functions, so they act on, record and queue the same pairs; only
+    the scheduling differs. `process_entries` is kept because it needs no
+    event loop and handles one page at a time, which keeps the default
+    path simple to follow and debug; this one is enabled by ``ASYNC_PIPELINE``.
+    The ledger is flushed once all of a page's actions have run.
+    """
+    rules = tuple(rules)
+    awaiting = AwaitingFlush()
+    with create_matcher(rules, workers=match_workers) as matcher:
+        plan = _page_plan(
+            _skipping_matcher(matcher, ledger, quarantine),
+            outbox,
+            ledger,
+            quarantine,
+            awaiting,
+        )
+        try:
+            await run_pipeline(
+                aiter_pages(entries, page_size),
+                plan if ledger is None else _FlushLedgerAfterPage(plan, ledger),
+                match_tasks=match_tasks,
+                action_tasks=action_tasks,
+                concurrency=action_concurrency,
+                queue_size=queue_size,
+            )
+        finally:
+            if ledger is not None:
+                ledger.flush()
+    await asyncio.to_thread(_flush_rules, rules, outbox, ledger, quarantine, awaiting)
+
+
+def _deduplicated(
+    entries: Iterable[Entry],
+    url_deduplicator: UrlDeduplicator | None,
+    near_duplicate_filter: NearDuplicateFilter | None,
+) -> Iterable[Entry]:
+    """Drop the entries repeating an earlier URL or nearly an earlier entry."""
+    if url_deduplicator is not None:
+        entries = url_deduplicator.filter(entries)
+    if near_duplicate_filter is not None:
+        entries = near_duplicate_filter.filter(entries)
+    return entries
+
+
+def process_sources_pipelined(
+    sources: Iterable[tuple[Iterable[Entry], Sequence[Rule]]],
+    settings: ProcessingSettings,
+    *,
+    outbox: Outbox | None = None,
+    ledger: Ledger | None = None,
+    quarantine: Quarantine | None = None,
+) -> None:
+    """Process the entries of each source with `process_entries_async`, in turn.
+
+    The sources share one event loop, whose pool has a thread per match and
+    action task, plus one to fetch entries.
+    """
+    action_tasks = max(settings.action_workers, 1)
+
+    async def process_sources() -> None:
+        for entries, rules in sources:
+            await process_entries_async(
+                entries,
+                rules,
+                match_workers=settings.match_workers,
+                match_tasks=settings.pipeline_match_tasks,
+                action_tasks=action_tasks,
+                action_concurrency=settings.action_concurrency,
+                queue_size=settings.pipeline_queue_size,
+                outbox=outbox,
+                ledger=ledger,
+                quarantine=quarantine,
+            )
+
+    run(
+        process_sources(),
+        threads=settings.pipeline_match_tasks + action_tasks + 1,
+    )
+
+
+def sort_by_priority(rules: Iterable[Rule]) -> list[Rule]:
+    """Return rules by descending priority, then by name."""
+    return sorted(rules, key=lambda rule: (-rule.priority, rule.name))
 
 
 def process(config_files: list[Path]) -> None:
@@ -55,11 +650,76 @@ def process(config_files: list[Path]) -> None:
 
     token_dir = FeedlySettings().token_dir
     client = create_feedly_client(token_dir)
+    processing_settings = ProcessingSettings()
 
-    rules_by_source: dict[StreamSource, set[Rule]] = {}
-    for rule in config.rules:
-        rules_by_source.setdefault(rule.source, set()).add(rule)
+    # Sources and rules in priority order, so that the most important
+    # matches are acted on, or queued, first.
+    rules_by_source: dict[StreamSource, list[Rule]] = {}
+    for rule in sort_by_priority(config.rules):
+        rules_by_source.setdefault(rule.source, []).append(rule)
 
-    for source, rules in rules_by_source.items():
-        entries = source.fetch_entries(client)
-        process_entries(entries=entries, rules=rules)
+    ledger = open_ledger(processing_settings)
+    quarantine = open_quarantine(processing_settings)
+    # Shared across sources, so that an article is handled under the first,
+    # highest-priority source it appears in.
+    url_deduplicator = open_url_deduplicator(processing_settings)
+    near_duplicate_filter = open_near_duplicate_filter(processing_settings)
+
+    def source_entries(source: StreamSource) -> Iterable[Entry]:
+        return _deduplicated(
+            source.fetch_entries(client), url_deduplicator, near_duplicate_filter
+        )
+
+    def process_sources(outbox: Outbox | None = None) -> None:
+        if processing_settings.async_pipeline:
+            process_sources_pipelined(
+                [
+                    (source_entries(source), rules)
+                    for source, rules in rules_by_source.items()
+                ],
+                processing_settings,
+                outbox=outbox,
+                ledger=ledger,
+                quarantine=quarantine,
+            )
+            return
+        for source, rules in rules_by_source.items():
+            process_entries(
+                entries=source_entries(source),
+                rules=rules,
+                match_workers=processing_settings.match_workers,
+                action_workers=processing_settings.action_workers,
+                action_concurrency=processing_settings.action_concurrency,
+                outbox=outbox,
+                ledger=ledger,
+                quarantine=quarantine,
+            )
+
+    rules_by_key = {rule_key(rule): rule for rule in config.rules}
+    outbox = open_outbox(processing_settings, rules_by_key)
+    try:
+        if outbox is None:
+            if processing_settings.action_budget:
+                logger.warning("ACTION_BUDGET is ignored without OUTBOX_PATH.")
+            process_sources()
+        else:
+            budget = ActionBudget(processing_settings.action_budget)
+            logger.info(
+                f"Queueing matched actions in {processing_settings.outbox_path}"
+            )
+            with background_drain(outbox, rules_by_key, budget):
+                process_sources(outbox)
+            drain(outbox, rules_by_key, budget)
+    finally:
+        if url_deduplicator is not None:
+            url_deduplicator.flush()
+            logger.info(
+                f"Skipped {url_deduplicator.dropped} entries duplicating an earlier URL"
+            )
+        if near_duplicate_filter is not None:
+            logger.info(
+                f"Skipped {near_duplicate_filter.dropped} entries nearly repeating "
+                "an earlier entry"
+            )
+        todoist_clients.close()
+        rate_limiters.log_stats()
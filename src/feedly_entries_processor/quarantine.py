@@ -0,0 +1,233 @@
+"""Quarantine of (rule, entry) pairs whose action fails the same way every time."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import TYPE_CHECKING, Any
+
+from logzero import logger
+
+from feedly_entries_processor.exceptions import (
+    ActionSkippedDueToPersistentError,
+    InvalidEntryError,
+    PartialFailureError,
+    TodoistApiError,
+)
+from feedly_entries_processor.ledger import SECONDS_PER_DAY, rule_fingerprint
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Mapping, Sequence
+    from pathlib import Path
+
+    from feedly_entries_processor.config_loader import Rule
+    from feedly_entries_processor.feedly_client import Entry
+    from feedly_entries_processor.matching import Match, Matcher
+    from feedly_entries_processor.settings import ProcessingSettings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quarantine (
+    rule_fingerprint TEXT NOT NULL,
+    entry_id TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    quarantined_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (rule_fingerprint, entry_id)
+) WITHOUT ROWID;
+"""
+
+# Client errors that depend on the service's state or on timing, not on the
+# request: they may succeed when retried. 401 and 403 concern the credentials,
+# not the entry, and stop the action altogether.
+_TRANSIENT_CLIENT_STATUS_CODES = frozenset({401, 403, 408, 409, 425, 429})
+
+
+def _classify_status(status_code: Any) -> str | None:  # noqa: ANN401
+    if (
+        isinstance(status_code, int)
+        and 400 <= status_code < 500  # noqa: PLR2004
+        and status_code not in _TRANSIENT_CLIENT_STATUS_CODES
+    ):
+        return f"HTTP {status_code}"
+    return None
+
+
+def classify_failure(error: BaseException) -> str | None:
+    """Return why an action's failure will recur for the same entry, or None.
+
+    Failures caused by the entry itself (`InvalidEntryError`) and client
+    errors other than authentication, conflicts and rate limits are
+    deterministic; anything else may be transient.
+    """
+    if isinstance(error, ActionSkippedDueToPersistentError):
+        return None
+    if isinstance(error, InvalidEntryError):
+        return str(error)
+    if isinstance(error, TodoistApiError):
+        status = _classify_status(error.details.get("status_code"))
+        return f"{status}: {error}" if status is not None else None
+    return None
+
+
+def classify_batch_failure(
+    error: BaseException, entries: Sequence[Entry]
+) -> dict[str, str]:
+    """Return the entries of a failed batch whose failure will recur, with the reason.
+
+    A `PartialFailureError` is classified entry by entry; any other error
+    applies to the whole batch.
+    """
+    if isinstance(error, PartialFailureError):
+        return {
+            entry_id: reason
+            for entry_id, entry_error in error.errors.items()
+            if (reason := classify_failure(entry_error)) is not None
+        }
+    reason = classify_failure(error)
+    return {entry.id: reason for entry in entries} if reason is not None else {}
+
+
+def failed_entry_ids(error: BaseException, entries: Sequence[Entry]) -> set[str]:
+    """Return the ids of the entries an action failed for when it raised ``error``.
+
+    A `PartialFailureError` lists them; any other error applies to every
+    entry.
+    """
+    if isinstance(error, PartialFailureError):
+        return set(error.errors)
+    return {entry.id for entry in entries}
+
+
+class Quarantine:
+    """SQLite store of (rule, entry) pairs that failed deterministically.
+
+    Quarantined pairs are skipped until they expire, ``ttl`` seconds after
+    the failure, or until the rule's configuration changes (its
+    `rule_fingerprint`). Live pairs are kept in memory, so that checking a
+    page costs set lookups only.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        ttl: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._path = path
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.executescript(_SCHEMA)
+            connection.execute(
+                "DELETE FROM quarantine WHERE expires_at <= ?", (clock(),)
+            )
+            self._expires_at: dict[tuple[str, str], float] = {
+                (fingerprint, entry_id): expires_at
+                for fingerprint, entry_id, expires_at in connection.execute(
+                    "SELECT rule_fingerprint, entry_id, expires_at FROM quarantine"
+                )
+            }
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path, timeout=30)
+
+    def __len__(self) -> int:
+        """Return the number of pairs quarantined, including expired ones not yet removed."""
+        with self._lock:
+            return len(self._expires_at)
+
+    def quarantined(self, rule: Rule, entry_ids: Collection[str]) -> set[str]:
+        """Return the ids of the entries quarantined for the rule."""
+        fingerprint = rule_fingerprint(rule)
+        now = self._clock()
+        with self._lock:
+            return {
+                entry_id
+                for entry_id in entry_ids
+                if self._expires_at.get((fingerprint, entry_id), now) > now
+            }
+
+    def add(self, rule: Rule, reasons: Mapping[str, str]) -> None:
+        """Quarantine entries for the rule, with the reason of each failure."""
+        if not reasons:
+            return
+        fingerprint = rule_fingerprint(rule)
+        now = self._clock()
+        expires_at = now + self._ttl
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO quarantine"
+                " (rule_fingerprint, entry_id, reason, quarantined_at, expires_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [
+                    (fingerprint, entry_id, reason, now, expires_at)
+                    for entry_id, reason in reasons.items()
+                ],
+            )
+        with self._lock:
+            for entry_id in reasons:
+                self._expires_at[fingerprint, entry_id] = expires_at
+        logger.warning(
+            f"Quarantined {len(reasons)} entries for rule '{rule.name}' "
+            f"for {self._ttl / SECONDS_PER_DAY:g} days: "
+            + "; ".join(f"{entry_id}: {reason}" for entry_id, reason in reasons.items())
+        )
+
+
+class QuarantineMatcher:
+    """Matcher that skips quarantined (rule, entry) pairs.
+
+    Entries quarantined for every rule are not evaluated; matches of
+    quarantined pairs are dropped.
+    """
+
+    def __init__(self, matcher: Matcher, quarantine: Quarantine) -> None:
+        self._matcher = matcher
+        self._quarantine = quarantine
+
+    @property
+    def rules(self) -> tuple[Rule, ...]:
+        """Return the rules, in the order matches are reported."""
+        return self._matcher.rules
+
+    @property
+    def disabled(self) -> frozenset[Rule]:
+        """Return the rules disabled so far for exceeding their time budget."""
+        return self._matcher.disabled
+
+    @property
+    def errored(self) -> frozenset[tuple[str, Rule]]:
+        """Return the (entry id, rule) pairs whose evaluation raised so far."""
+        return self._matcher.errored
+
+    def match_page(self, page: Sequence[Entry]) -> list[Match]:
+        """Return matched (entry index, rule) pairs that are not quarantined."""
+        entry_ids = [entry.id for entry in page]
+        quarantined = {
+            rule: self._quarantine.quarantined(rule, entry_ids) for rule in self.rules
+        }
+        indices = [
+            index
+            for index, entry_id in enumerate(entry_ids)
+            if not all(entry_id in ids for ids in quarantined.values())
+        ]
+        return [
+            (indices[index], rule)
+            for index, rule in self._matcher.match_page([page[i] for i in indices])
+            if entry_ids[indices[index]] not in quarantined[rule]
+        ]
+
+
+def open_quarantine(settings: ProcessingSettings) -> Quarantine | None:
+    """Open the quarantine configured by ``QUARANTINE_PATH``, or return None if unset."""
+    if settings.quarantine_path is None:
+        return None
+    return Quarantine(
+        settings.quarantine_path,
+        ttl=settings.quarantine_ttl_days * SECONDS_PER_DAY,
+    )
@@ -0,0 +1,310 @@
+"""Process-wide throttling of external API requests.
+
+Each API gets a token bucket, which limits the request rate, and an AIMD
+controller, which adapts the number of requests in flight to how the
+service responds.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal
+
+from logzero import logger
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import HTTPError, RequestException, Timeout
+
+from feedly_entries_processor.settings import RateLimitSettings
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from requests import PreparedRequest, Response
+
+type Api = Literal["feedly", "todoist"]
+
+# Responses that mean the service is overloaded: worth retrying, and a
+# reason to send fewer concurrent requests.
+OVERLOAD_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    """Return True if a failed request is worth retrying.
+
+    Connection errors, timeouts and responses with a status in
+    `OVERLOAD_STATUS_CODES` are transient; other HTTP errors are not.
+    """
+    if isinstance(exc, HTTPError):
+        return (
+            exc.response is not None
+            and exc.response.status_code in OVERLOAD_STATUS_CODES
+        )
+    return isinstance(exc, RequestException)
+
+
+@dataclass(frozen=True)
+class RateLimiterStats:
+    """Wait-time metrics of a rate limiter."""
+
+    acquisitions: int
+    waits: int
+    total_wait: float
+    max_wait: float
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, up to ``burst`` at once.
+
+    `acquire` reserves a token under the lock and sleeps outside it, so
+    waiting callers are served in the order they arrived.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._acquisitions = 0
+        self._waits = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is available; return the time waited."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self._burst, self._tokens + (now - self._updated) * self._rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = max(0.0, -self._tokens / self._rate)
+            self._acquisitions += 1
+            if wait > 0:
+                self._waits += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    @property
+    def stats(self) -> RateLimiterStats:
+        """Return the wait-time metrics so far."""
+        with self._lock:
+            return RateLimiterStats(
+                acquisitions=self._acquisitions,
+                waits=self._waits,
+                total_wait=self._total_wait,
+                max_wait=self._max_wait,
+            )
+
+
+@dataclass(frozen=True)
+class ConcurrencyStats:
+    """Metrics of an adaptive concurrency limiter."""
+
+    limit: int
+    peak_limit: int
+    backoffs: int
+
+
+class AimdConcurrencyLimiter:
+    """Adaptive limit on concurrent requests (additive increase, multiplicative decrease).
+
+    The limit starts at ``minimum``. Each healthy response, one that is not
+    an overload and arrives within ``latency_target`` if set, raises it by
+    ``1 / limit``, so about one per round of ``limit`` requests. An overload
+    (a status in `OVERLOAD_STATUS_CODES`, a timeout or a connection error)
+    multiplies it by ``backoff``. Only requests started after the previous
+    decrease can decrease it again, so one congestion episode counts once.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        name: str,
+        *,
+        maximum: int,
+        minimum: int = 1,
+        backoff: float = 0.5,
+        latency_target: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._name = name
+        self._maximum = maximum
+        self._minimum = minimum
+        self._backoff = backoff
+        self._latency_target = latency_target
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._limit = float(minimum)
+        self._peak_limit = minimum
+        self._in_flight = 0
+        self._last_decrease = float("-inf")
+        self._backoffs = 0
+
+    @property
+    def limit(self) -> int:
+        """Return the current number of requests allowed in flight."""
+        with self._condition:
+            return int(self._limit)
+
+    def acquire(self) -> float:
+        """Wait for a free slot; return the start time to pass to `release`."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._in_flight < int(self._limit))
+            self._in_flight += 1
+            return self._clock()
+
+    def release(self, started: float, *, overloaded: bool) -> None:
+        """Free a slot and adapt the limit to the request's outcome."""
+        now = self._clock()
+        with self._condition:
+            self._in_flight -= 1
+            if overloaded:
+                if started >= self._last_decrease:
+                    self._limit = max(self._minimum, self._limit * self._backoff)
+                    self._last_decrease = now
+                    self._backoffs += 1
+                    logger.info(
+                        f"Concurrency limit for '{self._name}' reduced to {int(self._limit)}."
+                    )
+            elif self._latency_target is None or now - started <= self._latency_target:
+                self._limit = min(self._maximum, self._limit + 1 / self._limit)
+                self._peak_limit = max(self._peak_limit, int(self._limit))
+            self._condition.notify_all()
+
+    @property
+    def stats(self) -> ConcurrencyStats:
+        """Return the current and peak limits and the number of backoffs."""
+        with self._condition:
+            return ConcurrencyStats(
+                limit=int(self._limit),
+                peak_limit=self._peak_limit,
+                backoffs=self._backoffs,
+            )
+
+
+class ThrottledAdapter(HTTPAdapter):
+    """HTTP adapter that applies a rate limiter and a concurrency limiter.
+
+    Every request, retries included, takes a token and then a concurrency
+    slot before it is sent.
+    """
+
+    def __init__(
+        self,
+        limiter: TokenBucket | None,
+        concurrency: AimdConcurrencyLimiter | None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        self._limiter = limiter
+        self._concurrency = concurrency
+        super().__init__(**kwargs)
+
+    def send(self, request: PreparedRequest, *args: Any, **kwargs: Any) -> Response:  # noqa: ANN401
+        """Wait for the limiters, then send the request."""
+        if self._limiter is not None:
+            self._limiter.acquire()
+        if self._concurrency is None:
+            return super().send(request, *args, **kwargs)
+
+        started = self._concurrency.acquire()
+        overloaded = False
+        try:
+            response = super().send(request, *args, **kwargs)
+        except (Timeout, RequestsConnectionError):
+            overloaded = True
+            raise
+        else:
+            overloaded = response.status_code in OVERLOAD_STATUS_CODES
+            return response
+        finally:
+            self._concurrency.release(started, overloaded=overloaded)
+
+
+class RateLimiterRegistry:
+    """Creates one rate limiter and one concurrency limiter per API, on first use.
+
+    Limits come from `RateLimitSettings`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._limiters: dict[Api, TokenBucket | None] = {}
+        self._concurrency: dict[Api, AimdConcurrencyLimiter] = {}
+
+    def _create(self, api: Api) -> None:
+        settings = RateLimitSettings()
+        rate, burst, max_concurrency = {
+            "feedly": (
+                settings.feedly_rate_limit,
+                settings.feedly_rate_burst,
+                settings.feedly_max_concurrency,
+            ),
+            "todoist": (
+                settings.todoist_rate_limit,
+                settings.todoist_rate_burst,
+                settings.todoist_max_concurrency,
+            ),
+        }[api]
+        self._limiters[api] = TokenBucket(rate, burst) if rate is not None else None
+        self._concurrency[api] = AimdConcurrencyLimiter(
+            api,
+            maximum=max_concurrency,
+            latency_target=settings.latency_target,
+        )
+
+    def get(self, api: Api) -> TokenBucket | None:
+        """Return the API's rate limiter, or None if its rate is not limited."""
+        with self._lock:
+            if api not in self._limiters:
+                self._create(api)
+            return self._limiters[api]
+
+    def concurrency(self, api: Api) -> AimdConcurrencyLimiter:
+        """Return the API's adaptive concurrency limiter."""
+        with self._lock:
+            if api not in self._concurrency:
+                self._create(api)
+            return self._concurrency[api]
+
+    def adapter(self, api: Api, **kwargs: Any) -> HTTPAdapter:  # noqa: ANN401
+        """Return an HTTP adapter that applies the API's limiters."""
+        return ThrottledAdapter(self.get(api), self.concurrency(api), **kwargs)
+
+    def log_stats(self) -> None:
+        """Log the metrics of every API used so far."""
+        with self._lock:
+            apis = list(self._concurrency)
+        for api in apis:
+            concurrency = self.concurrency(api).stats
+            message = (
+                f"Concurrency limit for '{api}': {concurrency.limit} at the end of the run "
+                f"(peak {concurrency.peak_limit}, {concurrency.backoffs} backoffs)."
+            )
+            limiter = self.get(api)
+            if limiter is not None:
+                stats = limiter.stats
+                message += (
+                    f" Rate limiter: {stats.acquisitions} requests, "
+                    f"{stats.waits} waited, {stats.total_wait:.2f}s in total "
+                    f"(max {stats.max_wait:.2f}s)."
+                )
+            logger.info(message)
+
+
+rate_limiters = RateLimiterRegistry()
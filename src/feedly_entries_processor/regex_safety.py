@@ -0,0 +1,165 @@
+"""Static checks for regular expressions prone to catastrophic backtracking."""
+
+from dataclasses import dataclass, field
+
+_GROUP_EXTENSION_SINGLE = frozenset(":=!>")
+_LOOKBEHIND = frozenset("=!")
+
+
+@dataclass
+class _Group:
+    """State of a group being scanned."""
+
+    atomic: bool = False
+    has_unbounded: bool = False
+
+
+@dataclass
+class _Atom:
+    """The last atom seen, which a following quantifier applies to."""
+
+    group: _Group | None = None
+
+
+@dataclass
+class _Scanner:
+    """Single-pass scanner over a pattern string."""
+
+    pattern: str
+    index: int = 0
+    stack: list[_Group] = field(default_factory=lambda: [_Group()])
+    last: _Atom | None = None
+    found: bool = False
+
+    def _peek(self, offset: int = 0) -> str:
+        position = self.index + offset
+        return self.pattern[position] if position < len(self.pattern) else ""
+
+    def _skip_to(self, char: str) -> None:
+        """Advance past the next occurrence of ``char``."""
+        end = self.pattern.find(char, self.index)
+        self.index = len(self.pattern) if end == -1 else end + 1
+
+    def _skip_class(self) -> None:
+        """Advance past a character class; ``self.index`` is just after ``[``."""
+        if self._peek() == "^":
+            self.index += 1
+        if self._peek() == "]":
+            self.index += 1
+        while self.index < len(self.pattern):
+            char = self._peek()
+            self.index += 2 if char == "\\" else 1
+            if char == "]":
+                return
+
+    def _open_group(self) -> None:
+        """Handle ``(``; ``self.index`` is just after it."""
+        if self._peek() != "?":
+            self.stack.append(_Group())
+            return
+
+        self.index += 1
+        char, following = self._peek(), self._peek(1)
+        if char == "#" or (char == "P" and following == "="):
+            # A comment, or a named backreference, which is a plain atom.
+            self._skip_to(")")
+            self.last = None if char == "#" else _Atom()
+        elif char in _GROUP_EXTENSION_SINGLE:
+            self.index += 1
+            self.stack.append(_Group(atomic=char == ">"))
+        elif char == "<" and following in _LOOKBEHIND:
+            self.index += 2
+            self.stack.append(_Group())
+        elif (char == "P" and following == "<") or char == "(":
+            # A named group, or a conditional group "(?(id)yes|no)".
+            self._skip_to(">" if char == "P" else ")")
+            self.stack.append(_Group())
+        else:
+            # Inline flags: "(?aiLmsux)" applies globally, "(?flags:...)" opens a group.
+            while self._peek() and self._peek() not in ":)":
+                self.index += 1
+            if self._peek() == ":":
+                self.stack.append(_Group())
+            self.index += 1
+
+    def _close_group(self) -> None:
+        """Handle ``)``."""
+        if len(self.stack) == 1:
+            return
+        group = self.stack.pop()
+        self.stack[-1].has_unbounded |= group.has_unbounded
+        self.last = _Atom(group=group)
+
+    def _read_braces(self) -> bool | None:
+        """Parse ``{m,n}``; ``self.index`` is just after ``{``.
+
+        Returns True for an unbounded repeat, False for a bounded one, and
+        None (consuming nothing) if the brace is a literal.
+        """
+        end = self.pattern.find("}", self.index)
+        if end == -1:
+            return None
+        body = self.pattern[self.index : end]
+        low, comma, high = body.partition(",")
+        if not (low.isdigit() or (comma and (low == "" or low.isdigit()))):
+            return None
+        if high and not high.isdigit():
+            return None
+        self.index = end + 1
+        return bool(comma) and not high
+
+    def _quantify(self, *, unbounded: bool) -> None:
+        """Apply a quantifier to the last atom."""
+        possessive = self._peek() == "+"
+        if self._peek() in {"?", "+"}:
+            self.index += 1
+        if self.last is None:
+            return
+        group = self.last.group
+        if unbounded and not possessive:
+            if group is not None and group.has_unbounded and not group.atomic:
+                self.found = True
+            self.stack[-1].has_unbounded = True
+        self.last = None
+
+    def _step(self, char: str) -> None:
+        """Handle one character; ``self.index`` is just after it."""
+        if char == "\\":
+            self.index += 1
+            self.last = _Atom()
+        elif char == "[":
+            self._skip_class()
+            self.last = _Atom()
+        elif char == "(":
+            self.last = None
+            self._open_group()
+        elif char == ")":
+            self._close_group()
+        elif char in {"*", "+", "?"}:
+            self._quantify(unbounded=char != "?")
+        elif char == "{" and (unbounded := self._read_braces()) is not None:
+            self._quantify(unbounded=unbounded)
+        elif char == "|":
+            self.last = None
+        else:
+            self.last = _Atom()
+
+    def scan(self) -> bool:
+        """Return True if a nested unbounded quantifier was found."""
+        while self.index < len(self.pattern) and not self.found:
+            char = self._peek()
+            self.index += 1
+            self._step(char)
+        return self.found
+
+
+def has_nested_unbounded_quantifier(pattern: str) -> bool:
+    r"""Return True if the pattern repeats, without bound, a group that itself repeats without bound.
+
+    Patterns such as ``(a+)+`` or ``(\w+\s?)*`` can take exponential time to
+    fail on a long input. Possessive quantifiers (``a++``) and atomic groups
+    (``(?>...)``) never backtrack and are not reported. This is a heuristic:
+    it may report some harmless patterns and it does not detect every
+    problematic one (e.g. overlapping alternatives such as ``(a|a)*``).
+    """
+    return _Scanner(pattern).scan()
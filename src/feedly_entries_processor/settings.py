@@ -1,6 +1,7 @@
 """Settings loaded from environment variables and optional .env, per secret type."""
 
 from pathlib import Path
+from typing import Annotated
 
 from pydantic import Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -37,3 +38,225 @@ class TodoistSettings(BaseSettings):
         description="Todoist API token.",
         validation_alias="TODOIST_API_TOKEN",
     )
+
+
+class ProcessingSettings(BaseSettings):
+    """Settings that tune how entries are processed (e.g. parallelism)."""
+
+    model_config = _common_config
+
+    match_workers: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Number of worker processes used to evaluate rule conditions. "
+            "0 evaluates them in the main process."
+        ),
+        validation_alias="MATCH_WORKERS",
+    )
+
+    action_workers: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Number of worker threads used to run matched actions. "
+            "0 runs them one at a time in the main thread."
+        ),
+        validation_alias="ACTION_WORKERS",
+    )
+    action_concurrency: dict[str, Annotated[int, Field(ge=1)]] = Field(
+        default_factory=dict,
+        description=(
+            "Maximum number of concurrent calls per action name, as JSON "
+            '(e.g. {"add_todoist_task": 2}). Only used with ACTION_WORKERS.'
+        ),
+        validation_alias="ACTION_CONCURRENCY",
+    )
+    async_pipeline: bool = Field(
+        default=False,
+        description=(
+            "Fetch, match and act on entries as concurrent asyncio stages, so "
+            "that the next page is fetched and matched while actions run. "
+            "ACTION_WORKERS sets the number of action chains run at once."
+        ),
+        validation_alias="ASYNC_PIPELINE",
+    )
+    pipeline_match_tasks: int = Field(
+        default=1,
+        ge=1,
+        description=(
+            "Number of pages matched at once by the asyncio pipeline; above 1 "
+            "only helps with MATCH_WORKERS."
+        ),
+        validation_alias="PIPELINE_MATCH_TASKS",
+    )
+    pipeline_queue_size: int = Field(
+        default=2,
+        ge=1,
+        description=(
+            "Number of fetched pages the asyncio pipeline holds before "
+            "matching them, bounding how far fetching runs ahead."
+        ),
+        validation_alias="PIPELINE_QUEUE_SIZE",
+    )
+    outbox_path: Path | None = Field(
+        default=None,
+        description=(
+            "SQLite file in which matched actions are queued and then run in "
+            "the background, with retries across runs. Unset runs actions directly."
+        ),
+        validation_alias="OUTBOX_PATH",
+    )
+    action_budget: dict[str, Annotated[int, Field(ge=0)]] = Field(
+        default_factory=dict,
+        description=(
+            "Maximum number of API requests per action name to make for queued "
+            'entries in one run, as JSON (e.g. {"add_todoist_task": 500}); a '
+            "batched request counts once for all its entries, and the rest wait "
+            "for the next run. Only used with OUTBOX_PATH."
+        ),
+        validation_alias="ACTION_BUDGET",
+    )
+    outbox_ttl_days: float = Field(
+        default=90,
+        gt=0,
+        description=(
+            "Days after which an outbox job whose entry has not matched again "
+            "is deleted, unless it is pending for a configured rule. Keep it "
+            "above LEDGER_TTL_DAYS."
+        ),
+        validation_alias="OUTBOX_TTL_DAYS",
+    )
+    ledger_path: Path | None = Field(
+        default=None,
+        description=(
+            "SQLite file recording which rules have handled which entries, so "
+            "that later runs skip them. Unset evaluates every entry every run."
+        ),
+        validation_alias="LEDGER_PATH",
+    )
+    ledger_ttl_days: float = Field(
+        default=30,
+        gt=0,
+        description="Days after which a ledger record expires and the entry is handled again.",
+        validation_alias="LEDGER_TTL_DAYS",
+    )
+    quarantine_path: Path | None = Field(
+        default=None,
+        description=(
+            "SQLite file recording entries whose action failed in a way that "
+            "will recur (e.g. no URL, HTTP 400), so that later runs skip them."
+        ),
+        validation_alias="QUARANTINE_PATH",
+    )
+    quarantine_ttl_days: float = Field(
+        default=7,
+        gt=0,
+        description="Days after which a quarantined entry is tried again.",
+        validation_alias="QUARANTINE_TTL_DAYS",
+    )
+    url_dedup: bool = Field(
+        default=False,
+        description=(
+            "Skip entries whose URL, ignoring scheme, fragment and tracking "
+            "parameters, was already seen this run, e.g. under another feed or "
+            "source."
+        ),
+        validation_alias="URL_DEDUP",
+    )
+    url_dedup_path: Path | None = Field(
+        default=None,
+        description=(
+            "SQLite file keeping the URLs seen by URL_DEDUP, so that later runs "
+            "skip them too. Unset forgets them at the end of each run."
+        ),
+        validation_alias="URL_DEDUP_PATH",
+    )
+    url_dedup_ttl_days: float = Field(
+        default=7,
+        gt=0,
+        description="Days after which a URL kept in URL_DEDUP_PATH is forgotten.",
+        validation_alias="URL_DEDUP_TTL_DAYS",
+    )
+    near_dup_distance: int | None = Field(
+        default=None,
+        ge=0,
+        le=16,
+        description=(
+            "Skip entries whose title and summary SimHash differs in at most "
+            "this many of 64 bits from a recent entry's. Unset disables it."
+        ),
+        validation_alias="NEAR_DUP_DISTANCE",
+    )
+    near_dup_window: int = Field(
+        default=50_000,
+        gt=0,
+        description="Number of recent entries NEAR_DUP_DISTANCE compares against.",
+        validation_alias="NEAR_DUP_WINDOW",
+    )
+    model_cache_dir: Path = Field(
+        default_factory=lambda: Path.home() / ".cache" / "feedly-entries-processor",
+        description=(
+            "Directory caching the models built from the examples of "
+            "similar_to_examples conditions."
+        ),
+        validation_alias="MODEL_CACHE_DIR",
+    )
+
+
+class RateLimitSettings(BaseSettings):
+    """Client-side rate and concurrency limits per external API, shared by the whole process."""
+
+    model_config = _common_config
+
+    feedly_rate_limit: float | None = Field(
+        default=None,
+        gt=0,
+        description=(
+            "Maximum sustained Feedly API requests per second. "
+            "Unset leaves Feedly requests unlimited."
+        ),
+        validation_alias="FEEDLY_RATE_LIMIT",
+    )
+    feedly_rate_burst: int = Field(
+        default=10,
+        ge=1,
+        description="Number of Feedly API requests that may be sent at once.",
+        validation_alias="FEEDLY_RATE_BURST",
+    )
+    todoist_rate_limit: float | None = Field(
+        default=1.0,
+        gt=0,
+        description=(
+            "Maximum sustained Todoist API requests per second; the default "
+            "stays under Todoist's 1000 requests per 15 minutes."
+        ),
+        validation_alias="TODOIST_RATE_LIMIT",
+    )
+    todoist_rate_burst: int = Field(
+        default=50,
+        ge=1,
+        description="Number of Todoist API requests that may be sent at once.",
+        validation_alias="TODOIST_RATE_BURST",
+    )
+    feedly_max_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="Upper bound of the adaptive number of concurrent Feedly API requests.",
+        validation_alias="FEEDLY_MAX_CONCURRENCY",
+    )
+    todoist_max_concurrency: int = Field(
+        default=8,
+        ge=1,
+        description="Upper bound of the adaptive number of concurrent Todoist API requests.",
+        validation_alias="TODOIST_MAX_CONCURRENCY",
+    )
+    latency_target: float | None = Field(
+        default=None,
+        gt=0,
+        description=(
+            "Seconds above which a response no longer raises the concurrency "
+            "limit. Unset only backs off on overload responses."
+        ),
+        validation_alias="API_LATENCY_TARGET",
+    )
@@ -0,0 +1,96 @@
+"""Trie index matching stream ids against exact ids, prefixes and globs."""
+
+from collections.abc import Iterable
+
+GLOB_WILDCARD = "*"
+
+
+class _Node[T]:
+    """A trie node; a node reached through a wildcard loops on any character."""
+
+    __slots__ = ("children", "loops", "values", "wildcard")
+
+    def __init__(self, *, loops: bool = False) -> None:
+        self.children: dict[str, _Node[T]] = {}
+        self.wildcard: _Node[T] | None = None
+        self.loops = loops
+        self.values: list[T] = []
+
+
+def _with_wildcards[T](nodes: Iterable[_Node[T]]) -> set[_Node[T]]:
+    """Add the nodes reachable through a wildcard matching the empty string."""
+    states = set(nodes)
+    states.update([node.wildcard for node in states if node.wildcard is not None])
+    return states
+
+
+class StreamIdTrie[T]:
+    """Index of stream-id patterns, each associated with a value.
+
+    A pattern without a wildcard must equal the stream id. In a pattern with
+    wildcards, each ``*`` matches any sequence of characters (including
+    ``/``), so ``feed/https://example.com/*`` matches every feed of that site.
+
+    Exact ids are kept in a dict. Wildcard patterns share a character trie
+    that `lookup` walks once per stream id, keeping the set of active nodes,
+    so its cost does not grow with the number of patterns. Results are
+    memoised, since a stream usually returns many entries from the same feeds.
+    """
+
+    def __init__(self) -> None:
+        self._exact: dict[str, list[T]] = {}
+        self._root: _Node[T] = _Node()
+        self._has_globs = False
+        self._cache: dict[str, frozenset[T]] = {}
+
+    @property
+    def has_globs(self) -> bool:
+        """Return True if any pattern with a wildcard was added."""
+        return self._has_globs
+
+    def add(self, pattern: str, value: T) -> None:
+        """Associate a pattern with a value."""
+        self._cache.clear()
+        if GLOB_WILDCARD not in pattern:
+            self._exact.setdefault(pattern, []).append(value)
+            return
+
+        self._has_globs = True
+        node = self._root
+        for char in pattern:
+            if char != GLOB_WILDCARD:
+                node = node.children.setdefault(char, _Node())
+            elif not node.loops:
+                if node.wildcard is None:
+                    node.wildcard = _Node(loops=True)
+                node = node.wildcard
+        node.values.append(value)
+
+    def lookup(self, stream_id: str) -> frozenset[T]:
+        """Return the values of every pattern matching the stream id."""
+        cached = self._cache.get(stream_id)
+        if cached is None:
+            cached = self._cache[stream_id] = frozenset(self._walk(stream_id))
+        return cached
+
+    def _walk(self, stream_id: str) -> set[T]:
+        result = set(self._exact.get(stream_id, ()))
+        if not self._has_globs:
+            return result
+
+        states = _with_wildcards([self._root])
+        for char in stream_id:
+            next_states: list[_Node[T]] = []
+            for node in states:
+                child = node.children.get(char)
+                if child is not None:
+                    next_states.append(child)
+                if node.loops:
+                    next_states.append(node)
+            if not next_states:
+                return result
+            states = _with_wildcards(next_states)
+
+        for node in states:
+            result.update(node.values)
+        return result
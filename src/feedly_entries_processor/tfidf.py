@@ -0,0 +1,143 @@
+"""TF-IDF models scoring texts by similarity to a set of examples."""
+
+from __future__ import annotations
+
+import hashlib
+import html
+import json
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING
+
+from logzero import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from pathlib import Path
+
+# Bumped whenever tokenisation or weighting changes, so that cached models
+# built the old way are not reused.
+MODEL_VERSION = 1
+
+_TAG = re.compile(r"<[^>]*>")
+_WORD = re.compile(r"\w\w+")
+
+# Common English words, which say nothing about what a text is about.
+STOP_WORDS = frozenset(
+    {
+        "a", "about", "after", "all", "also", "an", "and", "any", "are", "as",
+        "at", "be", "been", "but", "by", "can", "for", "from", "has", "have",
+        "he", "her", "his", "how", "if", "in", "into", "is", "it", "its",
+        "more", "new", "not", "of", "on", "or", "our", "out", "she", "so",
+        "than", "that", "the", "their", "there", "they", "this", "to", "up",
+        "was", "we", "were", "what", "when", "which", "who", "will", "with",
+        "you", "your",
+    }
+)  # fmt: skip
+
+
+def tokenize(text: str) -> list[str]:
+    """Return the lower-cased words of a text, without HTML tags or stop words."""
+    text = html.unescape(_TAG.sub(" ", text)).lower()
+    return [word for word in _WORD.findall(text) if word not in STOP_WORDS]
+
+
+@dataclass(frozen=True)
+class TfidfModel:
+    """Inverse document frequencies of the example terms and their centroid.
+
+    ``centroid`` is the mean of the examples' L2-normalised TF-IDF vectors,
+    itself normalised, as a sparse vector mapping terms to weights.
+    """
+
+    idf: dict[str, float]
+    default_idf: float
+    centroid: dict[str, float]
+
+    @classmethod
+    def build(cls, examples: Sequence[str]) -> TfidfModel:
+        """Build the model of a set of example texts.
+
+        IDF is smoothed as in ``log((1 + n) / (1 + df)) + 1``, so terms that
+        every example shares keep a positive weight.
+        """
+        counts = [Counter(tokenize(example)) for example in examples]
+        document_frequency = Counter(term for count in counts for term in count)
+        smoothed = 1 + len(examples)
+        idf = {
+            term: math.log(smoothed / (1 + df)) + 1
+            for term, df in document_frequency.items()
+        }
+        centroid: dict[str, float] = {}
+        for count in counts:
+            for term, weight in _normalized(
+                {term: tf * idf[term] for term, tf in count.items()}
+            ).items():
+                centroid[term] = centroid.get(term, 0.0) + weight
+        return cls(
+            idf=idf,
+            default_idf=math.log(smoothed) + 1,
+            centroid=_normalized(centroid),
+        )
+
+    def score_batch(self, texts: Iterable[str]) -> list[float]:
+        """Return the cosine similarity of each text to the centroid.
+
+        Each text becomes a sparse TF-IDF vector; only its terms present in
+        the centroid contribute to the dot product.
+        """
+        idf_get = self.idf.get
+        default_idf = self.default_idf
+        centroid_get = self.centroid.get
+        scores = []
+        for text in texts:
+            weights = {
+                term: tf * idf_get(term, default_idf)
+                for term, tf in Counter(tokenize(text)).items()
+            }
+            norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+            dot = sum(
+                weight * centroid_get(term, 0.0) for term, weight in weights.items()
+            )
+            scores.append(dot / norm if norm else 0.0)
+        return scores
+
+
+def _normalized(vector: dict[str, float]) -> dict[str, float]:
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    return {term: weight / norm for term, weight in vector.items()} if norm else {}
+
+
+def model_key(examples: Sequence[str]) -> str:
+    """Return the cache key of the model of a set of examples."""
+    payload = json.dumps({"version": MODEL_VERSION, "examples": list(examples)})
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def load_or_build(examples: Sequence[str], cache_dir: Path | None) -> TfidfModel:
+    """Return the model of the examples, cached in ``cache_dir`` if given.
+
+    A cached model is reused as long as the examples are unchanged; an
+    unreadable cache file is rebuilt and replaced.
+    """
+    if cache_dir is None:
+        return TfidfModel.build(examples)
+    path = cache_dir / f"tfidf-{model_key(examples)}.json"
+    try:
+        return TfidfModel(**json.loads(path.read_text(encoding="utf-8")))
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, TypeError) as e:
+        logger.warning(f"Rebuilding unreadable TF-IDF model cache {path}: {e}")
+    model = TfidfModel.build(examples)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_text(json.dumps(asdict(model)), encoding="utf-8")
+        temporary.replace(path)
+    except OSError as e:
+        logger.warning(f"Could not cache TF-IDF model in {path}: {e}")
+    return model
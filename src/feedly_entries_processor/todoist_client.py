@@ -1,16 +1,138 @@
 """Todoist API client with retry and error handling helpers."""
 
+import json
+import re
+import threading
+from collections.abc import Mapping, Sequence
 from typing import Any, Literal
+from uuid import uuid4
 
+import requests
+from logzero import logger
 from requests import Response
-from requests.exceptions import HTTPError, RequestException
+from requests.exceptions import RequestException
 from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 from todoist_api_python.api import TodoistAPI
 from todoist_api_python.models import Task
 
 from feedly_entries_processor.exceptions import TodoistApiError
+from feedly_entries_processor.rate_limit import (
+    OVERLOAD_STATUS_CODES,
+    is_retryable_error,
+    rate_limiters,
+)
+
+RETRYABLE_STATUS_CODES = OVERLOAD_STATUS_CODES
+PERSISTENT_STATUS_CODES = {401, 403}
+
+TODOIST_SYNC_URL = "https://api.todoist.com/api/v1/sync"
+# Maximum number of commands Todoist accepts in one Sync request.
+SYNC_COMMAND_LIMIT = 100
+_SYNC_TIMEOUT = (10, 60)
+
+# Connections kept alive per client; enough for concurrent action workers.
+CONNECTION_POOL_SIZE = 10
+
+# Maximum number of tasks per page when listing tasks.
+TASKS_PAGE_LIMIT = 200
+_URL_PATTERN = re.compile(r"https?://[^\s<>()\[\]]+")
+
+# The status of one Sync command: "ok", or an error object.
+type SyncStatus = Literal["ok"] | dict[str, Any]
+
+
+class TodoistClientRegistry:
+    """Hands out one shared Todoist client per API token.
+
+    Each client wraps a `requests.Session` with a keep-alive connection pool,
+    so tasks after the first reuse an open TLS connection. Every request,
+    retries included, waits for the shared Todoist rate and concurrency
+    limiters. Clients are
+    created under a lock and can be shared by concurrent workers.
+    """
+
+    def __init__(self, pool_size: int = CONNECTION_POOL_SIZE) -> None:
+        self._pool_size = pool_size
+        self._lock = threading.Lock()
+        self._clients: dict[str, tuple[requests.Session, TodoistAPI]] = {}
+        self._index_lock = threading.Lock()
+        self._url_indexes: dict[tuple[str, str], set[str]] = {}
+
+    def _get(self, api_token: str) -> tuple[requests.Session, TodoistAPI]:
+        with self._lock:
+            pair = self._clients.get(api_token)
+            if pair is None:
+                session = requests.Session()
+                adapter = rate_limiters.adapter(
+                    "todoist", pool_connections=1, pool_maxsize=self._pool_size
+                )
+                session.mount("https://", adapter)
+                pair = self._clients[api_token] = (
+                    session,
+                    TodoistAPI(api_token, session=session),
+                )
+            return pair
+
+    def client(self, api_token: str) -> TodoistAPI:
+        """Return the shared REST client for the token."""
+        return self._get(api_token)[1]
+
+    def session(self, api_token: str) -> requests.Session:
+        """Return the shared HTTP session for the token, e.g. for Sync API requests."""
+        return self._get(api_token)[0]
+
+    def url_index(self, api_token: str, project_id: str) -> set[str]:
+        """Return the URLs in the open tasks of a project, fetched once per run.
+
+        The returned set is shared: add the URL of each task created, so that
+        later lookups see it.
+
+        Raises TodoistApiError if the tasks cannot be fetched.
+        """
+        with self._index_lock:
+            index = self._url_indexes.get((api_token, project_id))
+            if index is None:
+                index = fetch_task_urls(self.client(api_token), project_id)
+                self._url_indexes[api_token, project_id] = index
+                logger.info(
+                    f"Indexed {len(index)} URLs from open Todoist tasks in project {project_id}."
+                )
+            return index
+
+    def reserve_url(self, api_token: str, project_id: str, url: str) -> bool:
+        """Add a URL to the index of a project unless it is already there.
 
-RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+        Checking and adding happen under one lock, so of concurrent workers
+        about to create a task for the same URL, only one gets True. Call
+        `release_url` if the task could not be created.
+
+        Raises TodoistApiError if the tasks cannot be fetched.
+        """
+        index = self.url_index(api_token, project_id)
+        with self._index_lock:
+            if url in index:
+                return False
+            index.add(url)
+            return True
+
+    def release_url(self, api_token: str, project_id: str, url: str) -> None:
+        """Remove a URL reserved with `reserve_url` whose task was not created."""
+        with self._index_lock:
+            index = self._url_indexes.get((api_token, project_id))
+            if index is not None:
+                index.discard(url)
+
+    def close(self) -> None:
+        """Close every session and drop the URL indexes; later calls start afresh."""
+        with self._index_lock:
+            self._url_indexes = {}
+        with self._lock:
+            clients, self._clients = self._clients, {}
+        for session, _ in clients.values():
+            session.close()
+
+
+todoist_clients = TodoistClientRegistry()
 
 
 def _response_error_body(response: Response) -> Any:  # noqa: ANN401
@@ -39,14 +161,27 @@ def build_error_details(
     }
 
 
-def _should_retry(exc: BaseException) -> bool:
-    """Return True if the exception is worth retrying (transient/rate limit)."""
-    if isinstance(exc, HTTPError):
-        return (
-            exc.response is not None
-            and exc.response.status_code in RETRYABLE_STATUS_CODES
-        )
-    return isinstance(exc, RequestException)
+def extract_urls(text: str) -> set[str]:
+    """Return the http(s) URLs found in a text, e.g. a task's content."""
+    return set(_URL_PATTERN.findall(text))
+
+
+def fetch_task_urls(client: TodoistAPI, project_id: str) -> set[str]:
+    """Return the URLs found in the content of a project's open tasks.
+
+    Raises TodoistApiError on RequestException (e.g. HTTPError, ConnectionError).
+    """
+    urls: set[str] = set()
+    try:
+        for tasks in client.get_tasks(project_id=project_id, limit=TASKS_PAGE_LIMIT):
+            for task in tasks:
+                urls.update(extract_urls(task.content))
+    except RequestException as exc:
+        response = getattr(exc, "response", None)
+        details = build_error_details(response, project_id)
+        message = f"Todoist API request failed with status {details['status_code']}"
+        raise TodoistApiError(message, details=details) from exc
+    return urls
 
 
 def add_task_with_retry(  # noqa: PLR0913
@@ -84,7 +219,7 @@ def add_task_with_retry(  # noqa: PLR0913
     reraise=True,
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=1, max=10),
-    retry=retry_if_exception(_should_retry),
+    retry=retry_if_exception(is_retryable_error),
 )
 def _add_task_with_retry_impl(  # noqa: PLR0913
     client: TodoistAPI,
@@ -105,3 +240,80 @@ def _add_task_with_retry_impl(  # noqa: PLR0913
         description=description,
         labels=list(labels) if labels else None,
     )
+
+
+def build_item_add_command(  # noqa: PLR0913
+    *,
+    content: str,
+    project_id: str,
+    priority: Literal[1, 2, 3, 4] | None = None,
+    due_string: str | None = None,
+    description: str | None = None,
+    labels: frozenset[str] | None = None,
+    command_uuid: str | None = None,
+) -> dict[str, Any]:
+    """Build a Sync API ``item_add`` command with a fresh temp id.
+
+    Todoist ignores a command whose uuid it has already applied, so a
+    request can be retried without creating duplicate tasks. Pass the same
+    ``command_uuid`` for every attempt to add the same task, even across
+    requests; by default the command gets a fresh uuid.
+    """
+    args: dict[str, Any] = {"content": content, "project_id": project_id}
+    if priority is not None:
+        args["priority"] = priority
+    if due_string is not None:
+        args["due"] = {"string": due_string}
+    if description is not None:
+        args["description"] = description
+    if labels:
+        args["labels"] = sorted(labels)
+    return {
+        "type": "item_add",
+        "uuid": command_uuid if command_uuid is not None else str(uuid4()),
+        "temp_id": str(uuid4()),
+        "args": args,
+    }
+
+
+def sync_commands_with_retry(
+    api_token: str,
+    commands: Sequence[Mapping[str, Any]],
+    *,
+    project_id: str,
+) -> dict[str, SyncStatus]:
+    """Send commands to the Todoist Sync API, retrying transient and rate-limit errors.
+
+    Returns the ``sync_status`` of the response, keyed by command uuid.
+
+    Raises TodoistApiError on RequestException (e.g. HTTPError, ConnectionError).
+    """
+    try:
+        return _sync_commands_with_retry_impl(api_token, commands)
+    except RequestException as exc:
+        response = getattr(exc, "response", None)
+        details = build_error_details(response, project_id)
+        message = f"Todoist API request failed with status {details['status_code']}"
+        raise TodoistApiError(message, details=details) from exc
+
+
+@retry(
+    reraise=True,
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=1, max=10),
+    retry=retry_if_exception(is_retryable_error),
+)
+def _sync_commands_with_retry_impl(
+    api_token: str,
+    commands: Sequence[Mapping[str, Any]],
+) -> dict[str, SyncStatus]:
+    """Send commands to the Todoist Sync API with retry on transient errors (internal)."""
+    response = todoist_clients.session(api_token).post(
+        TODOIST_SYNC_URL,
+        headers={"Authorization": f"Bearer {api_token}"},
+        data={"commands": json.dumps(list(commands))},
+        timeout=_SYNC_TIMEOUT,
+    )
+    response.raise_for_status()
+    sync_status: dict[str, SyncStatus] = response.json().get("sync_status", {})
+    return sync_status
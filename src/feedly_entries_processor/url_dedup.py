@@ -0,0 +1,199 @@
+"""Suppression of entries whose article was already seen under another entry id."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from logzero import logger
+
+from feedly_entries_processor.ledger import SECONDS_PER_DAY
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from pathlib import Path
+
+    from feedly_entries_processor.feedly_client import Entry
+    from feedly_entries_processor.settings import ProcessingSettings
+
+# Query parameters that only track where a visit came from.
+TRACKING_PARAMETERS = frozenset(
+    {
+        "fbclid",
+        "gclid",
+        "dclid",
+        "msclkid",
+        "yclid",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "_hsenc",
+        "_hsmi",
+        "ref",
+        "ref_src",
+    }
+)
+TRACKING_PARAMETER_PREFIXES = ("utm_",)
+
+# Default number of fingerprints kept in memory; the oldest are forgotten first.
+SEEN_URL_CAPACITY = 100_000
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_urls (
+    fingerprint INTEGER PRIMARY KEY,
+    seen_at REAL NOT NULL,
+    entry_id TEXT
+);
+"""
+
+
+def _is_tracking_parameter(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMETERS or name.startswith(TRACKING_PARAMETER_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """Return a form of the URL shared by its common variants.
+
+    The scheme, a leading ``www.``, default ports, the fragment, tracking
+    parameters and a trailing slash are dropped; the host is lower-cased
+    and the remaining query parameters are sorted.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").removeprefix("www.")
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port is not None and port != _DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f"{host}:{port}"
+    query = urlencode(
+        sorted(
+            (name, value)
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not _is_tracking_parameter(name)
+        )
+    )
+    path = parts.path.rstrip("/")
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+def url_fingerprint(url: str) -> int:
+    """Return a 64-bit fingerprint of the canonical form of a URL."""
+    digest = hashlib.blake2b(canonicalize_url(url).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class UrlDeduplicator:
+    """Drops entries whose canonical URL was already seen under another entry id.
+
+    Each fingerprint remembers the id of the first entry seen with it, so
+    that the same entry fetched again, e.g. by overlapping windows or
+    sources, is kept. At most ``capacity`` fingerprints are kept in memory, oldest forgotten
+    first. With a ``path``, fingerprints are also kept in a SQLite file for
+    ``ttl`` seconds, so that an article seen in an earlier run is dropped
+    too. Entries without a URL are never dropped.
+    """
+
+    def __init__(
+        self,
+        *,
+        capacity: int = SEEN_URL_CAPACITY,
+        path: Path | None = None,
+        ttl: float = 7 * SECONDS_PER_DAY,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._capacity = capacity
+        self._path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Fingerprint to the id of the first entry seen with it; insertion-ordered,
+        # so that the oldest fingerprint is evicted first.
+        self._seen: dict[int, str | None] = {}
+        self._new: list[tuple[int, str]] = []
+        self.dropped = 0
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(self._connect(path)) as connection, connection:
+                connection.executescript(_SCHEMA)
+                columns = {
+                    row[1] for row in connection.execute("PRAGMA table_info(seen_urls)")
+                }
+                if "entry_id" not in columns:
+                    connection.execute("ALTER TABLE seen_urls ADD COLUMN entry_id TEXT")
+                connection.execute(
+                    "DELETE FROM seen_urls WHERE seen_at < ?", (clock() - ttl,)
+                )
+                rows = connection.execute(
+                    "SELECT fingerprint, entry_id FROM seen_urls "
+                    "ORDER BY seen_at DESC LIMIT ?",
+                    (capacity,),
+                ).fetchall()
+            self._seen = dict(reversed(rows))
+
+    @staticmethod
+    def _connect(path: Path) -> sqlite3.Connection:
+        return sqlite3.connect(path, timeout=30)
+
+    def is_duplicate(self, entry: Entry) -> bool:
+        """Return True if the entry's article was seen under another entry id.
+
+        Otherwise the article is remembered as the entry's.
+        """
+        url = entry.effective_url
+        if url is None:
+            return False
+        fingerprint = url_fingerprint(url)
+        with self._lock:
+            if fingerprint in self._seen:
+                if self._seen[fingerprint] == entry.id:
+                    return False
+                self.dropped += 1
+                return True
+            self._seen[fingerprint] = entry.id
+            self._new.append((fingerprint, entry.id))
+            if len(self._seen) > self._capacity:
+                del self._seen[next(iter(self._seen))]
+        return False
+
+    def filter(self, entries: Iterable[Entry]) -> Iterator[Entry]:
+        """Yield the entries whose article was not seen under another entry id."""
+        for entry in entries:
+            if self.is_duplicate(entry):
+                logger.debug(
+                    f"Skipped duplicate of an entry already seen: '{entry.title}' "
+                    f"(URL: {entry.effective_url})"
+                )
+            else:
+                yield entry
+
+    def flush(self) -> None:
+        """Write the fingerprints seen since the last flush, if persisted."""
+        with self._lock:
+            new, self._new = self._new, []
+        if self._path is None or not new:
+            return
+        now = self._clock()
+        with closing(self._connect(self._path)) as connection, connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO seen_urls (fingerprint, seen_at, entry_id) "
+                "VALUES (?, ?, ?)",
+                [(fingerprint, now, entry_id) for fingerprint, entry_id in new],
+            )
+
+
+def open_url_deduplicator(settings: ProcessingSettings) -> UrlDeduplicator | None:
+    """Open the deduplicator enabled by ``URL_DEDUP``, or return None if disabled."""
+    if not settings.url_dedup:
+        return None
+    return UrlDeduplicator(
+        path=settings.url_dedup_path,
+        ttl=settings.url_dedup_ttl_days * SECONDS_PER_DAY,
+    )
@@ -1,7 +1,7 @@
 """Tests for the AddTodoistTaskAction."""
 
-from collections.abc import Callable
-from typing import Literal
+from collections.abc import Callable, Iterator
+from typing import Any, Literal
 from unittest.mock import MagicMock
 
 import pytest
@@ -15,17 +15,20 @@ from feedly_entries_processor.actions.add_todoist_task_action import (
 )
 from feedly_entries_processor.exceptions import (
     ActionSkippedDueToPersistentError,
+    InvalidEntryError,
+    PartialFailureError,
     TodoistApiError,
 )
 from feedly_entries_processor.feedly_client import Alternate, Entry, Origin, Summary
 from feedly_entries_processor.settings import TodoistSettings
+from feedly_entries_processor.todoist_client import todoist_clients
 
 
 @pytest.fixture
 def mock_todoist_api(mocker: MockerFixture) -> MagicMock:
-    """Fixture for mocking TodoistAPI."""
+    """Fixture for mocking the shared TodoistAPI client lookup."""
     mock_api: MagicMock = mocker.patch(
-        "feedly_entries_processor.actions.add_todoist_task_action.TodoistAPI"
+        "feedly_entries_processor.actions.add_todoist_task_action.todoist_clients.client"
     )
     return mock_api
 
@@ -39,12 +42,17 @@ def add_todoist_task_action_factory() -> Callable[..., AddTodoistTaskAction]:
         due_string: str | None = None,
         priority: Literal[1, 2, 3, 4] | None = None,
         labels: frozenset[str] | None = None,
+        *,
+        use_sync_api: bool = False,
+        skip_existing: bool = False,
     ) -> AddTodoistTaskAction:
         return AddTodoistTaskAction(
             project_id=project_id,
             due_string=due_string,
             priority=priority,
             labels=labels,
+            use_sync_api=use_sync_api,
+            skip_existing=skip_existing,
             todoist_settings=TodoistSettings.model_construct(
                 todoist_api_token=SecretStr("test_token")
             ),
@@ -287,3 +295,317 @@ def test_AddTodoistTaskAction_process_does_not_set_persistent_error_on_500(
     assert exc_info_retry.value.details["status_code"] == 500
 
     assert mock_instance.add_task.call_count == 6
+
+
+@pytest.fixture
+def mock_sync_commands(mocker: MockerFixture) -> MagicMock:
+    """Fixture for mocking sync_commands_with_retry; every command succeeds by default."""
+    mock: MagicMock = mocker.patch(
+        "feedly_entries_processor.actions.add_todoist_task_action.sync_commands_with_retry",
+        side_effect=lambda _token, commands, **_: {
+            command["uuid"]: "ok" for command in commands
+        },
+    )
+    return mock
+
+
+@pytest.mark.parametrize(
+    ("use_sync_api", "expected"),
+    [
+        pytest.param(False, False, id="rest"),
+        pytest.param(True, True, id="sync"),
+    ],
+)
+def test_AddTodoistTaskAction_supports_batch_follows_use_sync_api(
+    add_todoist_task_action_factory: Callable[..., AddTodoistTaskAction],
+    use_sync_api: bool,
+    expected: bool,
+) -> None:
+    # act & assert
+    assert (
+        add_todoist_task_action_factory(use_sync_api=use_sync_api).supports_batch
+        is expected
+    )
+
+
+def test_AddTodoistTaskAction_process_batch_sends_item_add_commands_in_chunks(
+    mocker: MockerFixture,
+    mock_sync_commands: MagicMock,
+    add_todoist_task_action_factory: Callable[..., AddTodoistTaskAction],
+    entry_builder: Callable[..., Entry],
+) -> None:
+    # arrange
+    mocker.patch(
+        "feedly_entries_processor.actions.add_todoist_task_action.SYNC_COMMAND_LIMIT",
+        2,
+    )
+    action = add_todoist_task_action_factory(
+        priority=3, labels=frozenset({"reading"}), use_sync_api=True
+    )
+    entries = [
+        entry_builder(title=f"Entry {i}").model_copy(update={"id": f"entry_{i}"})
+        for i in range(3)
+    ]
+
+    # act
+    action.process_batch(entries)
+
+    # assert
+    sent = [call.args[1] for call in mock_sync_commands.call_args_list]
+    assert [len(commands) for commands in sent] == [2, 1]
+    assert [command["args"] for commands in sent for command in commands] == [
+        {
+            "content": f"Entry {i} - http://example.com/test",
+            "project_id": "test_project_id",
+            "priority": 3,
+            "description": "Test Summary Content",
+            "labels": ["reading"],
+        }
+        for i in range(3)
+    ]
+    assert all(
+        command["type"] == "item_add" for commands in sent for command in commands
+    )
+
+
+def test_AddTodoistTaskAction_process_batch_maps_failed_commands_to_their_entries(
+    mock_sync_commands: MagicMock,
+    add_todoist_task_action_factory: Callable[..., AddTodoistTaskAction],
+    entry_builder: Callable[..., Entry],
+) -> None:
+    # arrange
+    action = add_todoist_task_action_factory(use_sync_api=True)
+    entries = [
+        entry_builder(title=f"Entry {i}").model_copy(update={"id": f"entry_{i}"})
+        for i in range(3)
+    ]
+    error = {"error": "Invalid argument value", "error_code": 20, "http_code": 400}
+
+    def sync(
+        _token: str, commands: list[dict[str, Any]], **_: object
+    ) -> dict[str, Any]:
+        return {
+            command["uuid"]: error
+            if command["args"]["content"].startswith("Entry 1")
+            else "ok"
+            for command in commands
+        }
+
+    mock_sync_commands.side_effect = sync
+
+    # act & assert
+    with pytest.raises(PartialFailureError) as exc_info:
+        action.process_batch(entries)
+
+    assert list(exc_info.value.errors) == ["entry_1"]
+    failure = exc_info.value.errors["entry_1"]
+    assert isinstance(failure, TodoistApiError)
+    assert failure.details["status_code"] == 400
+    assert failure.details["error_body"] == error
+    assert "1 of 3" in str(exc_info.value)
+    mock_sync_commands.assert_called_once()
+
+
+def test_AddTodoistTaskAction_process_batch_reuses_command_uuid_of_an_entry(
+    mock_sync_commands: MagicMock,
+    add_todoist_task_action_factory: Callable[..., AddTodoistTaskAction],
+    entry_builder: Callable[..., Entry],
+) -> None:
+    # arrange
+    action = add_todoist_task_action_factory(use_sync_api=True)
+    other_action = add_todoist_task_action_factory(priority=4, use_sync_api=True)
+    entries = [
+        entry_builder().model_copy(update={"id": entry_id})
+        for entry_id in ("entry_a", "entry_b")
+    ]
+
+    # act
+    action.process_batch(entries)
+    action.process_batch(entries[:1])
+    other_action.process_batch(entries[:1])
+
+    # assert
+    uuids = [
+        [command["uuid"] for command in call.args[1]]
+        for call in mock_sync_commands.call_args_list
+    ]
+    assert uuids[0][0] == uuids[1][0]
+    assert uuids[0][1] != uuids[0][0]
+    assert uuids[2][0] != uuids[0][0]
+
+
+def test_AddTodoistTaskAction_process_batch_skips_entries_without_url(
+    mock_sync_commands: MagicMock,
+    add_todoist_task_action_factory: Callable[..., AddTodoistTaskAction],
+    entry_builder: Callable[..., Entry],
+) -> None:
+    # arrange
+    action = add_todoist_task_action_factory(use_sync_api=True)
+    entries = [
+        entry_builder(canonical_url=None).model_copy(update={"id": "no_url"}),
+        entry_builder(),
+    ]
+
+    # act & assert
+    with pytest.raises(PartialFailureError) as exc_info:
+        action.process_batch(entries)
+
+    assert list(exc_info.value.errors) == ["no_url"]
+    assert isinstance(exc_info.value.errors["no_url"], InvalidEntryError)
+    assert len(mock_sync_commands.call_args.args[1]) == 1
+
+
+@pytest.mark.parametrize(
+    "sync_effect",
+    [
+        pytest.param(
+            TodoistApiError("failed", details={"status_code": 401}),
+            id="request_401",
+        ),
+        pytest.param(
+            lambda _token, commands, **_: {
+                command["uuid"]: {"error": "Forbidden", "http_code": 403}
+                for command in commands
+            },
+            id="command_403",
+        ),
+    ],
+)
+def test_AddTodoistTaskAction_process_batch_sets_persistent_error_on_auth_failure(
+    mocker: MockerFixture,
+    mock_sync_commands: MagicMock,
+    add_todoist_task_action_factory: Callable[..., AddTodoistTaskAction],
+    entry_builder: Callable[..., Entry],
+    sync_effect: object,
+) -> None:
+    # arrange
+    mocker.patch(
+        "feedly_entries_processor.actions.add_todoist_task_action.SYNC_COMMAND_LIMIT",
+        1,
+    )
+    action = add_todoist_task_action_factory(use_sync_api=True)
+    mock_sync_commands.side_effect = sync_effect
+    entries = [
+        entry_builder().model_copy(update={"id": entry_id})
+        for entry_id in ("sent", "unsent")
+    ]
+
+    # act & assert (first call)
+    with pytest.raises(PartialFailureError) as exc_info:
+        action.process_batch(entries)
+    assert set(exc_info.value.errors) == {"sent", "unsent"}
+
+    # act & assert (second call)
+    with pytest.raises(ActionSkippedDueToPersistentError):
+        action.process_batch([entry_builder()])
+
+    mock_sync_commands.assert_called_once()
+
+
+@pytest.fixture
+def mock_url_index(mocker: MockerFixture) -> Iterator[set[str]]:
+    """Fixture for the shared index of URLs already in Todoist."""
+    index = {"http://example.com/existing"}
+    mocker.patch(
+        "feedly_entries_processor.todoist_client.fetch_task_urls",
+        return_value=index,
+    )
+    yield index
+    todoist_clients.close()
+
+
+def test_AddTodoistTaskAction_process_skips_entry_whose_url_is_already_in_Todoist(
+    mock_todoist_api: MagicMock,
+    mock_url_index: set[str],
+    add_todoist_task_action_factory: Callable[..., AddTodoistTaskAction],
+    entry_builder: Callable[..., Entry],
+) -> None:
+    # arrange
+    action = add_todoist_task_action_factory(skip_existing=True)
+    mock_instance = mock_todoist_api.return_value
+
+    # act
+    action.process(entry_builder(canonical_url="http://example.com/existing"))
+    action.process(entry_builder(canonical_url="http://example.com/new"))
+    action.process(entry_builder(canonical_url="http://example.com/new"))
+
+    # assert
+    mock_instance.add_task.assert_called_once()
+    assert mock_url_index == {
+        "http://example.com/existing",
+        "http://example.com/new",
+    }
+
+
+def test_AddTodoistTaskAction_process_releases_url_when_task_creation_fails(
+    mock_todoist_api: MagicMock,
+    mock_url_index: set[str],
+    add_todoist_task_action_factory: Callable[..., AddTodoistTaskAction],
+    entry_builder: Callable[..., Entry],
+) -> None:
+    # arrange
+    action = add_todoist_task_action_factory(skip_existing=True)
+    mock_instance = mock_todoist_api.return_value
+    response = Response()
+    response.status_code = 400
+    mock_instance.add_task.side_effect = [HTTPError(response=response), MagicMock()]
+    entry = entry_builder(canonical_url="http://example.com/new")
+
+    # act
+    with pytest.raises(TodoistApiError):
+        action.process(entry)
+    reserved_after_failure = "http://example.com/new" in mock_url_index
+    action.process(entry)
+
+    # assert
+    assert not reserved_after_failure
+    assert mock_instance.add_task.call_count == 2
+    assert "http://example.com/new" in mock_url_index
+
+
+def test_AddTodoistTaskAction_process_batch_skips_existing_and_repeated_urls(
+    mock_sync_commands: MagicMock,
+    mock_url_index: set[str],
+    add_todoist_task_action_factory: Callable[..., AddTodoistTaskAction],
+    entry_builder: Callable[..., Entry],
+) -> None:
+    # arrange
+    action = add_todoist_task_action_factory(use_sync_api=True, skip_existing=True)
+    entries = [
+        entry_builder(canonical_url="http://example.com/existing"),
+        entry_builder(canonical_url="http://example.com/new"),
+        entry_builder(canonical_url="http://example.com/new"),
+    ]
+
+    # act
+    action.process_batch(entries)
+    action.process_batch(entries)
+
+    # assert
+    mock_sync_commands.assert_called_once()
+    assert [
+        command["args"]["content"] for command in mock_sync_commands.call_args.args[1]
+    ] == ["Test Entry - http://example.com/new"]
+    assert "http://example.com/new" in mock_url_index
+
+
+def test_AddTodoistTaskAction_process_sets_persistent_error_when_index_fetch_is_forbidden(
+    mocker: MockerFixture,
+    mock_todoist_api: MagicMock,
+    add_todoist_task_action_factory: Callable[..., AddTodoistTaskAction],
+    entry_builder: Callable[..., Entry],
+) -> None:
+    # arrange
+    mocker.patch(
+        "feedly_entries_processor.actions.add_todoist_task_action.todoist_clients.url_index",
+        side_effect=TodoistApiError("failed", details={"status_code": 403}),
+    )
+    action = add_todoist_task_action_factory(skip_existing=True)
+
+    # act & assert
+    with pytest.raises(TodoistApiError):
+        action.process(entry_builder())
+    with pytest.raises(ActionSkippedDueToPersistentError):
+        action.process(entry_builder())
+
+    mock_todoist_api.return_value.add_task.assert_not_called()
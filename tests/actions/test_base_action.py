@@ -1,5 +1,7 @@
 """Tests for the BaseAction."""
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from pytest_mock import MockerFixture
 
@@ -51,3 +53,79 @@ def test_BaseAction_process_calls_internal_process_when_no_persistent_error_exis
 
     # assert
     mock_process.assert_called_once_with(mock_entry)
+
+
+def test_BaseAction_process_batch_processes_entries_in_order_by_default(
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    mock_process = mocker.Mock(return_value=None)
+
+    class MockAction(BaseAction):
+        def _process(self, entry: Entry) -> None:
+            mock_process(entry)
+
+    action = MockAction()
+    entries = [Entry(id="entry1"), Entry(id="entry2")]
+
+    # act
+    action.process_batch(entries)
+
+    # assert
+    assert action.supports_batch is False
+    assert mock_process.call_args_list == [mocker.call(entry) for entry in entries]
+
+
+def test_BaseAction_process_batch_raises_ActionSkippedDueToPersistentError_when_persistent_error_exists(
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    action = ConcreteAction()
+    persistent_error = Exception("Persistent")
+    # Accessing private member for testing purposes
+    action._persistent_error = persistent_error  # noqa: SLF001
+
+    # act & assert
+    with pytest.raises(ActionSkippedDueToPersistentError):
+        action.process_batch([mocker.Mock(spec=Entry)])
+
+
+def test_BaseAction_persistent_error_set_from_one_thread_stops_calls_from_all_threads(
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    action = ConcreteAction()
+    errors = [Exception(f"Persistent {i}") for i in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(action._set_persistent_error, errors))  # noqa: SLF001
+
+    # act
+    def call() -> BaseException | None:
+        try:
+            action.process(mocker.Mock(spec=Entry))
+        except ActionSkippedDueToPersistentError as e:
+            return e.__cause__
+        return None
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        causes = list(executor.map(lambda _: call(), range(8)))
+
+    # assert
+    assert action._persistent_error in errors  # noqa: SLF001
+    assert causes == [action._persistent_error] * 8  # noqa: SLF001
+
+
+def test_BaseAction_instance_lock_is_shared_by_an_instance_and_not_by_equal_ones() -> (
+    None
+):
+    # arrange
+    action = ConcreteAction()
+    other = ConcreteAction()
+
+    # act
+    lock = action._instance_lock()  # noqa: SLF001
+
+    # assert
+    assert action == other
+    assert action._instance_lock() is lock  # noqa: SLF001
+    assert other._instance_lock() is not lock  # noqa: SLF001
@@ -0,0 +1,131 @@
+"""Tests for the MarkFeedlyEntriesAction."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic import ValidationError
+from pytest_mock import MockerFixture
+
+from feedly_entries_processor.actions.mark_feedly_entries_action import (
+    MarkFeedlyEntriesAction,
+)
+from feedly_entries_processor.exceptions import (
+    FeedlyEntriesProcessorError,
+    PartialFailureError,
+)
+from feedly_entries_processor.feedly_client import Entry
+from tests.helpers import make_entries
+
+_MODULE = "feedly_entries_processor.actions.mark_feedly_entries_action"
+
+
+@pytest.fixture
+def mock_feedly_client(mocker: MockerFixture) -> MagicMock:
+    """Fixture for mocking FeedlyClient returned by create_feedly_client."""
+    mock_client: MagicMock = MagicMock()
+    mocker.patch(f"{_MODULE}.create_feedly_client", return_value=mock_client)
+    return mock_client
+
+
+def test_MarkFeedlyEntriesAction_rejects_unknown_marker() -> None:
+    # act & assert
+    with pytest.raises(ValidationError):
+        MarkFeedlyEntriesAction.model_validate({"marker": "starred"})
+
+
+@pytest.mark.parametrize(
+    ("marker", "action"),
+    [
+        pytest.param("read", "markAsRead", id="read"),
+        pytest.param("unread", "keepUnread", id="unread"),
+        pytest.param("saved", "markAsSaved", id="saved"),
+        pytest.param("unsaved", "markAsUnsaved", id="unsaved"),
+    ],
+)
+def test_MarkFeedlyEntriesAction_flush_marks_processed_entries(
+    mock_feedly_client: MagicMock,
+    marker: str,
+    action: str,
+) -> None:
+    # arrange
+    mark = MarkFeedlyEntriesAction.model_validate({"marker": marker})
+    mark.process(Entry(id="entry_a"))
+    mark.process_batch([Entry(id="entry_b"), Entry(id="entry_a")])
+
+    # act
+    mark.flush()
+    mark.flush()
+
+    # assert
+    mock_feedly_client.mark_entries.assert_called_once_with(
+        action, ["entry_a", "entry_b"]
+    )
+
+
+def test_MarkFeedlyEntriesAction_sends_full_chunks_of_read_markers_per_page(
+    mocker: MockerFixture,
+    mock_feedly_client: MagicMock,
+) -> None:
+    # arrange
+    mocker.patch(f"{_MODULE}.MARKERS_CHUNK_SIZE", 2)
+    mark = MarkFeedlyEntriesAction(marker="read")
+
+    # act
+    mark.process_batch(make_entries(3))
+    sent_after_first_page = list(mock_feedly_client.mark_entries.call_args_list)
+    mark.process_batch(make_entries(2, start=3))
+    mark.flush()
+
+    # assert
+    assert sent_after_first_page == [mocker.call("markAsRead", ["entry_0", "entry_1"])]
+    assert mock_feedly_client.mark_entries.call_args_list == [
+        mocker.call("markAsRead", ["entry_0", "entry_1"]),
+        mocker.call("markAsRead", ["entry_2", "entry_3"]),
+        mocker.call("markAsRead", ["entry_4"]),
+    ]
+
+
+def test_MarkFeedlyEntriesAction_defers_saved_markers_until_flush(
+    mocker: MockerFixture,
+    mock_feedly_client: MagicMock,
+) -> None:
+    # arrange
+    mocker.patch(f"{_MODULE}.MARKERS_CHUNK_SIZE", 2)
+    mark = MarkFeedlyEntriesAction(marker="unsaved")
+
+    # act
+    mark.process_batch(make_entries(5))
+
+    # assert
+    mock_feedly_client.mark_entries.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "marker",
+    [
+        pytest.param("read", id="sent_at_page_boundary"),
+        pytest.param("saved", id="sent_on_flush"),
+    ],
+)
+def test_MarkFeedlyEntriesAction_flush_reports_entries_of_a_failed_chunk(
+    mocker: MockerFixture,
+    mock_feedly_client: MagicMock,
+    marker: str,
+) -> None:
+    # arrange
+    mocker.patch(f"{_MODULE}.MARKERS_CHUNK_SIZE", 1)
+    mock_feedly_client.mark_entries.side_effect = [
+        FeedlyEntriesProcessorError("failed"),
+        None,
+    ]
+    mark = MarkFeedlyEntriesAction.model_validate({"marker": marker})
+    mark.process_batch(make_entries(2))
+
+    # act
+    with pytest.raises(PartialFailureError) as exc_info:
+        mark.flush()
+
+    # assert
+    assert mark.completes_on_flush
+    assert mock_feedly_client.mark_entries.call_count == 2
+    assert set(exc_info.value.errors) == {"entry_0"}
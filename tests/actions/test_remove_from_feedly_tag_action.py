@@ -11,6 +11,10 @@ from pytest_mock import MockerFixture
 from feedly_entries_processor.actions.remove_from_feedly_tag_action import (
     RemoveFromFeedlyTagAction,
 )
+from feedly_entries_processor.exceptions import (
+    FeedlyEntriesProcessorError,
+    PartialFailureError,
+)
 from feedly_entries_processor.feedly_client import Entry, Origin, Summary
 
 
@@ -71,7 +75,7 @@ def test_RemoveFromFeedlyTagAction_rejects_invalid_tag(tag: str) -> None:
         pytest.param("tech", "entry_789", id="custom_tag"),
     ],
 )
-def test_RemoveFromFeedlyTagAction_process_calls_remove_entry_from_tag_with_tag_and_entry_id(
+def test_RemoveFromFeedlyTagAction_flush_removes_processed_entries_from_tag(
     mock_feedly_client: MagicMock,
     entry_builder: Callable[..., Entry],
     tag: str,
@@ -83,9 +87,81 @@ def test_RemoveFromFeedlyTagAction_process_calls_remove_entry_from_tag_with_tag_
 
     # act
     action.process(entry)
+    action.flush()
+
+    # assert
+    mock_feedly_client.remove_entries_from_tag.assert_called_once_with(tag, [entry_id])
+
+
+def test_RemoveFromFeedlyTagAction_defers_removal_until_flush(
+    mock_feedly_client: MagicMock,
+    entry_builder: Callable[..., Entry],
+) -> None:
+    # arrange
+    action = RemoveFromFeedlyTagAction(tag="global.saved")
+
+    # act
+    action.process(entry_builder())
+    action.process_batch([entry_builder(entry_id="entry_def")])
+
+    # assert
+    mock_feedly_client.remove_entries_from_tag.assert_not_called()
+
+
+def test_RemoveFromFeedlyTagAction_flush_removes_entries_in_chunks(
+    mocker: MockerFixture,
+    mock_feedly_client: MagicMock,
+    entry_builder: Callable[..., Entry],
+) -> None:
+    # arrange
+    mocker.patch(
+        "feedly_entries_processor.actions.remove_from_feedly_tag_action.UNTAG_CHUNK_SIZE",
+        2,
+    )
+    action = RemoveFromFeedlyTagAction(tag="global.saved")
+    entry_ids = [f"entry_{i}" for i in range(5)]
+    action.process_batch([entry_builder(entry_id=entry_id) for entry_id in entry_ids])
+    action.process(entry_builder(entry_id="entry_0"))
+
+    # act
+    action.flush()
+    action.flush()
+
+    # assert
+    assert mock_feedly_client.remove_entries_from_tag.call_args_list == [
+        mocker.call("global.saved", ["entry_0", "entry_1"]),
+        mocker.call("global.saved", ["entry_2", "entry_3"]),
+        mocker.call("global.saved", ["entry_4"]),
+    ]
+
+
+def test_RemoveFromFeedlyTagAction_flush_reports_entries_of_a_failed_chunk(
+    mocker: MockerFixture,
+    mock_feedly_client: MagicMock,
+    entry_builder: Callable[..., Entry],
+) -> None:
+    # arrange
+    mocker.patch(
+        "feedly_entries_processor.actions.remove_from_feedly_tag_action.UNTAG_CHUNK_SIZE",
+        1,
+    )
+    mock_feedly_client.remove_entries_from_tag.side_effect = [
+        FeedlyEntriesProcessorError("failed"),
+        None,
+    ]
+    action = RemoveFromFeedlyTagAction(tag="global.saved")
+    action.process_batch(
+        [entry_builder(entry_id="entry_1"), entry_builder(entry_id="entry_2")]
+    )
+
+    # act
+    with pytest.raises(PartialFailureError) as exc_info:
+        action.flush()
 
     # assert
-    mock_feedly_client.remove_entry_from_tag.assert_called_once_with(tag, entry_id)
+    assert mock_feedly_client.remove_entries_from_tag.call_count == 2
+    assert set(exc_info.value.errors) == {"entry_1"}
+    assert action.completes_on_flush
 
 
 def test_RemoveFromFeedlyTagAction_uses_create_feedly_client(
@@ -104,6 +180,7 @@ def test_RemoveFromFeedlyTagAction_uses_create_feedly_client(
 
     # act
     action.process(entry)
+    action.flush()
 
     # assert
     create_feedly_client.assert_called_once()
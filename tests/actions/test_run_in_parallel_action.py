@@ -0,0 +1,187 @@
+"""Tests for the RunInParallelAction."""
+
+import threading
+import time
+from collections.abc import Callable
+
+import pytest
+from pydantic import ValidationError
+from pytest_mock import MockerFixture
+
+from feedly_entries_processor.actions import LogAction, RunInParallelAction
+from feedly_entries_processor.actions.run_in_parallel_action import PARALLEL_ENTRIES
+from feedly_entries_processor.exceptions import ActionSkippedDueToPersistentError
+from feedly_entries_processor.feedly_client import Entry, Origin, Summary
+
+
+@pytest.fixture
+def entry_builder() -> Callable[..., Entry]:
+    """Fixture for a builder function to create Entry objects."""
+
+    def _builder(
+        entry_id: str = "entry_abc",
+        title: str = "Test Entry",
+    ) -> Entry:
+        return Entry(
+            id=entry_id,
+            title=title,
+            canonical_url="http://example.com/test",
+            origin=Origin(
+                title="Test Origin",
+                html_url="http://example.com",
+                stream_id="test_stream_id",
+            ),
+            summary=Summary(content="Summary"),
+            published=1234567890,
+            author=None,
+        )
+
+    return _builder
+
+
+def test_RunInParallelAction_process_runs_actions_concurrently(
+    entry_builder: Callable[..., Entry],
+    mocker: MockerFixture,
+) -> None:
+    # arrange: every action waits until all of them are running
+    actions = (LogAction(), LogAction(), LogAction())
+    barrier = threading.Barrier(len(actions), timeout=5)
+    processed: list[Entry] = []
+
+    def track(_self: LogAction, entry: Entry) -> None:
+        barrier.wait()
+        processed.append(entry)
+
+    mocker.patch.object(LogAction, "process", side_effect=track, autospec=True)
+    parallel = RunInParallelAction(actions=actions)
+    entry = entry_builder()
+
+    # act
+    parallel.process(entry)
+
+    # assert
+    assert processed == [entry] * len(actions)
+
+
+def test_RunInParallelAction_collect_all_runs_every_action_and_raises_ExceptionGroup(
+    entry_builder: Callable[..., Entry],
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    first_error = ValueError("first")
+    second_error = RuntimeError("second")
+    mock_process = mocker.patch.object(
+        LogAction,
+        "process",
+        side_effect=[first_error, None, second_error],
+    )
+    parallel = RunInParallelAction(
+        actions=(LogAction(), LogAction(), LogAction()),
+        on_error="collect_all",
+    )
+
+    # act & assert
+    with pytest.raises(ExceptionGroup) as exc_info:
+        parallel.process(entry_builder())
+
+    assert mock_process.call_count == 3
+    assert set(exc_info.value.exceptions) == {first_error, second_error}
+
+
+def test_RunInParallelAction_collect_all_raises_a_single_error_unwrapped(
+    entry_builder: Callable[..., Entry],
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    error = ActionSkippedDueToPersistentError("skipped")
+    mocker.patch.object(LogAction, "process", side_effect=[None, error])
+    parallel = RunInParallelAction(actions=(LogAction(), LogAction()))
+
+    # act & assert
+    with pytest.raises(ActionSkippedDueToPersistentError):
+        parallel.process(entry_builder())
+
+
+def test_RunInParallelAction_fail_fast_raises_first_error_once_running_actions_finish(
+    entry_builder: Callable[..., Entry],
+    mocker: MockerFixture,
+) -> None:
+    # arrange: the slow action is still running when the other one fails
+    error = ValueError("fast failure")
+    finished: list[LogAction] = []
+    slow, failing = LogAction(level="debug"), LogAction(level="error")
+
+    def run(self: LogAction, _entry: Entry) -> None:
+        if self is failing:
+            raise error
+        time.sleep(0.1)
+        finished.append(self)
+
+    mocker.patch.object(LogAction, "process", side_effect=run, autospec=True)
+    parallel = RunInParallelAction(actions=(slow, failing), on_error="fail_fast")
+
+    # act
+    with pytest.raises(ValueError, match="fast failure"):
+        parallel.process(entry_builder())
+
+    # assert
+    assert finished == [slow]
+
+
+def test_RunInParallelAction_shares_threads_across_entries_until_flush(
+    entry_builder: Callable[..., Entry],
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    threads: set[str] = set()
+
+    def run(_self: LogAction, _entry: Entry) -> None:
+        threads.add(threading.current_thread().name)
+
+    mocker.patch.object(LogAction, "process", side_effect=run, autospec=True)
+    parallel = RunInParallelAction(actions=(LogAction(), LogAction()))
+
+    # act
+    for index in range(20):
+        parallel.process(entry_builder(entry_id=f"entry_{index}"))
+    parallel.flush()
+
+    # assert
+    assert len(threads) <= 2 * PARALLEL_ENTRIES
+    assert "_executor" not in parallel.__dict__
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        pytest.param({"actions": []}, id="empty_actions"),
+        pytest.param(
+            {"actions": [{"name": "log"}], "on_error": "ignore"},
+            id="invalid_on_error",
+        ),
+    ],
+)
+def test_RunInParallelAction_rejects_invalid_config(config: dict[str, object]) -> None:
+    # act & assert
+    with pytest.raises(ValidationError):
+        RunInParallelAction.model_validate(config)
+
+
+def test_RunInParallelAction_flush_flushes_each_action(
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    flushed: list[LogAction] = []
+
+    def track(self: LogAction) -> None:
+        flushed.append(self)
+
+    mocker.patch.object(LogAction, "flush", side_effect=track, autospec=True)
+    actions = (LogAction(), LogAction())
+    parallel = RunInParallelAction(actions=actions)
+
+    # act
+    parallel.flush()
+
+    # assert
+    assert flushed == list(actions)
@@ -108,3 +108,23 @@ def test_RunInSequenceAction_rejects_empty_actions() -> None:
     # act & assert
     with pytest.raises(ValidationError):
         RunInSequenceAction(actions=())
+
+
+def test_RunInSequenceAction_flush_flushes_each_action_in_order(
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    call_order: list[LogAction] = []
+
+    def track(self: LogAction) -> None:
+        call_order.append(self)
+
+    mocker.patch.object(LogAction, "flush", side_effect=track, autospec=True)
+    actions = (LogAction(), LogAction())
+    sequence = RunInSequenceAction(actions=actions)
+
+    # act
+    sequence.flush()
+
+    # assert
+    assert call_order == list(actions)
@@ -0,0 +1,210 @@
+"""Tests for the WebhookAction."""
+
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+from pytest_mock import MockerFixture
+
+from feedly_entries_processor.actions.webhook_action import (
+    MAX_RETRY_AFTER,
+    WebhookAction,
+    retry_after,
+)
+from feedly_entries_processor.exceptions import PartialFailureError
+from tests.helpers import make_entries
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Local HTTP server recording the bodies posted to it."""
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.lock = threading.Lock()
+        self.bodies: list[dict[str, Any]] = []
+        self.headers: list[dict[str, str]] = []
+        # Statuses to answer with, in order, before answering 200.
+        self.statuses: list[tuple[int, dict[str, str]]] = []
+
+    @property
+    def url(self) -> str:
+        """Return the URL requests are posted to."""
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}/hook"
+
+    def received_ids(self) -> list[str]:
+        """Return the ids of the entries received, sorted."""
+        with self.lock:
+            return sorted(
+                entry["id"] for body in self.bodies for entry in body["entries"]
+            )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StandInServer
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        with self.server.lock:
+            status, headers = (
+                self.server.statuses.pop(0) if self.server.statuses else (200, {})
+            )
+            if status == 200:
+                self.server.bodies.append(json.loads(body))
+                self.server.headers.append(dict(self.headers))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ANN401
+        """Keep the test output quiet."""
+
+
+@pytest.fixture
+def server() -> Iterator[StandInServer]:
+    """Fixture for a stand-in HTTP server running in a thread."""
+    server = StandInServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_WebhookAction_posts_entries_in_batches(server: StandInServer) -> None:
+    # arrange
+    action = WebhookAction.model_validate(
+        {
+            "url": server.url,
+            "batch_size": 2,
+            "headers": {"Authorization": "Bearer secret"},
+        }
+    )
+
+    # act
+    action.process_batch(make_entries(5, fields=("title",)))
+    action.flush()
+
+    # assert
+    assert sorted(len(body["entries"]) for body in server.bodies) == [1, 2, 2]
+    assert server.received_ids() == [entry.id for entry in make_entries(5)]
+    assert {"id": "entry_0", "title": "Title 0"} in [
+        entry for body in server.bodies for entry in body["entries"]
+    ]
+    assert all(h["Authorization"] == "Bearer secret" for h in server.headers)
+    assert all(h["Content-Type"] == "application/json" for h in server.headers)
+
+
+def test_WebhookAction_holds_small_batches_until_flush(server: StandInServer) -> None:
+    # arrange
+    action = WebhookAction(url=server.url, batch_size=10, max_batch_age=60)
+
+    # act
+    action.process_batch(make_entries(3))
+    posted_before_flush = len(server.bodies)
+    action.flush()
+
+    # assert
+    assert posted_before_flush == 0
+    assert server.received_ids() == [entry.id for entry in make_entries(3)]
+
+
+def test_WebhookAction_sends_batches_older_than_max_batch_age(
+    server: StandInServer,
+) -> None:
+    # arrange
+    action = WebhookAction(url=server.url, batch_size=10, max_batch_age=0)
+
+    # act
+    action.process_batch(make_entries(1))
+    action.flush()
+    action.flush()
+
+    # assert
+    assert len(server.bodies) == 1
+
+
+def test_WebhookAction_retries_honouring_retry_after(server: StandInServer) -> None:
+    # arrange
+    server.statuses = [(429, {"Retry-After": "0"}), (503, {"Retry-After": "0"})]
+    action = WebhookAction(url=server.url)
+
+    # act
+    action.process_batch(make_entries(2))
+    action.flush()
+
+    # assert
+    assert server.received_ids() == ["entry_0", "entry_1"]
+
+
+def test_WebhookAction_flush_reports_batch_rejected_by_server(
+    server: StandInServer,
+) -> None:
+    # arrange
+    server.statuses = [(400, {})]
+    action = WebhookAction(url=server.url, batch_size=2, concurrency=1)
+
+    # act
+    action.process_batch(make_entries(3))
+    with pytest.raises(PartialFailureError) as exc_info:
+        action.flush()
+
+    # assert
+    assert action.completes_on_flush
+    assert len(server.bodies) == 1
+    assert set(exc_info.value.errors) == {"entry_0", "entry_1"}
+
+
+def test_WebhookAction_flush_closes_the_pool_and_reopens_it_on_demand(
+    server: StandInServer,
+) -> None:
+    # arrange
+    action = WebhookAction(url=server.url)
+    action.process_batch(make_entries(1))
+
+    # act
+    action.flush()
+    closed = "_executor" not in action.__dict__ and "_session" not in action.__dict__
+    action.process_batch(make_entries(2))
+    action.flush()
+
+    # assert
+    assert closed
+    assert server.received_ids() == ["entry_0", "entry_0", "entry_1"]
+
+
+def test_WebhookAction_rejects_invalid_url() -> None:
+    # act & assert
+    with pytest.raises(ValidationError):
+        WebhookAction.model_validate({"url": "not a url"})
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        pytest.param(None, None, id="missing"),
+        pytest.param("3", 3.0, id="seconds"),
+        pytest.param("-1", 0.0, id="negative"),
+        pytest.param("86400", MAX_RETRY_AFTER, id="capped"),
+        pytest.param("Wed, 21 Oct 2015 07:28:00 GMT", 0.0, id="past_date"),
+        pytest.param("soon", None, id="invalid"),
+    ],
+)
+def test_retry_after_parses_header(
+    mocker: MockerFixture, value: str | None, expected: float | None
+) -> None:
+    # arrange
+    response = mocker.Mock(headers={"Retry-After": value} if value else {})
+
+    # act
+    result = retry_after(response)
+
+    # assert
+    assert result == expected
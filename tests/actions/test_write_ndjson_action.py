@@ -0,0 +1,195 @@
+"""Tests for the WriteNdjsonAction."""
+
+import gzip
+import json
+import os
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from feedly_entries_processor.actions.write_ndjson_action import WriteNdjsonAction
+from tests.helpers import FakeClock, make_entries
+
+_MODULE = "feedly_entries_processor.actions.write_ndjson_action"
+
+
+@pytest.fixture
+def clock(mocker: MockerFixture) -> FakeClock:
+    """Fixture for a fake clock used by the action."""
+    clock = FakeClock()
+    clock.now = 1_000_000.0
+    mocker.patch(f"{_MODULE}._clock", clock)
+    return clock
+
+
+def read_ids(path: Path) -> list[str]:
+    opener = gzip.open if path.name.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as file:
+        return [json.loads(line)["id"] for line in file]
+
+
+def test_WriteNdjsonAction_writes_entries_as_json_lines(tmp_path: Path) -> None:
+    # arrange
+    path = tmp_path / "out" / "entries.ndjson"
+    action = WriteNdjsonAction(path=path)
+
+    # act
+    action.process_batch(make_entries(2, fields=("title", "summary", "url")))
+    action.process(make_entries(1, start=2, fields=("title", "summary", "url"))[0])
+    action.flush()
+
+    # assert
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [
+        "entry_0",
+        "entry_1",
+        "entry_2",
+    ]
+    assert json.loads(lines[0]) == {
+        "id": "entry_0",
+        "title": "Title 0",
+        "canonicalUrl": "https://example.com/0",
+        "summary": {"content": "Summary"},
+    }
+
+
+def test_WriteNdjsonAction_flushes_buffer_at_page_boundaries(tmp_path: Path) -> None:
+    # arrange
+    path = tmp_path / "entries.ndjson"
+    action = WriteNdjsonAction(path=path)
+
+    # act
+    action.process_batch(make_entries(3, fields=("title", "summary", "url")))
+
+    # assert
+    assert read_ids(path) == ["entry_0", "entry_1", "entry_2"]
+    action.flush()
+
+
+def test_WriteNdjsonAction_appends_gzip_members_across_runs(tmp_path: Path) -> None:
+    # arrange
+    path = tmp_path / "entries.ndjson.gz"
+    first = WriteNdjsonAction(path=path, compression="gzip")
+    first.process_batch(make_entries(2, fields=("title", "summary", "url")))
+    first.flush()
+    second = WriteNdjsonAction(path=path, compression="gzip")
+
+    # act
+    second.process_batch(make_entries(1, start=2, fields=("title", "summary", "url")))
+    second.flush()
+
+    # assert
+    assert read_ids(path) == ["entry_0", "entry_1", "entry_2"]
+
+
+def test_WriteNdjsonAction_process_flushes_each_entry(tmp_path: Path) -> None:
+    # arrange
+    path = tmp_path / "entries.ndjson"
+    action = WriteNdjsonAction(path=path)
+
+    # act
+    action.process(make_entries(1, fields=("title", "summary", "url"))[0])
+
+    # assert
+    assert read_ids(path) == ["entry_0"]
+    action.flush()
+
+
+def test_WriteNdjsonAction_gzip_keeps_compressing_across_pages(tmp_path: Path) -> None:
+    # arrange
+    paged = tmp_path / "paged.ndjson.gz"
+    single = tmp_path / "single.ndjson.gz"
+    entries = make_entries(200, fields=("title", "summary", "url"))
+
+    # act
+    action = WriteNdjsonAction(path=paged, compression="gzip")
+    for page in range(0, 200, 10):
+        action.process_batch(entries[page : page + 10])
+    action.flush()
+    action = WriteNdjsonAction(path=single, compression="gzip")
+    action.process_batch(entries)
+    action.flush()
+
+    # assert
+    assert read_ids(paged) == read_ids(single)
+    assert paged.stat().st_size == single.stat().st_size
+
+
+@pytest.mark.usefixtures("clock")
+def test_WriteNdjsonAction_rotates_when_file_reaches_max_bytes(tmp_path: Path) -> None:
+    # arrange
+    path = tmp_path / "entries.ndjson"
+    action = WriteNdjsonAction(path=path, max_bytes=1)
+
+    # act
+    action.process_batch(make_entries(2, fields=("title", "summary", "url")))
+    action.process_batch(make_entries(1, start=2, fields=("title", "summary", "url")))
+    action.flush()
+
+    # assert
+    rotated = sorted(p for p in tmp_path.iterdir() if p != path)
+    assert [p.name for p in rotated] == [
+        "entries.19700112T134640Z-1.ndjson",
+        "entries.19700112T134640Z.ndjson",
+    ]
+    assert read_ids(rotated[1]) == ["entry_0", "entry_1"]
+    assert read_ids(rotated[0]) == ["entry_2"]
+    assert not path.exists()
+
+
+@pytest.mark.usefixtures("clock")
+def test_WriteNdjsonAction_process_rotates_when_file_reaches_max_bytes(
+    tmp_path: Path,
+) -> None:
+    # arrange
+    path = tmp_path / "entries.ndjson"
+    action = WriteNdjsonAction(path=path, max_bytes=1)
+
+    # act
+    for entry in make_entries(2, fields=("title", "summary", "url")):
+        action.process(entry)
+    action.flush()
+
+    # assert
+    rotated = sorted(p for p in tmp_path.iterdir() if p != path)
+    assert [read_ids(p) for p in rotated] == [["entry_1"], ["entry_0"]]
+
+
+def test_WriteNdjsonAction_rotates_when_a_new_interval_starts(
+    tmp_path: Path, clock: FakeClock
+) -> None:
+    # arrange
+    path = tmp_path / "entries.ndjson"
+    action = WriteNdjsonAction(path=path, rotate_interval=3600)
+    action.process_batch(make_entries(1, fields=("title", "summary", "url")))
+
+    # act
+    clock.now += 3600
+    action.process_batch(make_entries(1, start=1, fields=("title", "summary", "url")))
+    action.flush()
+
+    # assert
+    (rotated,) = (p for p in tmp_path.iterdir() if p != path)
+    assert read_ids(rotated) == ["entry_0"]
+    assert read_ids(path) == ["entry_1"]
+
+
+def test_WriteNdjsonAction_rotates_file_last_written_in_an_earlier_interval(
+    tmp_path: Path, clock: FakeClock
+) -> None:
+    # arrange
+    path = tmp_path / "entries.ndjson"
+    path.write_text('{"id": "old"}\n', encoding="utf-8")
+    earlier = clock.now - 3600
+    os.utime(path, (earlier, earlier))
+    action = WriteNdjsonAction(path=path, rotate_interval=3600)
+
+    # act
+    action.process_batch(make_entries(1, fields=("title", "summary", "url")))
+    action.flush()
+
+    # assert
+    (rotated,) = (p for p in tmp_path.iterdir() if p != path)
+    assert read_ids(rotated) == ["old"]
+    assert read_ids(path) == ["entry_0"]
@@ -23,3 +23,16 @@ def test_MatchAllCondition_can_be_instantiated() -> None:
     # assert
     assert isinstance(condition, MatchAllCondition)
     assert condition.name == "match_all"
+
+
+def test_MatchAllCondition_matches_batch_returns_true_for_every_entry() -> None:
+    # arrange
+    entries = [Entry(id="entry1"), Entry(id="entry2")]
+    condition = MatchAllCondition()
+
+    # act
+    result = condition.matches_batch(entries)
+
+    # assert
+    assert result == [True, True]
+    assert all(condition.compile()(entry) for entry in entries)
@@ -2,95 +2,99 @@
 
 from __future__ import annotations
 
-from typing import Any
+import time
+from typing import TYPE_CHECKING, Any
 
 import pytest
 from pydantic import ValidationError
 
 from feedly_entries_processor.conditions import RegexPartialMatchCondition
+from feedly_entries_processor.exceptions import ConditionTimeBudgetExceededError
 from feedly_entries_processor.feedly_client import Entry, Summary
 
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
 
-@pytest.mark.parametrize(
-    ("entry", "fields", "patterns", "expected"),
-    [
-        pytest.param(
-            Entry(id="1", title="Hello World", author="Alice"),
-            ["title"],
-            ["Hello"],
-            True,
-            id="match_title_single_pattern",
-        ),
-        pytest.param(
-            Entry(id="1", title="Hello World", author="Alice"),
-            ["title"],
-            ["foo", "World"],
-            True,
-            id="match_title_multiple_patterns",
-        ),
-        pytest.param(
-            Entry(id="1", title="Hello World", author="Alice"),
-            ["author"],
-            ["Alice"],
-            True,
-            id="match_author",
-        ),
-        pytest.param(
-            Entry(
-                id="1",
-                title="Hello World",
-                author="Alice",
-                summary=Summary(content="This is content"),
-            ),
-            ["summary_contents"],
-            ["content"],
-            True,
-            id="match_summary_contents",
-        ),
-        pytest.param(
-            Entry(id="1", title="Hello World", author="Alice"),
-            ["title", "author"],
-            ["Alice"],
-            True,
-            id="match_multiple_fields",
-        ),
-        pytest.param(
-            Entry(id="1", title="Hello World", author="Alice"),
-            ["title"],
-            ["(?i)hello"],
-            True,
-            id="match_case_insensitive_inline_flag",
-        ),
-        pytest.param(
-            Entry(id="1", title="Hello World", author="Alice"),
-            ["title"],
-            ["^Hello$"],
-            False,
-            id="no_match_full_match_required_by_regex",
-        ),
-        pytest.param(
-            Entry(id="1", title="Hello World", author="Alice"),
-            ["title"],
-            ["foo"],
-            False,
-            id="no_match_wrong_pattern",
-        ),
-        pytest.param(
-            Entry(id="1", title=None, author="Alice"),
-            ["title"],
-            ["foo"],
-            False,
-            id="no_match_field_is_none",
-        ),
-        pytest.param(
-            Entry(id="1", title="Hello World", summary=None),
-            ["summary_contents"],
-            ["foo"],
-            False,
-            id="no_match_summary_is_none",
-        ),
-    ],
-)
+_MATCH_CASES = [
+    pytest.param(
+        Entry(id="1", title="Hello World", author="Alice"),
+        ["title"],
+        ["Hello"],
+        True,
+        id="match_title_single_pattern",
+    ),
+    pytest.param(
+        Entry(id="1", title="Hello World", author="Alice"),
+        ["title"],
+        ["foo", "World"],
+        True,
+        id="match_title_multiple_patterns",
+    ),
+    pytest.param(
+        Entry(id="1", title="Hello World", author="Alice"),
+        ["author"],
+        ["Alice"],
+        True,
+        id="match_author",
+    ),
+    pytest.param(
+        Entry(
+            id="1",
+            title="Hello World",
+            author="Alice",
+            summary=Summary(content="This is content"),
+        ),
+        ["summary_contents"],
+        ["content"],
+        True,
+        id="match_summary_contents",
+    ),
+    pytest.param(
+        Entry(id="1", title="Hello World", author="Alice"),
+        ["title", "author"],
+        ["Alice"],
+        True,
+        id="match_multiple_fields",
+    ),
+    pytest.param(
+        Entry(id="1", title="Hello World", author="Alice"),
+        ["title"],
+        ["(?i)hello"],
+        True,
+        id="match_case_insensitive_inline_flag",
+    ),
+    pytest.param(
+        Entry(id="1", title="Hello World", author="Alice"),
+        ["title"],
+        ["^Hello$"],
+        False,
+        id="no_match_full_match_required_by_regex",
+    ),
+    pytest.param(
+        Entry(id="1", title="Hello World", author="Alice"),
+        ["title"],
+        ["foo"],
+        False,
+        id="no_match_wrong_pattern",
+    ),
+    pytest.param(
+        Entry(id="1", title=None, author="Alice"),
+        ["title"],
+        ["foo"],
+        False,
+        id="no_match_field_is_none",
+    ),
+    pytest.param(
+        Entry(id="1", title="Hello World", summary=None),
+        ["summary_contents"],
+        ["foo"],
+        False,
+        id="no_match_summary_is_none",
+    ),
+]
+
+
+@pytest.mark.parametrize(("entry", "fields", "patterns", "expected"), _MATCH_CASES)
 def test_RegexPartialMatchCondition_matches_returns_expected(
     entry: Entry,
     fields: list[str],
@@ -111,6 +115,77 @@ def test_RegexPartialMatchCondition_matches_returns_expected(
     assert result is expected
 
 
+@pytest.mark.parametrize(("entry", "fields", "patterns", "expected"), _MATCH_CASES)
+def test_RegexPartialMatchCondition_compiled_predicates_agree_with_matches(
+    entry: Entry,
+    fields: list[str],
+    patterns: list[str],
+    expected: bool,
+) -> None:
+    # arrange
+    condition = RegexPartialMatchCondition(fields=fields, patterns=patterns)
+
+    # act
+    compiled_result = condition.compile()(entry)
+    batch_result = condition.compile_batch()([entry, entry])
+
+    # assert
+    assert compiled_result is condition.matches(entry) is expected
+    assert batch_result == [expected, expected]
+
+
+def test_RegexPartialMatchCondition_warns_about_backtracking_pattern(
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    mock_logger_warning = mocker.patch(
+        "feedly_entries_processor.conditions.regex_partial_match_condition.logger.warning"
+    )
+
+    # act
+    RegexPartialMatchCondition(fields=("title",), patterns=("safe", r"(\w+\s?)*$"))
+
+    # assert
+    mock_logger_warning.assert_called_once()
+    assert repr(r"(\w+\s?)*$") in mock_logger_warning.call_args.args[0]
+
+
+@pytest.mark.parametrize(
+    "patterns",
+    [
+        pytest.param((r"(a|aa)+$",), id="single_pattern"),
+        pytest.param(("foo", r"(a|aa)+$"), id="multiple_patterns"),
+    ],
+)
+@pytest.mark.parametrize(
+    "compiled",
+    [
+        pytest.param(True, id="compile"),
+        pytest.param(False, id="matches"),
+    ],
+)
+def test_RegexPartialMatchCondition_stops_search_over_match_time_budget(
+    *,
+    patterns: tuple[str, ...],
+    compiled: bool,
+) -> None:
+    # arrange
+    condition = RegexPartialMatchCondition(
+        fields=("title",),
+        patterns=patterns,
+        match_time_budget=0.05,
+    )
+    predicate = condition.compile() if compiled else condition.matches
+    # Backtracks for far longer than the budget if not interrupted.
+    entry = Entry(id="slow", title="a" * 40 + "b")
+    start = time.perf_counter()
+
+    # act & assert
+    with pytest.raises(ConditionTimeBudgetExceededError, match="over the budget"):
+        predicate(entry)
+    assert time.perf_counter() - start < 1.0
+
+
 def test_RegexPartialMatchCondition_can_be_instantiated() -> None:
     # arrange & act
     condition = RegexPartialMatchCondition.model_validate(
@@ -161,6 +236,15 @@ def test_RegexPartialMatchCondition_can_be_instantiated() -> None:
             },
             id="invalid_regex_pattern",
         ),
+        pytest.param(
+            {
+                "name": "regex_partial_match",
+                "fields": ["title"],
+                "patterns": ["p1"],
+                "match_time_budget": 0,
+            },
+            id="non_positive_match_time_budget",
+        ),
     ],
 )
 def test_RegexPartialMatchCondition_raises_ValidationError_for_invalid_config(
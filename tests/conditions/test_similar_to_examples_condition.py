@@ -0,0 +1,111 @@
+"""Tests for the SimilarToExamplesCondition."""
+
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+from pytest_mock import MockerFixture
+
+from feedly_entries_processor.conditions import SimilarToExamplesCondition
+from feedly_entries_processor.feedly_client import Entry, Summary
+
+EXAMPLES = (
+    "Rust compiler release improves borrow checker diagnostics",
+    "New Rust release speeds up the compiler and cargo builds",
+)
+
+
+@pytest.fixture(autouse=True)
+def model_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Fixture caching models in a temporary directory."""
+    monkeypatch.setenv("MODEL_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_SimilarToExamplesCondition_matches_entries_similar_to_examples() -> None:
+    # arrange
+    condition = SimilarToExamplesCondition(examples=EXAMPLES, threshold=0.2)
+    entries = [
+        Entry(
+            id="similar",
+            title="Rust 1.90 released",
+            summary=Summary(content="<p>The compiler gets faster builds.</p>"),
+        ),
+        Entry(id="unrelated", title="Spring gardening tips"),
+        Entry(id="empty"),
+    ]
+
+    # act
+    result = condition.matches_batch(entries)
+
+    # assert
+    assert result == [True, False, False]
+    assert [condition.compile()(entry) for entry in entries] == result
+    assert [condition.matches(entry) for entry in entries] == result
+
+
+def test_SimilarToExamplesCondition_scores_only_given_fields() -> None:
+    # arrange
+    condition = SimilarToExamplesCondition(
+        examples=EXAMPLES, fields=("title",), threshold=0.3
+    )
+    entry = Entry(
+        id="1",
+        title="Spring gardening tips",
+        summary=Summary(content="Rust compiler release"),
+    )
+
+    # act
+    result = condition.matches(entry)
+
+    # assert
+    assert result is False
+
+
+def test_SimilarToExamplesCondition_caches_model_when_compiled_not_when_loaded(
+    model_cache_dir: Path,
+) -> None:
+    # arrange
+    condition = SimilarToExamplesCondition.model_validate(
+        {"name": "similar_to_examples", "examples": list(EXAMPLES)}
+    )
+    cached_after_validation = list(model_cache_dir.glob("tfidf-*.json"))
+
+    # act
+    condition.compile_batch()
+
+    # assert
+    assert cached_after_validation == []
+    assert len(list(model_cache_dir.glob("tfidf-*.json"))) == 1
+
+
+def test_SimilarToExamplesCondition_matches_reuses_compiled_predicate(
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    condition = SimilarToExamplesCondition(examples=EXAMPLES)
+    compile_batch = mocker.spy(SimilarToExamplesCondition, "compile_batch")
+
+    # act
+    condition.matches(Entry(id="1", title="Rust release"))
+    condition.matches(Entry(id="2", title="Spring gardening tips"))
+    condition.matches_batch([Entry(id="3")])
+
+    # assert
+    compile_batch.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        pytest.param({"examples": []}, id="no_examples"),
+        pytest.param({"examples": ["a"], "threshold": 0}, id="zero_threshold"),
+        pytest.param({"examples": ["a"], "threshold": 1.5}, id="threshold_over_one"),
+    ],
+)
+def test_SimilarToExamplesCondition_rejects_invalid_parameters(
+    data: dict[str, object],
+) -> None:
+    # act & assert
+    with pytest.raises(ValidationError):
+        SimilarToExamplesCondition.model_validate(data)
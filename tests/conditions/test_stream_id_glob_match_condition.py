@@ -0,0 +1,114 @@
+"""Tests for the StreamIdGlobMatchCondition."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from feedly_entries_processor.conditions import StreamIdGlobMatchCondition
+from feedly_entries_processor.feedly_client import Entry, Origin
+
+
+def _entry(stream_id: str | None) -> Entry:
+    return Entry(
+        id="entry",
+        origin=Origin(html_url="http://example.com", stream_id=stream_id, title="Feed")
+        if stream_id is not None
+        else None,
+    )
+
+
+_MATCH_CASES = [
+    pytest.param(
+        "feed/https://example.com/rss",
+        frozenset({"feed/https://example.com/*"}),
+        True,
+        id="prefix",
+    ),
+    pytest.param(
+        "feed/https://blog.example.com/atom.xml",
+        frozenset({"feed/https://*.example.com/*.xml"}),
+        True,
+        id="glob",
+    ),
+    pytest.param(
+        "feed/https://example.com/rss",
+        frozenset({"feed/https://example.com/rss"}),
+        True,
+        id="exact",
+    ),
+    pytest.param(
+        "feed/https://example.com/rss2",
+        frozenset({"feed/https://example.com/rss"}),
+        False,
+        id="exact_requires_full_match",
+    ),
+    pytest.param(
+        "feed/https://example.org/rss",
+        frozenset({"feed/https://example.com/*", "feed/*.net/*"}),
+        False,
+        id="no_pattern_matches",
+    ),
+    pytest.param(
+        "feed/https://example.com/a.b",
+        frozenset({"feed/https://example.com/a?b"}),
+        False,
+        id="only_star_is_special",
+    ),
+    pytest.param(None, frozenset({"*"}), False, id="no_origin"),
+]
+
+
+@pytest.mark.parametrize(("stream_id", "patterns", "expected"), _MATCH_CASES)
+def test_StreamIdGlobMatchCondition_matches_returns_expected(
+    stream_id: str | None,
+    patterns: frozenset[str],
+    expected: bool,
+) -> None:
+    # arrange
+    condition = StreamIdGlobMatchCondition(patterns=patterns)
+
+    # act
+    result = condition.matches(_entry(stream_id))
+
+    # assert
+    assert result is expected
+
+
+@pytest.mark.parametrize(("stream_id", "patterns", "expected"), _MATCH_CASES)
+def test_StreamIdGlobMatchCondition_compiled_predicates_agree_with_matches(
+    stream_id: str | None,
+    patterns: frozenset[str],
+    expected: bool,
+) -> None:
+    # arrange
+    condition = StreamIdGlobMatchCondition(patterns=patterns)
+    entry = _entry(stream_id)
+
+    # act
+    compiled_result = condition.compile()(entry)
+    batch_result = condition.compile_batch()([entry])
+
+    # assert
+    assert compiled_result is condition.matches(entry) is expected
+    assert batch_result == [expected]
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        pytest.param({"name": "stream_id_glob_match"}, id="missing_patterns"),
+        pytest.param(
+            {"name": "stream_id_glob_match", "patterns": []},
+            id="empty_patterns",
+        ),
+    ],
+)
+def test_StreamIdGlobMatchCondition_raises_ValidationError_for_invalid_config(
+    config: dict[str, Any],
+) -> None:
+    # act & assert
+    with pytest.raises(ValidationError):
+        StreamIdGlobMatchCondition.model_validate(config)
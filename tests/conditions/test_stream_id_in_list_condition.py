@@ -72,6 +72,34 @@ def test_StreamIdInListCondition_matches_returns_expected_for_entry_and_stream_i
     assert result is expected
 
 
+def test_StreamIdInListCondition_compiled_predicates_agree_with_matches() -> None:
+    # arrange
+    entries = [
+        Entry(
+            id=f"entry{i}",
+            origin=Origin(
+                html_url="http://example.com",
+                stream_id=f"feed/example.com/{i}",
+                title="Test Feed",
+            ),
+        )
+        for i in range(4)
+    ] + [Entry(id="entry_without_origin", origin=None)]
+    condition = StreamIdInListCondition(
+        stream_ids=frozenset({"feed/example.com/1", "feed/example.com/3"}),
+    )
+
+    predicate = condition.compile()
+
+    # act
+    result = condition.matches_batch(entries)
+
+    # assert
+    assert result == [condition.matches(entry) for entry in entries]
+    assert result == [predicate(entry) for entry in entries]
+    assert result == [False, True, False, True, False]
+
+
 def test_StreamIdInListCondition_can_be_instantiated() -> None:
     # arrange & act
     condition = StreamIdInListCondition.model_validate(
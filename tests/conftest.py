@@ -3,18 +3,31 @@
 import pytest
 from tenacity import wait_fixed
 
+from tests.helpers import FakeClock
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Fixture for a fake clock."""
+    return FakeClock()
+
 
 @pytest.fixture(autouse=True)
 def patch_todoist_retry_no_wait(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Patch Todoist retry to wait=0 via tenacity ``retry_with`` so tests do not sleep."""
+    """Patch Todoist retries to wait=0 via tenacity ``retry_with`` so tests do not sleep."""
     from feedly_entries_processor.todoist_client import (  # noqa: PLC0415
         _add_task_with_retry_impl,
+        _sync_commands_with_retry_impl,
     )
 
-    no_wait_impl = _add_task_with_retry_impl.retry_with(  # type: ignore[attr-defined]
-        wait=wait_fixed(0),
-    )
-    monkeypatch.setattr(
-        "feedly_entries_processor.todoist_client._add_task_with_retry_impl",
-        no_wait_impl,
-    )
+    for name, impl in [
+        ("_add_task_with_retry_impl", _add_task_with_retry_impl),
+        ("_sync_commands_with_retry_impl", _sync_commands_with_retry_impl),
+    ]:
+        no_wait_impl = impl.retry_with(  # type: ignore[attr-defined]
+            wait=wait_fixed(0),
+        )
+        monkeypatch.setattr(
+            f"feedly_entries_processor.todoist_client.{name}",
+            no_wait_impl,
+        )
@@ -1,9 +1,17 @@
 """Shared test helpers."""
 
+from collections.abc import Collection, Sequence
 from unittest.mock import MagicMock
 
 from requests.exceptions import HTTPError
 
+from feedly_entries_processor.actions import LogAction
+from feedly_entries_processor.conditions import MatchAllCondition
+from feedly_entries_processor.config_loader import Rule
+from feedly_entries_processor.feedly_client import Entry, Summary
+from feedly_entries_processor.matching import Match
+from feedly_entries_processor.sources import SavedSource
+
 
 def make_http_error(status_code: int) -> HTTPError:
     """Build an HTTPError with the given status code for retry tests."""
@@ -11,3 +19,96 @@ def make_http_error(status_code: int) -> HTTPError:
     error.response = MagicMock()
     error.response.status_code = status_code
     return error
+
+
+def make_rule(name: str) -> Rule:
+    """Build a rule logging every entry of the saved source."""
+    return Rule(
+        name=name,
+        source=SavedSource(),
+        condition=MatchAllCondition(),
+        action=LogAction(),
+    )
+
+
+def make_entry(
+    entry_id: str,
+    title: str | None = None,
+    summary: str | None = None,
+    *,
+    url: str | None = None,
+    published: int | None = None,
+) -> Entry:
+    """Build an entry with only the given fields set; ``summary`` is its content."""
+    return Entry(
+        id=entry_id,
+        title=title,
+        summary=Summary(content=summary) if summary is not None else None,
+        canonical_url=url,
+        published=published,
+    )
+
+
+def make_entries(
+    count: int,
+    start: int = 0,
+    *,
+    fields: Collection[str] = (),
+) -> list[Entry]:
+    """Build entries ``entry_<i>`` for ``count`` values of i from ``start``.
+
+    Each of ``fields``, among ``title``, ``summary`` and ``url``, is set to a
+    value derived from i.
+    """
+    return [
+        make_entry(
+            f"entry_{i}",
+            f"Title {i}" if "title" in fields else None,
+            "Summary" if "summary" in fields else None,
+            url=f"https://example.com/{i}" if "url" in fields else None,
+        )
+        for i in range(start, start + count)
+    ]
+
+
+class FakeClock:
+    """A clock that only moves when told to, or when sleeping."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        """Record a sleep without waiting."""
+        self.sleeps.append(seconds)
+
+
+class FakeMatcher:
+    """Matcher returning fixed matches by (entry id, rule name), recording the pages it sees."""
+
+    def __init__(
+        self,
+        rules: Sequence[Rule],
+        matched: set[tuple[str, str]],
+        disabled: frozenset[Rule] = frozenset(),
+        errored: frozenset[tuple[str, Rule]] = frozenset(),
+    ) -> None:
+        self.rules = tuple(rules)
+        self.disabled = disabled
+        self.errored = errored
+        self._matched = matched
+        self.pages: list[list[str]] = []
+
+    def match_page(self, page: Sequence[Entry]) -> list[Match]:
+        """Return (entry index, rule) pairs whose (entry id, rule name) is matched."""
+        self.pages.append([entry.id for entry in page])
+        return [
+            (index, rule)
+            for index, entry in enumerate(page)
+            for rule in self.rules
+            if (entry.id, rule.name) in self._matched
+        ]
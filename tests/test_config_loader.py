@@ -10,11 +10,13 @@ from ruamel.yaml.error import YAMLError
 from feedly_entries_processor.actions import (
     AddTodoistTaskAction,
     LogAction,
+    RunInParallelAction,
     RunInSequenceAction,
 )
 from feedly_entries_processor.conditions import (
     MatchAllCondition,
     RegexPartialMatchCondition,
+    StreamIdGlobMatchCondition,
     StreamIdInListCondition,
 )
 from feedly_entries_processor.config_loader import (
@@ -40,6 +42,7 @@ _SOURCES = (AllSource(), SavedSource())
 _CONDITIONS = (
     MatchAllCondition(),
     StreamIdInListCondition(stream_ids=frozenset({"stream_id"})),
+    StreamIdGlobMatchCondition(patterns=frozenset({"feed/https://example.com/*"})),
     RegexPartialMatchCondition(fields=("title",), patterns=("pattern",)),
 )
 _ACTIONS = (
@@ -54,6 +57,7 @@ _ACTIONS = (
         ),
     ),
     RunInSequenceAction(actions=(LogAction(),)),
+    RunInParallelAction(actions=(LogAction(),), on_error="fail_fast"),
 )
 
 
@@ -0,0 +1,114 @@
+"""Tests for the action executors."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import pytest
+
+from feedly_entries_processor.executor import (
+    InlineActionExecutor,
+    ThreadPoolActionExecutor,
+    create_action_executor,
+)
+
+
+def test_InlineActionExecutor_runs_steps_immediately_in_order() -> None:
+    # arrange
+    calls: list[int] = []
+    executor = InlineActionExecutor()
+
+    # act
+    executor.submit(
+        [("log", lambda: calls.append(1)), ("log", lambda: calls.append(2))]
+    )
+
+    # assert
+    assert calls == [1, 2]
+
+
+def test_ThreadPoolActionExecutor_keeps_the_order_of_steps_within_a_chain() -> None:
+    # arrange
+    calls: dict[int, list[int]] = {chain: [] for chain in range(20)}
+
+    # act
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        executor = ThreadPoolActionExecutor(pool, {})
+        for chain_calls in calls.values():
+            executor.submit(
+                [("log", partial(chain_calls.append, step)) for step in range(5)]
+            )
+        executor.wait()
+
+    # assert
+    assert all(chain_calls == list(range(5)) for chain_calls in calls.values())
+
+
+def test_ThreadPoolActionExecutor_limits_concurrent_calls_per_action_name() -> None:
+    # arrange
+    lock = threading.Lock()
+    running = {"limited": 0, "free": 0}
+    peak = {"limited": 0, "free": 0}
+
+    def step(name: str) -> None:
+        with lock:
+            running[name] += 1
+            peak[name] = max(peak[name], running[name])
+        time.sleep(0.01)
+        with lock:
+            running[name] -= 1
+
+    # act
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        executor = ThreadPoolActionExecutor(pool, {"limited": 2})
+        for _ in range(12):
+            executor.submit([("limited", lambda: step("limited"))])
+            executor.submit([("free", lambda: step("free"))])
+        executor.wait()
+
+    # assert
+    assert peak["limited"] == 2
+    assert peak["free"] > 2
+
+
+def test_ThreadPoolActionExecutor_wait_reraises_errors_after_all_chains_finish() -> (
+    None
+):
+    # arrange
+    calls: list[str] = []
+
+    def fail() -> None:
+        msg = "step failed"
+        raise ValueError(msg)
+
+    def finish_late() -> None:
+        time.sleep(0.05)
+        calls.append("done")
+
+    # act & assert
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        executor = ThreadPoolActionExecutor(pool, {})
+        executor.submit([("log", fail)])
+        executor.submit([("log", finish_late)])
+        with pytest.raises(ValueError, match="step failed"):
+            executor.wait()
+
+        assert calls == ["done"]
+
+
+@pytest.mark.parametrize(
+    ("workers", "expected_type"),
+    [
+        pytest.param(0, InlineActionExecutor, id="inline"),
+        pytest.param(2, ThreadPoolActionExecutor, id="threads"),
+    ],
+)
+def test_create_action_executor_returns_executor_for_worker_count(
+    workers: int,
+    expected_type: type,
+) -> None:
+    # act
+    with create_action_executor(workers=workers) as executor:
+        # assert
+        assert isinstance(executor, expected_type)
@@ -326,3 +326,78 @@ def test_FeedlyClient_remove_entry_from_tag_raises_FeedlyEntriesProcessorError_w
     # act & assert
     with pytest.raises(FeedlyEntriesProcessorError):
         client.remove_entry_from_tag("global.saved", "entry1")
+
+
+def test_FeedlyClient_remove_entries_from_tag_joins_encoded_entry_ids(
+    mock_feedly_session: MagicMock,
+) -> None:
+    # arrange
+    client = FeedlyClient(mock_feedly_session)
+
+    # act
+    client.remove_entries_from_tag("tech", ["entry=1", "entry,2"])
+
+    # assert
+    mock_feedly_session.do_api_request.assert_called_once_with(
+        relative_url="/v3/tags/user%2Ftest_user_id%2Ftag%2Ftech/entry%3D1,entry%2C2",
+        method="DELETE",
+    )
+
+
+def test_FeedlyClient_remove_entries_from_tag_skips_request_for_no_entries(
+    mock_feedly_session: MagicMock,
+) -> None:
+    # arrange
+    client = FeedlyClient(mock_feedly_session)
+
+    # act
+    client.remove_entries_from_tag("tech", [])
+
+    # assert
+    mock_feedly_session.do_api_request.assert_not_called()
+
+
+def test_FeedlyClient_mark_entries_posts_entry_ids_to_markers(
+    mock_feedly_session: MagicMock,
+) -> None:
+    # arrange
+    client = FeedlyClient(mock_feedly_session)
+
+    # act
+    client.mark_entries("markAsRead", ["entry1", "entry2"])
+
+    # assert
+    mock_feedly_session.do_api_request.assert_called_once_with(
+        relative_url="/v3/markers",
+        method="POST",
+        data={
+            "action": "markAsRead",
+            "type": "entries",
+            "entryIds": ["entry1", "entry2"],
+        },
+    )
+
+
+def test_FeedlyClient_mark_entries_skips_request_for_no_entries(
+    mock_feedly_session: MagicMock,
+) -> None:
+    # arrange
+    client = FeedlyClient(mock_feedly_session)
+
+    # act
+    client.mark_entries("markAsSaved", [])
+
+    # assert
+    mock_feedly_session.do_api_request.assert_not_called()
+
+
+def test_FeedlyClient_mark_entries_raises_FeedlyEntriesProcessorError_when_request_raises(
+    mock_feedly_session: MagicMock,
+) -> None:
+    # arrange
+    mock_feedly_session.do_api_request.side_effect = RequestException
+    client = FeedlyClient(mock_feedly_session)
+
+    # act & assert
+    with pytest.raises(FeedlyEntriesProcessorError):
+        client.mark_entries("markAsUnsaved", ["entry1"])
@@ -0,0 +1,190 @@
+"""Tests for the ledger module."""
+
+from pathlib import Path
+
+import pytest
+
+from feedly_entries_processor.conditions import (
+    StreamIdInListCondition,
+)
+from feedly_entries_processor.ledger import (
+    BloomFilter,
+    Ledger,
+    LedgerMatcher,
+    rule_fingerprint,
+)
+from tests.helpers import FakeClock, FakeMatcher, make_entry, make_rule
+
+TTL = 100.0
+
+
+@pytest.fixture
+def ledger(tmp_path: Path, clock: FakeClock) -> Ledger:
+    """Fixture for a ledger in a temporary directory."""
+    return Ledger(tmp_path / "ledger" / "ledger.sqlite3", ttl=TTL, clock=clock)
+
+
+def test_BloomFilter_has_no_false_negatives_and_few_false_positives() -> None:
+    # arrange
+    bloom = BloomFilter(1000, error_rate=0.01)
+    members = [f"member-{i}" for i in range(1000)]
+
+    # act
+    for member in members:
+        bloom.add(member)
+
+    # assert
+    assert all(member in bloom for member in members)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+    assert len(bloom) == 1000
+
+
+def test_rule_fingerprint_ignores_priority_but_not_condition() -> None:
+    # arrange
+    rule = make_rule("rule")
+
+    # act
+    reprioritized = rule.model_copy(update={"priority": 5})
+    changed = rule.model_copy(
+        update={"condition": StreamIdInListCondition(stream_ids=frozenset({"a"}))}
+    )
+
+    # assert
+    assert rule_fingerprint(reprioritized) == rule_fingerprint(rule)
+    assert rule_fingerprint(changed) != rule_fingerprint(rule)
+
+
+def test_Ledger_seen_returns_recorded_entries_before_and_after_flush(
+    tmp_path: Path,
+    ledger: Ledger,
+    clock: FakeClock,
+) -> None:
+    # arrange
+    rule = make_rule("rule")
+    other = make_rule("other")
+
+    # act
+    ledger.record(rule, ["a", "b"])
+    before_flush = ledger.seen(rule, ["a", "b", "c"])
+    ledger.flush()
+    reopened = Ledger(tmp_path / "ledger" / "ledger.sqlite3", ttl=TTL, clock=clock)
+
+    # assert
+    assert before_flush == {"a", "b"}
+    assert reopened.seen(rule, ["a", "b", "c"]) == {"a", "b"}
+    assert reopened.seen(other, ["a", "b"]) == set()
+
+
+def test_Ledger_forgets_records_older_than_ttl(
+    ledger: Ledger,
+    clock: FakeClock,
+) -> None:
+    # arrange
+    rule = make_rule("rule")
+    ledger.record(rule, ["old"])
+    ledger.flush()
+    clock.now += TTL / 2
+    ledger.record(rule, ["new"])
+    ledger.flush()
+
+    # act
+    clock.now += TTL / 2 + 1
+    seen = ledger.seen(rule, ["old", "new"])
+    deleted = ledger.prune()
+
+    # assert
+    assert seen == {"new"}
+    assert deleted == 1
+    assert ledger.stats().entries == 1
+
+
+def test_Ledger_prune_deletes_records_of_rules_not_kept(ledger: Ledger) -> None:
+    # arrange
+    kept = make_rule("kept")
+    removed = make_rule("removed")
+    ledger.record(kept, ["a"])
+    ledger.record(removed, ["a", "b"])
+
+    # act
+    deleted = ledger.prune(keep=[kept])
+
+    # assert
+    assert deleted == 2
+    assert ledger.seen(removed, ["a", "b"]) == set()
+    assert ledger.stats().by_rule == {rule_fingerprint(kept): 1}
+
+
+def test_Ledger_stats_counts_records_per_rule(
+    ledger: Ledger,
+    clock: FakeClock,
+) -> None:
+    # arrange
+    first = make_rule("first")
+    second = make_rule("second")
+    ledger.record(first, ["a", "b"])
+    clock.now += 10
+    ledger.record(second, ["a"])
+
+    # act
+    stats = ledger.stats()
+
+    # assert
+    assert stats.entries == 3
+    assert stats.by_rule == {rule_fingerprint(first): 2, rule_fingerprint(second): 1}
+    assert (stats.oldest, stats.newest) == (0.0, 10.0)
+
+
+def test_LedgerMatcher_skips_entries_handled_by_every_rule_and_records_non_matches(
+    ledger: Ledger,
+) -> None:
+    # arrange
+    first = make_rule("first")
+    second = make_rule("second")
+    ledger.record(first, ["a", "b"])
+    ledger.record(second, ["a"])
+    inner = FakeMatcher(
+        [first, second], {("b", "first"), ("b", "second"), ("c", "first")}
+    )
+    matcher = LedgerMatcher(inner, ledger)
+    page = [make_entry("a"), make_entry("b"), make_entry("c")]
+
+    # act
+    matched = matcher.match_page(page)
+
+    # assert
+    assert inner.pages == [["b", "c"]]
+    assert matched == [(1, second), (2, first)]
+    assert ledger.seen(second, ["c"]) == {"c"}
+    assert ledger.seen(first, ["c"]) == set()
+    assert ledger.seen(second, ["b"]) == set()
+
+
+def test_LedgerMatcher_does_not_record_non_matches_of_disabled_rules(
+    ledger: Ledger,
+) -> None:
+    # arrange
+    slow = make_rule("slow")
+    matcher = LedgerMatcher(FakeMatcher([slow], set(), frozenset({slow})), ledger)
+
+    # act
+    matcher.match_page([make_entry("a")])
+
+    # assert
+    assert ledger.seen(slow, ["a"]) == set()
+
+
+def test_LedgerMatcher_does_not_record_non_matches_whose_evaluation_raised(
+    ledger: Ledger,
+) -> None:
+    # arrange
+    rule = make_rule("rule")
+    matcher = LedgerMatcher(
+        FakeMatcher([rule], set(), errored=frozenset({("a", rule)})), ledger
+    )
+
+    # act
+    matcher.match_page([make_entry("a"), make_entry("b")])
+
+    # assert
+    assert ledger.seen(rule, ["a", "b"]) == {"b"}
@@ -3,6 +3,7 @@
 import json
 from pathlib import Path
 
+import pytest
 from pydantic_yaml import to_yaml_str
 from pytest_mock import MockerFixture
 from typer.testing import CliRunner
@@ -11,6 +12,7 @@ from feedly_entries_processor.__main__ import app
 from feedly_entries_processor.actions import LogAction
 from feedly_entries_processor.conditions import MatchAllCondition
 from feedly_entries_processor.config_loader import Config, Rule
+from feedly_entries_processor.ledger import Ledger
 from feedly_entries_processor.sources import SavedSource
 
 runner = CliRunner()
@@ -101,3 +103,67 @@ def test_main_exits_with_error_for_invalid_config_when_validating(
     # assert
     assert result.exit_code == 1
     mock_process.assert_not_called()
+
+
+def _write_config(config_file: Path, *rules: Rule) -> None:
+    config_file.write_text(
+        to_yaml_str(Config(rules=frozenset(rules))), encoding="utf-8"
+    )
+
+
+def test_main_prunes_ledger_and_shows_stats_without_processing(
+    mocker: MockerFixture,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    # arrange
+    mock_process = mocker.patch("feedly_entries_processor.__main__.process")
+    rule = Rule(
+        name="Kept Rule",
+        source=SavedSource(),
+        condition=MatchAllCondition(),
+        action=LogAction(),
+    )
+    removed = rule.model_copy(update={"name": "Removed Rule"})
+    config_file = tmp_path / "config.yml"
+    _write_config(config_file, rule)
+    ledger_path = tmp_path / "ledger.sqlite3"
+    ledger = Ledger(ledger_path, ttl=3600)
+    ledger.record(rule, ["a", "b"])
+    ledger.record(removed, ["a"])
+    ledger.flush()
+    monkeypatch.setenv("LEDGER_PATH", str(ledger_path))
+
+    # act
+    result = runner.invoke(app, ["--prune-ledger", "--ledger-stats", str(config_file)])
+
+    # assert
+    assert result.exit_code == 0, result.output
+    assert "Deleted 1 ledger records." in result.output
+    assert "2 ledger records" in result.output
+    assert "2\tKept Rule" in result.output
+    mock_process.assert_not_called()
+
+
+def test_main_exits_with_error_for_ledger_options_without_ledger_path(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    # arrange
+    monkeypatch.delenv("LEDGER_PATH", raising=False)
+    config_file = tmp_path / "config.yml"
+    _write_config(
+        config_file,
+        Rule(
+            name="Rule",
+            source=SavedSource(),
+            condition=MatchAllCondition(),
+            action=LogAction(),
+        ),
+    )
+
+    # act
+    result = runner.invoke(app, ["--ledger-stats", str(config_file)])
+
+    # assert
+    assert result.exit_code == 1
@@ -0,0 +1,320 @@
+"""Tests for the matching module."""
+
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import cast
+
+import pytest
+from pytest_mock import MockerFixture
+
+from feedly_entries_processor.actions import LogAction
+from feedly_entries_processor.conditions import (
+    MatchAllCondition,
+    RegexPartialMatchCondition,
+    StreamIdGlobMatchCondition,
+    StreamIdInListCondition,
+)
+from feedly_entries_processor.config_loader import Rule
+from feedly_entries_processor.exceptions import ConditionTimeBudgetExceededError
+from feedly_entries_processor.feedly_client import Entry, Origin
+from feedly_entries_processor.matching import (
+    ProcessPoolMatcher,
+    SerialMatcher,
+    _init_worker,
+    _match_chunk,
+    create_matcher,
+)
+from feedly_entries_processor.sources import SavedSource
+from feedly_entries_processor.stream_id_trie import StreamIdTrie
+
+
+@pytest.fixture
+def rules() -> tuple[Rule, ...]:
+    """Fixture for rules with a mix of condition types."""
+    return (
+        Rule(
+            name="python",
+            source=SavedSource(),
+            condition=RegexPartialMatchCondition(fields=("title",), patterns=("py",)),
+            action=LogAction(),
+        ),
+        Rule(
+            name="feed-1",
+            source=SavedSource(),
+            condition=StreamIdInListCondition(stream_ids=frozenset({"feed/1"})),
+            action=LogAction(level="debug"),
+        ),
+        Rule(
+            name="everything",
+            source=SavedSource(),
+            condition=MatchAllCondition(),
+            action=LogAction(level="warning"),
+        ),
+    )
+
+
+@pytest.fixture
+def page() -> list[Entry]:
+    """Fixture for a page of entries."""
+    return [
+        Entry(
+            id=f"entry{i}",
+            title="python" if i % 2 == 0 else "rust",
+            origin=Origin(
+                html_url="http://example.com", stream_id=f"feed/{i % 3}", title="Feed"
+            ),
+        )
+        for i in range(7)
+    ]
+
+
+def test_SerialMatcher_match_page_returns_matches_ordered_by_entry_then_rule(
+    rules: tuple[Rule, ...],
+    page: list[Entry],
+) -> None:
+    # arrange
+    matcher = SerialMatcher(rules)
+
+    # act
+    result = matcher.match_page(page[:2])
+
+    # assert
+    assert result == [(0, rules[0]), (0, rules[2]), (1, rules[1]), (1, rules[2])]
+
+
+def test_ProcessPoolMatcher_match_page_returns_same_matches_as_SerialMatcher(
+    rules: tuple[Rule, ...],
+    page: list[Entry],
+) -> None:
+    # arrange
+    expected = SerialMatcher(rules).match_page(page)
+
+    # act
+    with create_matcher(rules, workers=2) as matcher:
+        result = matcher.match_page(page)
+        empty_result = matcher.match_page([])
+
+    # assert
+    assert isinstance(matcher, ProcessPoolMatcher)
+    assert result == expected
+    assert empty_result == []
+
+
+def test_create_matcher_returns_SerialMatcher_without_workers(
+    rules: tuple[Rule, ...],
+) -> None:
+    # act
+    with create_matcher(rules) as matcher:
+        pass
+
+    # assert
+    assert isinstance(matcher, SerialMatcher)
+
+
+def test_SerialMatcher_disables_rule_that_exceeds_its_time_budget(
+    mocker: MockerFixture,
+    rules: tuple[Rule, ...],
+    page: list[Entry],
+) -> None:
+    # arrange
+    slow_condition = mocker.create_autospec(RegexPartialMatchCondition)
+    slow_condition.name = "regex_partial_match"
+    slow_condition.compile_batch.return_value.side_effect = (
+        ConditionTimeBudgetExceededError("too slow")
+    )
+    slow_rule = Rule(
+        name="slow",
+        source=SavedSource(),
+        condition=slow_condition,
+        action=LogAction(),
+    )
+    mock_logger_error = mocker.patch("feedly_entries_processor.matching.logger.error")
+    matcher = SerialMatcher((slow_rule, *rules))
+    expected = SerialMatcher(rules).match_page(page)
+
+    # act
+    first = matcher.match_page(page)
+    second = matcher.match_page(page)
+
+    # assert
+    assert first == second == expected
+    slow_condition.compile_batch.return_value.assert_called_once()
+    slow_condition.matches.assert_not_called()
+    mock_logger_error.assert_called_once()
+    assert "'slow' disabled" in mock_logger_error.call_args.args[0]
+
+
+def test_SerialMatcher_reports_pairs_whose_evaluation_raised(
+    mocker: MockerFixture,
+    rules: tuple[Rule, ...],
+    page: list[Entry],
+) -> None:
+    # arrange
+    failing_condition = mocker.create_autospec(RegexPartialMatchCondition)
+    failing_condition.name = "regex_partial_match"
+    failing_condition.compile_batch.return_value.side_effect = ValueError("bad")
+
+    def matches(entry: Entry) -> bool:
+        if entry.id != page[0].id:
+            raise ValueError(entry.id)
+        return True
+
+    failing_condition.matches.side_effect = matches
+    failing_rule = Rule(
+        name="failing",
+        source=SavedSource(),
+        condition=failing_condition,
+        action=LogAction(),
+    )
+    mocker.patch("feedly_entries_processor.matching.logger")
+    matcher = SerialMatcher((failing_rule, *rules))
+
+    # act
+    result = matcher.match_page(page[:2])
+
+    # assert
+    assert (0, failing_rule) in result
+    assert matcher.errored == frozenset({(page[1].id, failing_rule)})
+
+
+def test_SerialMatcher_dispatches_stream_id_conditions_through_one_shared_trie(
+    mocker: MockerFixture,
+    page: list[Entry],
+) -> None:
+    # arrange
+    rules = tuple(
+        Rule(
+            name=name,
+            source=SavedSource(),
+            condition=condition,
+            action=LogAction(),
+        )
+        for name, condition in [
+            ("glob", StreamIdGlobMatchCondition(patterns=frozenset({"feed/*"}))),
+            ("exact", StreamIdInListCondition(stream_ids=frozenset({"feed/2"}))),
+            ("other-glob", StreamIdGlobMatchCondition(patterns=frozenset({"*/1"}))),
+            ("regex", RegexPartialMatchCondition(fields=("title",), patterns=("py",))),
+        ]
+    )
+    expected = [
+        (entry_index, rule)
+        for entry_index, entry in enumerate(page)
+        for rule in rules
+        if rule.condition.matches(entry)
+    ]
+    spy_lookup = mocker.spy(StreamIdTrie, "lookup")
+
+    # act
+    result = SerialMatcher(rules).match_page(page)
+
+    # assert
+    assert result == expected
+    assert spy_lookup.call_count == len(page)
+
+
+def test_SerialMatcher_matches_pages_from_several_threads_at_once() -> None:
+    # arrange
+    rules = tuple(
+        Rule(
+            name=name,
+            source=SavedSource(),
+            condition=StreamIdGlobMatchCondition(patterns=frozenset({pattern})),
+            action=LogAction(),
+        )
+        for name, pattern in [("even", "feed/*/0"), ("odd", "feed/*/1")]
+    )
+    pages = [
+        [
+            Entry(
+                id=f"entry{page_index}-{i}",
+                origin=Origin(
+                    html_url="http://example.com",
+                    stream_id=f"feed/{page_index}/{(page_index + i) % 2}",
+                    title="Feed",
+                ),
+            )
+            for i in range(3)
+        ]
+        for page_index in range(200)
+    ]
+    matcher = SerialMatcher(rules)
+
+    # act
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(matcher.match_page, pages))
+
+    # assert
+    assert results == [
+        [(i, rules[(page_index + i) % 2]) for i in range(3)]
+        for page_index in range(200)
+    ]
+
+
+class ScriptedExecutor:
+    """Executor returning scripted worker results, recording what it is sent."""
+
+    def __init__(
+        self,
+        results: list[
+            tuple[list[tuple[int, int]], frozenset[int], list[tuple[int, int]]]
+        ],
+    ) -> None:
+        self.results = results
+        self.calls: list[tuple[object, ...]] = []
+
+    def submit(self, _fn: object, *args: object) -> Future[object]:
+        """Return a future holding the next scripted result."""
+        self.calls.append(args)
+        future: Future[object] = Future()
+        future.set_result(self.results.pop(0))
+        return future
+
+
+def test_ProcessPoolMatcher_disables_rule_for_every_worker(
+    rules: tuple[Rule, ...],
+    page: list[Entry],
+) -> None:
+    # arrange
+    executor = ScriptedExecutor(
+        [
+            # The first worker disabled rule 0; the second still matched it.
+            ([(0, 1)], frozenset({0}), []),
+            ([(4, 0), (4, 2)], frozenset(), [(3, 1)]),
+            ([(0, 2)], frozenset(), []),
+        ]
+    )
+    matcher = ProcessPoolMatcher(rules, cast("ProcessPoolExecutor", executor), 2)
+
+    # act
+    first = matcher.match_page(page)
+    second = matcher.match_page(page[:1])
+
+    # assert
+    assert first == [(0, rules[1]), (4, rules[2])]
+    assert second == [(0, rules[2])]
+    assert matcher.disabled == frozenset({rules[0]})
+    assert matcher.errored == frozenset({(page[3].id, rules[1])})
+    assert [call[2] for call in executor.calls] == [
+        frozenset(),
+        frozenset(),
+        frozenset({0}),
+    ]
+
+
+def test_match_chunk_skips_rules_disabled_by_other_workers(
+    mocker: MockerFixture,
+    rules: tuple[Rule, ...],
+    page: list[Entry],
+) -> None:
+    # arrange
+    # Worker state is module-global; keep it out of later forked workers.
+    mocker.patch("feedly_entries_processor.matching._worker_conditions", ())
+    mocker.patch("feedly_entries_processor.matching._worker_disabled", set())
+    _init_worker(tuple((rule.name, rule.condition) for rule in rules))
+
+    # act
+    pairs, disabled, errored = _match_chunk(0, page[:1], frozenset({0}))
+
+    # assert
+    assert pairs == [(0, 2)]
+    assert disabled == frozenset({0})
+    assert errored == []
@@ -0,0 +1,134 @@
+"""Tests for the near_dedup module."""
+
+import pytest
+
+from feedly_entries_processor.near_dedup import (
+    NearDuplicateFilter,
+    entry_fingerprint,
+    simhash,
+)
+from tests.helpers import make_entry
+
+STORY = (
+    "The city council approved a new budget on Tuesday that expands bus "
+    "service, repairs three bridges and hires forty additional teachers "
+    "for the public schools starting next autumn"
+)
+
+
+def test_simhash_sets_bits_set_in_most_shingle_hashes() -> None:
+    # act
+    fingerprint = simhash(["same"] * 3)
+
+    # assert
+    assert fingerprint == simhash(["same"])
+    assert fingerprint != simhash(["other"])
+
+
+def test_entry_fingerprint_is_close_for_rewritten_stories() -> None:
+    # arrange
+    original = make_entry("a", "Council approves budget", f"<p>{STORY}.</p>")
+    rewritten = make_entry(
+        "b", "Council approves budget", f"<div>{STORY}, officials said</div>"
+    )
+    unrelated = make_entry(
+        "c",
+        "Storm expected",
+        "Forecasters warn that a strong storm will bring heavy rain and wind "
+        "to the coast over the weekend, closing several roads",
+    )
+
+    # act
+    fingerprints = [entry_fingerprint(e) for e in (original, rewritten, unrelated)]
+
+    # assert
+    first, second, third = fingerprints
+    assert first is not None
+    assert second is not None
+    assert third is not None
+    assert (first ^ second).bit_count() <= 6
+    assert (first ^ third).bit_count() > 10
+
+
+def test_entry_fingerprint_returns_none_for_short_text() -> None:
+    # act
+    result = entry_fingerprint(make_entry("a", "Breaking news"))
+
+    # assert
+    assert result is None
+
+
+@pytest.mark.parametrize(
+    ("distance", "expected"),
+    [
+        pytest.param(0, True, id="identical"),
+        pytest.param(3, True, id="within_max_distance"),
+        pytest.param(4, False, id="beyond_max_distance"),
+    ],
+)
+def test_is_duplicate_compares_hamming_distance(
+    distance: int,
+    *,
+    expected: bool,
+) -> None:
+    # arrange
+    duplicates = NearDuplicateFilter(max_distance=3)
+    fingerprint = 0x0123_4567_89AB_CDEF
+    duplicates.is_duplicate(fingerprint, "first")
+    # Flip bits spread over every band.
+    flipped = fingerprint
+    for bit in range(distance):
+        flipped ^= 1 << (bit * 17 % 64)
+
+    # act
+    result = duplicates.is_duplicate(flipped, "second")
+
+    # assert
+    assert result is expected
+
+
+def test_is_duplicate_forgets_fingerprints_beyond_window() -> None:
+    # arrange
+    duplicates = NearDuplicateFilter(max_distance=0, window=2)
+    for fingerprint in (1, 2, 3):
+        duplicates.is_duplicate(fingerprint, str(fingerprint))
+
+    # act
+    result = [duplicates.is_duplicate(fingerprint, "again") for fingerprint in (3, 1)]
+
+    # assert
+    assert result == [True, False]
+
+
+def test_filter_drops_near_duplicates_and_keeps_short_entries() -> None:
+    # arrange
+    duplicates = NearDuplicateFilter(max_distance=6)
+    entries = [
+        make_entry("feed-1", "Council approves budget", STORY),
+        make_entry("feed-2", "Council approves budget", f"{STORY}, officials said"),
+        make_entry("short-1", "Breaking news"),
+        make_entry("short-2", "Breaking news"),
+    ]
+
+    # act
+    result = [entry.id for entry in duplicates.filter(entries)]
+
+    # assert
+    assert result == ["feed-1", "short-1", "short-2"]
+    assert duplicates.dropped == 1
+
+
+def test_filter_keeps_the_same_entry_seen_in_another_source() -> None:
+    # arrange
+    duplicates = NearDuplicateFilter(max_distance=6)
+    entry = make_entry("e1", "Council approves budget", STORY)
+    copy = make_entry("e2", "Council approves budget", f"{STORY}, officials said")
+
+    # act
+    first_source = [entry.id for entry in duplicates.filter([entry])]
+    second_source = [entry.id for entry in duplicates.filter([entry, copy])]
+
+    # assert
+    assert first_source == ["e1"]
+    assert second_source == ["e1"]
+    assert duplicates.dropped == 1
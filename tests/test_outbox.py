@@ -0,0 +1,573 @@
+"""Tests for the outbox module."""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
+
+import pytest
+from pytest_mock import MockerFixture
+
+from feedly_entries_processor.actions import AddTodoistTaskAction, LogAction
+from feedly_entries_processor.actions.base_action import BaseAction
+from feedly_entries_processor.conditions import MatchAllCondition
+from feedly_entries_processor.config_loader import Rule
+from feedly_entries_processor.exceptions import (
+    InvalidEntryError,
+    PartialFailureError,
+)
+from feedly_entries_processor.outbox import (
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    ActionBudget,
+    Outbox,
+    background_drain,
+    drain,
+    idempotency_key,
+    retry_delay,
+    rule_key,
+)
+from feedly_entries_processor.process import process_entries
+from feedly_entries_processor.sources import SavedSource
+from tests.helpers import FakeClock, make_entry
+
+if TYPE_CHECKING:
+    from unittest.mock import MagicMock
+
+
+def make_rule(
+    mocker: MockerFixture,
+    name: str = "rule",
+    *,
+    batch: bool = False,
+    priority: int = 0,
+    action_type: type[BaseAction] = LogAction,
+) -> Rule:
+    action = mocker.create_autospec(action_type)
+    action.name = action_type.model_fields["name"].default
+    action.supports_batch = batch
+    action.completes_on_flush = False
+    action.entries_per_request = 1
+    action.model_dump_json.return_value = f'{{"name": "log", "rule": "{name}"}}'
+    return Rule(
+        name=name,
+        source=SavedSource(),
+        condition=MatchAllCondition(),
+        action=action,
+        priority=priority,
+    )
+
+
+@pytest.fixture
+def outbox(tmp_path: Path, clock: FakeClock) -> Outbox:
+    """Fixture for an outbox in a temporary directory."""
+    return Outbox(tmp_path / "outbox" / "outbox.sqlite3", clock=clock)
+
+
+def test_Outbox_enqueue_ignores_matches_already_queued(
+    mocker: MockerFixture,
+    outbox: Outbox,
+) -> None:
+    # arrange
+    rule = make_rule(mocker)
+
+    # act
+    first = outbox.enqueue([(make_entry("a"), rule), (make_entry("b"), rule)])
+    second = outbox.enqueue([(make_entry("a"), rule), (make_entry("c"), rule)])
+
+    # assert
+    assert first == 2
+    assert second == 1
+    assert outbox.pending_count() == 3
+
+
+def test_Outbox_due_returns_jobs_of_given_rules_with_their_entries(
+    mocker: MockerFixture,
+    outbox: Outbox,
+) -> None:
+    # arrange
+    rule = make_rule(mocker, "rule")
+    other = make_rule(mocker, "other")
+    entry = make_entry("a")
+    outbox.enqueue([(entry, rule), (make_entry("b"), other)])
+
+    # act
+    jobs = outbox.due([rule_key(rule)])
+
+    # assert
+    assert [(job.key, job.entry, job.attempts) for job in jobs] == [
+        (idempotency_key(entry, rule), entry, 0)
+    ]
+    assert outbox.due([]) == []
+
+
+def test_Outbox_keeps_jobs_across_instances(
+    mocker: MockerFixture,
+    tmp_path: Path,
+) -> None:
+    # arrange
+    rule = make_rule(mocker)
+    Outbox(tmp_path / "outbox.sqlite3").enqueue([(make_entry("a"), rule)])
+
+    # act
+    jobs = Outbox(tmp_path / "outbox.sqlite3").due([rule_key(rule)])
+
+    # assert
+    assert [job.entry.id for job in jobs] == ["a"]
+
+
+def test_idempotency_key_changes_with_rule_action() -> None:
+    # arrange
+    entry = make_entry("a")
+    rule = Rule(
+        name="rule",
+        source=SavedSource(),
+        condition=MatchAllCondition(),
+        action=LogAction(),
+    )
+    changed = rule.model_copy(update={"action": LogAction(level="debug")})
+
+    # act & assert
+    assert idempotency_key(entry, rule) == idempotency_key(entry, rule.model_copy())
+    assert idempotency_key(entry, rule) != idempotency_key(entry, changed)
+    assert idempotency_key(entry, rule) != idempotency_key(make_entry("b"), rule)
+
+
+@pytest.mark.parametrize(
+    ("attempts", "expected"),
+    [
+        pytest.param(1, RETRY_BASE_DELAY, id="first"),
+        pytest.param(3, RETRY_BASE_DELAY * 4, id="third"),
+        pytest.param(100, RETRY_MAX_DELAY, id="capped"),
+    ],
+)
+def test_retry_delay_doubles_up_to_maximum(attempts: int, expected: float) -> None:
+    # act & assert
+    assert retry_delay(attempts) == expected
+
+
+def test_drain_runs_each_job_once_and_flushes(
+    mocker: MockerFixture,
+    outbox: Outbox,
+) -> None:
+    # arrange
+    rule = make_rule(mocker)
+    entries = [make_entry("a"), make_entry("b")]
+    outbox.enqueue([(entry, rule) for entry in entries])
+    rules = {rule_key(rule): rule}
+
+    # act
+    drain(outbox, rules)
+    outbox.enqueue([(entries[0], rule)])
+    drain(outbox, rules)
+
+    # assert
+    action = cast("MagicMock", rule.action)
+    assert [call.args[0] for call in action.process.call_args_list] == entries
+    assert action.flush.call_count == 2
+    assert outbox.pending_count() == 0
+
+
+def test_drain_passes_jobs_of_batch_actions_together(
+    mocker: MockerFixture,
+    outbox: Outbox,
+) -> None:
+    # arrange
+    rule = make_rule(mocker, batch=True)
+    entries = [make_entry("a"), make_entry("b")]
+    outbox.enqueue([(entry, rule) for entry in entries])
+
+    # act
+    drain(outbox, {rule_key(rule): rule})
+
+    # assert
+    action = cast("MagicMock", rule.action)
+    action.process_batch.assert_called_once_with(entries)
+    action.process.assert_not_called()
+
+
+def test_drain_marks_deferred_jobs_done_only_once_flushed(
+    mocker: MockerFixture,
+    outbox: Outbox,
+    clock: FakeClock,
+) -> None:
+    # arrange
+    rule = make_rule(mocker, batch=True)
+    action = cast("MagicMock", rule.action)
+    action.completes_on_flush = True
+    action.flush.side_effect = [
+        PartialFailureError("untag failed", errors={"a": RuntimeError("a")}),
+        None,
+    ]
+    rules = {rule_key(rule): rule}
+    outbox.enqueue([(make_entry("a"), rule), (make_entry("b"), rule)])
+
+    # act
+    drain(outbox, rules)
+    pending_after_first_drain = outbox.pending_count()
+    clock.now += RETRY_BASE_DELAY
+    drain(outbox, rules)
+
+    # assert
+    assert pending_after_first_drain == 1
+    assert [
+        [entry.id for entry in call.args[0]]
+        for call in action.process_batch.call_args_list
+    ] == [["a", "b"], ["a"]]
+    assert outbox.pending_count() == 0
+
+
+def test_drain_retries_only_the_failed_jobs_of_a_batch(
+    mocker: MockerFixture,
+    outbox: Outbox,
+    clock: FakeClock,
+) -> None:
+    # arrange
+    rule = make_rule(mocker, batch=True)
+    action = cast("MagicMock", rule.action)
+    action.process_batch.side_effect = [
+        PartialFailureError("1 of 2 failed", errors={"a": RuntimeError("a")}),
+        None,
+    ]
+    rules = {rule_key(rule): rule}
+    outbox.enqueue([(make_entry("a"), rule), (make_entry("b"), rule)])
+
+    # act
+    drain(outbox, rules)
+    pending_after_first_drain = outbox.pending_count()
+    clock.now += RETRY_BASE_DELAY
+    drain(outbox, rules)
+
+    # assert
+    assert pending_after_first_drain == 1
+    assert [
+        [entry.id for entry in call.args[0]]
+        for call in action.process_batch.call_args_list
+    ] == [["a", "b"], ["a"]]
+    assert outbox.pending_count() == 0
+
+
+def test_drain_retries_failed_job_after_backoff(
+    mocker: MockerFixture,
+    outbox: Outbox,
+    clock: FakeClock,
+) -> None:
+    # arrange
+    rule = make_rule(mocker)
+    action = cast("MagicMock", rule.action)
+    action.process.side_effect = [RuntimeError("down"), None]
+    outbox.enqueue([(make_entry("a"), rule)])
+    rules = {rule_key(rule): rule}
+
+    # act
+    drain(outbox, rules)
+    pending_after_failure = outbox.pending_count()
+    drain(outbox, rules)
+    calls_before_due = action.process.call_count
+    clock.now += RETRY_BASE_DELAY
+    drain(outbox, rules)
+
+    # assert
+    assert pending_after_failure == 1
+    assert calls_before_due == 1
+    assert action.process.call_count == 2
+    assert outbox.pending_count() == 0
+
+
+def test_drain_leaves_jobs_of_unknown_rules_pending(
+    mocker: MockerFixture,
+    outbox: Outbox,
+) -> None:
+    # arrange
+    removed = make_rule(mocker, "removed")
+    outbox.enqueue([(make_entry("a"), removed)])
+
+    # act
+    drain(outbox, {})
+
+    # assert
+    cast("MagicMock", removed.action).process.assert_not_called()
+    assert outbox.pending_count() == 1
+
+
+def test_Outbox_prune_deletes_jobs_not_matched_within_ttl(
+    mocker: MockerFixture,
+    tmp_path: Path,
+    clock: FakeClock,
+) -> None:
+    # arrange
+    outbox = Outbox(tmp_path / "outbox.sqlite3", ttl=100, clock=clock)
+    rule = make_rule(mocker, "kept")
+    removed = make_rule(mocker, "removed")
+    outbox.enqueue(
+        [
+            (make_entry("done"), rule),
+            (make_entry("seen_again"), rule),
+            (make_entry("pending"), rule),
+            (make_entry("orphan"), removed),
+        ]
+    )
+    outbox.mark_done(
+        job
+        for job in outbox.due([rule_key(rule)])
+        if job.entry.id in {"done", "seen_again"}
+    )
+    clock.now += 60
+    outbox.enqueue([(make_entry("seen_again"), rule)])
+    clock.now += 60
+
+    # act
+    deleted = outbox.prune([rule_key(rule)])
+
+    # assert
+    assert deleted == 2
+    assert outbox.pending_count() == 1
+    assert outbox.enqueue([(make_entry("seen_again"), rule)]) == 0
+    assert outbox.enqueue([(make_entry("done"), rule)]) == 1
+
+
+def test_Outbox_pending_count_counts_only_given_rules(
+    mocker: MockerFixture,
+    outbox: Outbox,
+) -> None:
+    # arrange
+    rule = make_rule(mocker, "kept")
+    removed = make_rule(mocker, "removed")
+    outbox.enqueue([(make_entry("a"), rule), (make_entry("b"), removed)])
+
+    # act & assert
+    assert outbox.pending_count() == 2
+    assert outbox.pending_count([rule_key(rule)]) == 1
+    assert outbox.pending_count([]) == 0
+
+
+def test_background_drain_runs_jobs_while_active(
+    mocker: MockerFixture,
+    outbox: Outbox,
+) -> None:
+    # arrange
+    rule = make_rule(mocker)
+    processed = threading.Event()
+    action = cast("MagicMock", rule.action)
+    action.process.side_effect = lambda _entry: processed.set()
+
+    # act
+    with background_drain(outbox, {rule_key(rule): rule}, poll_interval=0.01):
+        outbox.enqueue([(make_entry("a"), rule)])
+        ran = processed.wait(timeout=5)
+
+    # assert
+    assert ran
+    action.flush.assert_not_called()
+
+
+def test_process_entries_with_outbox_queues_matches_without_running_actions(
+    mocker: MockerFixture,
+    outbox: Outbox,
+) -> None:
+    # arrange
+    rule = make_rule(mocker)
+    entries = [make_entry("a"), make_entry("b")]
+
+    # act
+    process_entries(entries, [rule], outbox=outbox)
+
+    # assert
+    action = cast("MagicMock", rule.action)
+    action.process.assert_not_called()
+    action.flush.assert_not_called()
+    assert [job.entry for job in outbox.due([rule_key(rule)])] == entries
+
+
+def test_Outbox_due_orders_jobs_by_priority_then_recency(
+    mocker: MockerFixture,
+    outbox: Outbox,
+) -> None:
+    # arrange
+    low = make_rule(mocker, "low")
+    high = make_rule(mocker, "high", priority=10)
+    outbox.enqueue(
+        [
+            (make_entry("low-new", published=3), low),
+            (make_entry("high-old", published=1), high),
+            (make_entry("high-new", published=2), high),
+        ]
+    )
+
+    # act
+    jobs = outbox.due([rule_key(low), rule_key(high)])
+
+    # assert
+    assert [job.entry.id for job in jobs] == ["high-new", "high-old", "low-new"]
+
+
+def test_Outbox_reprioritize_updates_pending_jobs(
+    mocker: MockerFixture,
+    outbox: Outbox,
+) -> None:
+    # arrange
+    first = make_rule(mocker, "first", priority=1)
+    second = make_rule(mocker, "second")
+    outbox.enqueue([(make_entry("a"), first), (make_entry("b"), second)])
+    promoted = second.model_copy(update={"priority": 2})
+
+    # act
+    outbox.reprioritize({rule_key(first): first, rule_key(second): promoted})
+
+    # assert
+    jobs = outbox.due([rule_key(first), rule_key(second)])
+    assert [job.entry.id for job in jobs] == ["b", "a"]
+
+
+def test_Outbox_adds_columns_missing_from_an_older_file(tmp_path: Path) -> None:
+    # arrange
+    path = tmp_path / "outbox.sqlite3"
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "CREATE TABLE jobs (key TEXT PRIMARY KEY, rule_key TEXT NOT NULL,"
+            " entry TEXT NOT NULL, status TEXT NOT NULL DEFAULT 'pending',"
+            " attempts INTEGER NOT NULL DEFAULT 0, next_attempt_at REAL NOT NULL,"
+            " last_error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+    connection.close()
+
+    # act
+    Outbox(path)
+
+    # assert
+    with sqlite3.connect(path) as connection:
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(jobs)")}
+    connection.close()
+    assert {"priority", "published"} <= columns
+
+
+def test_drain_stops_at_budget_and_defers_the_rest_to_next_run(
+    mocker: MockerFixture,
+    outbox: Outbox,
+) -> None:
+    # arrange
+    low = make_rule(mocker, "low", action_type=AddTodoistTaskAction)
+    high = make_rule(mocker, "high", action_type=AddTodoistTaskAction, priority=1)
+    unlimited = make_rule(mocker, "unlimited")
+    outbox.enqueue(
+        [
+            (make_entry("a"), low),
+            (make_entry("b"), high),
+            (make_entry("c"), high),
+            (make_entry("d"), unlimited),
+        ]
+    )
+    rules = {rule_key(rule): rule for rule in [low, high, unlimited]}
+
+    # act
+    drain(outbox, rules, ActionBudget({"add_todoist_task": 2}))
+    pending_after_first_run = outbox.pending_count()
+    drain(outbox, rules, ActionBudget({"add_todoist_task": 2}))
+
+    # assert
+    assert pending_after_first_run == 1
+    assert cast("MagicMock", high.action).process.call_count == 2
+    assert cast("MagicMock", low.action).process.call_count == 1
+    assert cast("MagicMock", unlimited.action).process.call_count == 1
+    assert outbox.pending_count() == 0
+
+
+@pytest.mark.parametrize(
+    ("limits", "requested", "expected"),
+    [
+        pytest.param({}, 5, 5, id="unlimited"),
+        pytest.param({"log": 3}, 5, 3, id="partial"),
+        pytest.param({"log": 0}, 5, 0, id="exhausted"),
+    ],
+)
+def test_ActionBudget_take_grants_at_most_remaining(
+    limits: dict[str, int],
+    requested: int,
+    expected: int,
+) -> None:
+    # arrange
+    budget = ActionBudget(limits)
+
+    # act & assert
+    assert budget.take("log", requested) == expected
+
+
+def test_ActionBudget_take_charges_one_request_per_batch() -> None:
+    # arrange
+    budget = ActionBudget({"log": 3})
+
+    # act
+    first = budget.take("log", 150, per_request=100)
+    second = budget.take("log", 150, per_request=100)
+
+    # assert
+    assert first == 150
+    assert second == 100
+    assert budget.exhausted("log")
+
+
+def test_background_drain_leaves_budgeted_actions_to_final_drain(
+    mocker: MockerFixture,
+    outbox: Outbox,
+) -> None:
+    # arrange
+    budgeted = make_rule(mocker, "budgeted", action_type=AddTodoistTaskAction)
+    other = make_rule(mocker, "other")
+    processed = threading.Event()
+    cast("MagicMock", other.action).process.side_effect = lambda _entry: processed.set()
+    rules = {rule_key(rule): rule for rule in [budgeted, other]}
+    budget = ActionBudget({"add_todoist_task": 10})
+    outbox.enqueue([(make_entry("a"), budgeted), (make_entry("b"), other)])
+
+    # act
+    with background_drain(outbox, rules, budget, poll_interval=0.01):
+        ran = processed.wait(timeout=5)
+
+    # assert
+    assert ran
+    cast("MagicMock", budgeted.action).process.assert_not_called()
+    assert outbox.pending_count() == 1
+
+
+def test_drain_rejects_jobs_that_fail_deterministically(
+    mocker: MockerFixture,
+    outbox: Outbox,
+    clock: FakeClock,
+) -> None:
+    # arrange
+    rule = make_rule(mocker)
+    action = cast("MagicMock", rule.action)
+    action.process.side_effect = InvalidEntryError("no URL")
+    outbox.enqueue([(make_entry("a"), rule)])
+    rules = {rule_key(rule): rule}
+
+    # act
+    drain(outbox, rules)
+    clock.now += RETRY_MAX_DELAY
+    drain(outbox, rules)
+
+    # assert
+    action.process.assert_called_once()
+    assert outbox.pending_count() == 0
+
+
+def test_process_entries_with_outbox_queues_one_job_per_shared_action(
+    outbox: Outbox,
+) -> None:
+    # arrange
+    rules = [
+        Rule(
+            name=name,
+            source=SavedSource(),
+            condition=MatchAllCondition(),
+            action=LogAction(),
+        )
+        for name in ["first", "second"]
+    ]
+
+    # act
+    process_entries([make_entry("a")], rules, outbox=outbox)
+
+    # assert
+    assert outbox.pending_count() == 1
+    assert [job.entry.id for job in outbox.due([rule_key(rules[0])])] == ["a"]
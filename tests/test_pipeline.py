@@ -0,0 +1,154 @@
+"""Tests for the pipeline module."""
+
+import asyncio
+import threading
+import time
+from collections.abc import AsyncGenerator, Sequence
+from functools import partial
+
+import pytest
+
+from feedly_entries_processor.executor import Step
+from feedly_entries_processor.feedly_client import Entry
+from feedly_entries_processor.pipeline import aiter_pages, run, run_pipeline
+
+
+def make_pages(count: int, page_size: int = 2) -> list[list[Entry]]:
+    return [
+        [Entry(id=f"entry{page}_{i}") for i in range(page_size)]
+        for page in range(count)
+    ]
+
+
+async def iterate(pages: Sequence[Sequence[Entry]]) -> AsyncGenerator[Sequence[Entry]]:
+    for page in pages:
+        yield page
+
+
+def test_aiter_pages_yields_pages_of_blocking_iterable() -> None:
+    # arrange
+    entries = (Entry(id=f"entry{i}") for i in range(5))
+
+    async def collect() -> list[list[str]]:
+        return [[entry.id for entry in page] async for page in aiter_pages(entries, 2)]
+
+    # act
+    pages = asyncio.run(collect())
+
+    # assert
+    assert pages == [["entry0", "entry1"], ["entry2", "entry3"], ["entry4"]]
+
+
+def test_run_pipeline_runs_the_steps_of_each_chain_in_order() -> None:
+    # arrange
+    lock = threading.Lock()
+    calls: dict[str, list[int]] = {}
+
+    def record(entry: Entry, step: int) -> None:
+        with lock:
+            calls.setdefault(entry.id, []).append(step)
+
+    def plan(page: Sequence[Entry]) -> list[list[Step]]:
+        return [
+            [("log", partial(record, entry, step)) for step in range(3)]
+            for entry in page
+        ]
+
+    pages = make_pages(10)
+
+    # act
+    run(
+        run_pipeline(iterate(pages), plan, match_tasks=2, action_tasks=4),
+        threads=7,
+    )
+
+    # assert
+    assert calls == {entry.id: [0, 1, 2] for page in pages for entry in page}
+
+
+def test_run_pipeline_stops_fetching_while_actions_are_behind() -> None:
+    # arrange
+    fetched: list[int] = []
+    fetched_during_first_step: list[int] = []
+
+    async def pages() -> AsyncGenerator[Sequence[Entry]]:
+        for index, page in enumerate(make_pages(20)):
+            fetched.append(index)
+            yield page
+
+    def first_step() -> None:
+        if not fetched_during_first_step:
+            time.sleep(0.1)
+            fetched_during_first_step.append(len(fetched))
+
+    def plan(page: Sequence[Entry]) -> list[list[Step]]:
+        return [[("log", first_step)] for _ in page[:1]]
+
+    # act
+    run(run_pipeline(pages(), plan, queue_size=1), threads=3)
+
+    # assert
+    # One page being acted on, one waiting to run, one being planned, one
+    # waiting to be planned and one being fetched.
+    assert fetched_during_first_step[0] <= 5
+    assert len(fetched) == 20
+
+
+def test_run_pipeline_limits_concurrent_steps_per_action_name() -> None:
+    # arrange
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def step() -> None:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.005)
+        with lock:
+            running -= 1
+
+    def plan(page: Sequence[Entry]) -> list[list[Step]]:
+        return [[("add_todoist_task", step)] for _ in page]
+
+    # act
+    run(
+        run_pipeline(
+            iterate(make_pages(5)),
+            plan,
+            action_tasks=4,
+            concurrency={"add_todoist_task": 1},
+        ),
+        threads=6,
+    )
+
+    # assert
+    assert peak == 1
+
+
+@pytest.mark.parametrize(
+    "failing_stage",
+    [
+        pytest.param("fetch", id="fetch"),
+        pytest.param("plan", id="plan"),
+    ],
+)
+def test_run_pipeline_raises_the_error_of_a_failing_stage(failing_stage: str) -> None:
+    # arrange
+    async def pages() -> AsyncGenerator[Sequence[Entry]]:
+        for index, page in enumerate(make_pages(10)):
+            if failing_stage == "fetch" and index == 3:
+                msg = "fetch failed"
+                raise ValueError(msg)
+            yield page
+
+    def plan(page: Sequence[Entry]) -> list[list[Step]]:
+        if failing_stage == "plan" and page[0].id == "entry3_0":
+            msg = "plan failed"
+            raise ValueError(msg)
+        return [[("log", lambda: None)]]
+
+    # act & assert
+    with pytest.raises(ValueError, match=f"{failing_stage} failed"):
+        run(run_pipeline(pages(), plan, queue_size=1), threads=3)
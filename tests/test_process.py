@@ -1,19 +1,48 @@
 """Tests for the process module."""
 
-from typing import cast
-from unittest.mock import MagicMock
+import asyncio
+import json
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
 
 import pytest
+from pydantic import SecretStr
 from pytest_mock import MockerFixture
 
-from feedly_entries_processor.actions import LogAction
-from feedly_entries_processor.conditions import MatchAllCondition
+from feedly_entries_processor.actions import (
+    AddTodoistTaskAction,
+    LogAction,
+    RemoveFromFeedlyTagAction,
+    WriteNdjsonAction,
+)
+from feedly_entries_processor.conditions import (
+    MatchAllCondition,
+    RegexPartialMatchCondition,
+    StreamIdGlobMatchCondition,
+)
 from feedly_entries_processor.config_loader import Rule
-from feedly_entries_processor.exceptions import ActionSkippedDueToPersistentError
-from feedly_entries_processor.feedly_client import Entry
-from feedly_entries_processor.process import process_entries, process_entry
+from feedly_entries_processor.exceptions import (
+    ActionSkippedDueToPersistentError,
+    FeedlyEntriesProcessorError,
+    InvalidEntryError,
+)
+from feedly_entries_processor.feedly_client import Entry, Origin
+from feedly_entries_processor.ledger import Ledger
+from feedly_entries_processor.outbox import Outbox, rule_key
+from feedly_entries_processor.process import (
+    process_entries,
+    process_entries_async,
+    process_entry,
+    sort_by_priority,
+)
+from feedly_entries_processor.quarantine import Quarantine
+from feedly_entries_processor.settings import TodoistSettings
 from feedly_entries_processor.sources import SavedSource
 
+if TYPE_CHECKING:
+    from unittest.mock import MagicMock
+
 
 @pytest.fixture
 def mock_entry() -> Entry:
@@ -39,6 +68,7 @@ def mock_action(mocker: MockerFixture) -> LogAction:
     """Fixture for a mock LogAction."""
     mock = mocker.create_autospec(LogAction)
     mock.name = "log"
+    mock.supports_batch = False
     return mock
 
 
@@ -156,24 +186,623 @@ def test_process_entry_logs_error_when_action_raises_ActionSkippedDueToPersisten
     mock_logger_exception.assert_not_called()
 
 
-def test_process_entries_calls_process_entry_for_each_entry_and_rule(
+def test_process_entries_runs_actions_entry_by_entry_in_rule_order(
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    call_order: list[tuple[str, str]] = []
+    entries = [Entry(id="entry1"), Entry(id="entry2")]
+    rules = []
+    for rule_name in ("rule1", "rule2"):
+        condition = mocker.create_autospec(MatchAllCondition)
+        condition.name = "match_all"
+        condition.compile_batch.return_value.return_value = [True, True]
+        action = mocker.create_autospec(LogAction)
+        action.name = "log"
+        action.supports_batch = False
+        action.process.side_effect = lambda entry, rule_name=rule_name: (
+            call_order.append((entry.id, rule_name))
+        )
+        rules.append(
+            Rule(
+                name=rule_name,
+                source=SavedSource(),
+                condition=condition,
+                action=action,
+            )
+        )
+
+    # act
+    process_entries(entries, rules)
+
+    # assert
+    assert call_order == [
+        ("entry1", "rule1"),
+        ("entry1", "rule2"),
+        ("entry2", "rule1"),
+        ("entry2", "rule2"),
+    ]
+
+
+def test_process_entries_evaluates_each_rule_once_per_page(
+    mock_rule: Rule,
+) -> None:
+    # arrange
+    entries = [Entry(id=f"entry{i}") for i in range(5)]
+    condition = cast("MagicMock", mock_rule.condition)
+    condition.compile_batch.return_value.side_effect = lambda page: [
+        entry.id == "entry3" for entry in page
+    ]
+
+    # act
+    process_entries(entries, [mock_rule], page_size=2)
+
+    # assert
+    pages = [
+        call.args[0] for call in condition.compile_batch.return_value.call_args_list
+    ]
+    assert [[entry.id for entry in page] for page in pages] == [
+        ["entry0", "entry1"],
+        ["entry2", "entry3"],
+        ["entry4"],
+    ]
+    condition.compile_batch.assert_called_once_with()
+    condition.matches.assert_not_called()
+    cast("MagicMock", mock_rule.action).process.assert_called_once_with(entries[3])
+
+
+def test_process_entries_falls_back_to_per_entry_evaluation_when_compiled_condition_raises(
+    mocker: MockerFixture,
+    mock_rule: Rule,
+) -> None:
+    # arrange
+    entries = [Entry(id="good"), Entry(id="bad")]
+    condition = cast("MagicMock", mock_rule.condition)
+    condition.compile_batch.return_value.side_effect = Exception("Test exception")
+
+    def matches(entry: Entry) -> bool:
+        if entry.id == "bad":
+            msg = "bad entry"
+            raise ValueError(msg)
+        return True
+
+    condition.matches.side_effect = matches
+    mock_logger_exception = mocker.patch(
+        "feedly_entries_processor.process.logger.exception"
+    )
+
+    # act
+    process_entries(entries, [mock_rule])
+
+    # assert
+    cast("MagicMock", mock_rule.action).process.assert_called_once_with(entries[0])
+    mock_logger_exception.assert_called_once()
+
+
+def test_process_entries_passes_page_matches_to_batch_actions_and_flushes_once(
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    entries = [Entry(id=f"entry{i}") for i in range(5)]
+    condition = mocker.create_autospec(MatchAllCondition)
+    condition.name = "match_all"
+    condition.compile_batch.return_value.side_effect = lambda page: [
+        entry.id != "entry1" for entry in page
+    ]
+    action = mocker.create_autospec(RemoveFromFeedlyTagAction)
+    action.name = "remove_from_feedly_tag"
+    action.tag = "global.saved"
+    action.supports_batch = True
+    rule = Rule(
+        name="batch-rule",
+        source=SavedSource(),
+        condition=condition,
+        action=action,
+    )
+
+    # act
+    process_entries(entries, [rule], page_size=3)
+
+    # assert
+    assert [call.args[0] for call in action.process_batch.call_args_list] == [
+        [entries[0], entries[2]],
+        [entries[3], entries[4]],
+    ]
+    action.process.assert_not_called()
+    action.flush.assert_called_once_with()
+
+
+def test_process_entries_with_action_workers_keeps_rule_order_per_entry(
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    lock = threading.Lock()
+    calls: dict[str, list[str]] = {}
+    entries = [Entry(id=f"entry{i}") for i in range(20)]
+    rules = []
+    for rule_name in ("rule1", "rule2", "rule3"):
+        condition = mocker.create_autospec(MatchAllCondition)
+        condition.name = "match_all"
+        condition.compile_batch.return_value.side_effect = lambda page: (
+            [True] * len(page)
+        )
+        action = mocker.create_autospec(LogAction)
+        action.name = "log"
+        action.supports_batch = False
+
+        def record(entry: Entry, rule_name: str = rule_name) -> None:
+            with lock:
+                calls.setdefault(entry.id, []).append(rule_name)
+
+        action.process.side_effect = record
+        rules.append(
+            Rule(
+                name=rule_name,
+                source=SavedSource(),
+                condition=condition,
+                action=action,
+            )
+        )
+
+    # act
+    process_entries(entries, rules, action_workers=4, action_concurrency={"log": 2})
+
+    # assert
+    assert calls == {entry.id: ["rule1", "rule2", "rule3"] for entry in entries}
+
+
+def test_sort_by_priority_orders_rules_by_descending_priority_then_name(
+    mock_rule: Rule,
+) -> None:
+    # arrange
+    rules = [
+        mock_rule.model_copy(update={"name": "b"}),
+        mock_rule.model_copy(update={"name": "urgent", "priority": 5}),
+        mock_rule.model_copy(update={"name": "a"}),
+        mock_rule.model_copy(update={"name": "later", "priority": -1}),
+    ]
+
+    # act
+    result = sort_by_priority(rules)
+
+    # assert
+    assert [rule.name for rule in result] == ["urgent", "a", "b", "later"]
+
+
+def test_process_entries_with_ledger_skips_entries_handled_in_earlier_runs(
+    mocker: MockerFixture,
+    tmp_path: Path,
+) -> None:
+    # arrange
+    rule = Rule(
+        name="ledger-rule",
+        source=SavedSource(),
+        condition=RegexPartialMatchCondition(fields=("title",), patterns=("match",)),
+        action=LogAction(),
+    )
+
+    def process(entry: Entry) -> None:
+        if entry.id == "fails":
+            raise RuntimeError(entry.id)
+
+    mock_process = mocker.patch.object(LogAction, "_process", side_effect=process)
+    ledger = Ledger(tmp_path / "ledger.sqlite3", ttl=3600)
+    entries = [
+        Entry(id="ok", title="match"),
+        Entry(id="no-match", title="other"),
+        Entry(id="fails", title="match"),
+    ]
+
+    # act
+    process_entries(entries, [rule], ledger=ledger)
+    process_entries(entries, [rule], ledger=ledger)
+
+    # assert
+    assert [call.args[0].id for call in mock_process.call_args_list] == [
+        "ok",
+        "fails",
+        "fails",
+    ]
+    assert ledger.seen(rule, ["ok", "no-match", "fails"]) == {"ok", "no-match"}
+
+
+@pytest.mark.parametrize(
+    "pipelined",
+    [
+        pytest.param(False, id="process_entries"),
+        pytest.param(True, id="process_entries_async"),
+    ],
+)
+def test_process_entries_with_ledger_records_deferred_entries_once_flushed(
+    mocker: MockerFixture,
+    tmp_path: Path,
+    *,
+    pipelined: bool,
+) -> None:
+    # arrange
+    client = mocker.MagicMock()
+    client.remove_entries_from_tag.side_effect = [
+        FeedlyEntriesProcessorError("unavailable"),
+        None,
+        None,
+    ]
+    mocker.patch(
+        "feedly_entries_processor.actions.remove_from_feedly_tag_action.create_feedly_client",
+        return_value=client,
+    )
+    mocker.patch(
+        "feedly_entries_processor.actions.remove_from_feedly_tag_action.UNTAG_CHUNK_SIZE",
+        1,
+    )
+    rule = Rule(
+        name="untag-rule",
+        source=SavedSource(),
+        condition=MatchAllCondition(),
+        action=RemoveFromFeedlyTagAction(tag="global.saved"),
+    )
+    ledger = Ledger(tmp_path / "ledger.sqlite3", ttl=3600)
+    entries = [Entry(id="fails"), Entry(id="removed")]
+
+    def run() -> None:
+        if pipelined:
+            asyncio.run(process_entries_async(entries, [rule], ledger=ledger))
+        else:
+            process_entries(entries, [rule], ledger=ledger)
+
+    # act
+    run()
+    seen_after_first_run = ledger.seen(rule, ["fails", "removed"])
+    run()
+
+    # assert
+    assert seen_after_first_run == {"removed"}
+    assert [call.args[1] for call in client.remove_entries_from_tag.call_args_list] == [
+        ["fails"],
+        ["removed"],
+        ["fails"],
+    ]
+    assert ledger.seen(rule, ["fails", "removed"]) == {"fails", "removed"}
+
+
+def test_process_entries_with_ledger_records_entries_a_batch_action_succeeded_for(
     mocker: MockerFixture,
+    tmp_path: Path,
 ) -> None:
     # arrange
-    mock_process_entry = mocker.patch("feedly_entries_processor.process.process_entry")
-    entry1, entry2 = MagicMock(spec=Entry), MagicMock(spec=Entry)
-    rule1, rule2 = MagicMock(spec=Rule), MagicMock(spec=Rule)
-    entries = [entry1, entry2]
-    rules = [rule1, rule2]
+    rule = Rule(
+        name="todoist-rule",
+        source=SavedSource(),
+        condition=MatchAllCondition(),
+        action=AddTodoistTaskAction(
+            project_id="project",
+            use_sync_api=True,
+            todoist_settings=TodoistSettings.model_construct(
+                todoist_api_token=SecretStr("token")
+            ),
+        ),
+    )
+    sent: list[dict[str, str]] = []
+
+    def sync(
+        _token: str, commands: list[dict[str, Any]], **_: object
+    ) -> dict[str, Any]:
+        sent.extend(
+            {"uuid": command["uuid"], "content": command["args"]["content"]}
+            for command in commands
+        )
+        return {
+            command["uuid"]: {"error": "Service unavailable", "http_code": 503}
+            if command["args"]["content"].startswith("fails") and len(sent) <= 2
+            else "ok"
+            for command in commands
+        }
+
+    mocker.patch(
+        "feedly_entries_processor.actions.add_todoist_task_action.sync_commands_with_retry",
+        side_effect=sync,
+    )
+    ledger = Ledger(tmp_path / "ledger.sqlite3", ttl=3600)
+    entries = [
+        Entry(
+            id=entry_id, title=entry_id, canonical_url=f"https://example.com/{entry_id}"
+        )
+        for entry_id in ("fails", "added")
+    ]
+
+    # act
+    process_entries(entries, [rule], ledger=ledger)
+    process_entries(entries, [rule], ledger=ledger)
+
+    # assert
+    assert [command["content"] for command in sent] == [
+        "fails - https://example.com/fails",
+        "added - https://example.com/added",
+        "fails - https://example.com/fails",
+    ]
+    assert sent[0]["uuid"] == sent[2]["uuid"]
+    assert ledger.seen(rule, ["fails", "added"]) == {"fails", "added"}
+
+
+def test_process_entries_with_quarantine_skips_entries_that_failed_deterministically(
+    mocker: MockerFixture,
+    tmp_path: Path,
+) -> None:
+    # arrange
+    rule = Rule(
+        name="quarantine-rule",
+        source=SavedSource(),
+        condition=MatchAllCondition(),
+        action=LogAction(),
+    )
+
+    def process(entry: Entry) -> None:
+        if entry.id == "invalid":
+            raise InvalidEntryError(entry.id)
+        if entry.id == "flaky":
+            raise RuntimeError(entry.id)
+
+    mock_process = mocker.patch.object(LogAction, "_process", side_effect=process)
+    mock_logger_exception = mocker.patch(
+        "feedly_entries_processor.process.logger.exception"
+    )
+    quarantine = Quarantine(tmp_path / "quarantine.sqlite3", ttl=3600)
+    entries = [Entry(id="invalid"), Entry(id="flaky")]
+
+    # act
+    process_entries(entries, [rule], quarantine=quarantine)
+    process_entries(entries, [rule], quarantine=quarantine)
+
+    # assert
+    assert [call.args[0].id for call in mock_process.call_args_list] == [
+        "invalid",
+        "flaky",
+        "flaky",
+    ]
+    assert mock_logger_exception.call_count == 2
+    assert quarantine.quarantined(rule, ["invalid", "flaky"]) == {"invalid"}
+
+
+def test_process_entries_runs_identical_actions_of_several_rules_once(
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    entries = [Entry(id="entry0", title="first"), Entry(id="entry1", title="second")]
+    rules = [
+        Rule(
+            name=name,
+            source=SavedSource(),
+            condition=RegexPartialMatchCondition(
+                fields=("title",), patterns=(pattern,)
+            ),
+            action=LogAction(level=level),
+        )
+        for name, pattern, level in [
+            ("any", ".", "info"),
+            ("first", "first", "info"),
+            ("debug", "first", "debug"),
+        ]
+    ]
+    mock_process = mocker.patch.object(LogAction, "_process")
+    mock_log_match = mocker.patch("feedly_entries_processor.process._log_match")
 
     # act
     process_entries(entries, rules)
 
     # assert
-    expected_calls = [
-        mocker.call(entry1, rule1),
-        mocker.call(entry1, rule2),
-        mocker.call(entry2, rule1),
-        mocker.call(entry2, rule2),
+    assert [call.args[0].id for call in mock_process.call_args_list] == [
+        "entry0",
+        "entry0",
+        "entry1",
     ]
-    assert mock_process_entry.call_args_list == expected_calls
+    assert [
+        (call.args[0].id, call.args[1].name) for call in mock_log_match.call_args_list
+    ] == [
+        ("entry0", "any"),
+        ("entry0", "first"),
+        ("entry0", "debug"),
+        ("entry1", "any"),
+    ]
+
+
+def test_process_entries_passes_each_entry_once_to_batch_action_shared_by_rules(
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    entries = [Entry(id=f"entry{i}") for i in range(3)]
+    rules = [
+        Rule(
+            name=name,
+            source=SavedSource(),
+            condition=MatchAllCondition(),
+            action=RemoveFromFeedlyTagAction(tag="global.saved"),
+        )
+        for name in ["first", "second"]
+    ]
+    mock_process_batch = mocker.patch.object(
+        RemoveFromFeedlyTagAction, "_process_batch"
+    )
+    mocker.patch.object(RemoveFromFeedlyTagAction, "flush")
+
+    # act
+    process_entries(entries, rules, page_size=3)
+
+    # assert
+    mock_process_batch.assert_called_once_with(entries)
+
+
+def test_process_entries_async_runs_actions_like_process_entries(
+    mocker: MockerFixture,
+    tmp_path: Path,
+) -> None:
+    # arrange
+    lock = threading.Lock()
+    calls: dict[str, list[str]] = {}
+    rules = [
+        Rule(
+            name=rule_name,
+            source=SavedSource(),
+            condition=RegexPartialMatchCondition(
+                fields=("title",), patterns=("match",)
+            ),
+            action=LogAction(level=level),
+        )
+        for rule_name, level in (("rule1", "info"), ("rule2", "debug"))
+    ]
+    output = tmp_path / "entries.ndjson"
+    rules.append(
+        Rule(
+            name="batch-rule",
+            source=SavedSource(),
+            condition=MatchAllCondition(),
+            action=WriteNdjsonAction(path=output),
+        )
+    )
+
+    def process(self: LogAction, entry: Entry) -> None:
+        with lock:
+            calls.setdefault(entry.id, []).append(self.level)
+
+    mocker.patch.object(LogAction, "_process", autospec=True, side_effect=process)
+    ledger = Ledger(tmp_path / "ledger.sqlite3", ttl=3600)
+    entries = [
+        Entry(id=f"entry{i}", title="match" if i % 2 else "other") for i in range(9)
+    ]
+
+    # act
+    asyncio.run(
+        process_entries_async(
+            entries, rules, page_size=2, action_tasks=4, ledger=ledger
+        )
+    )
+
+    # assert
+    assert calls == {
+        entry.id: ["info", "debug"] for entry in entries if entry.title == "match"
+    }
+    written = [json.loads(line)["id"] for line in output.read_text().splitlines()]
+    assert sorted(written) == sorted(entry.id for entry in entries)
+    assert ledger.seen(rules[0], [entry.id for entry in entries]) == {
+        entry.id for entry in entries
+    }
+
+
+@pytest.mark.parametrize(
+    "queued",
+    [
+        pytest.param(False, id="actions"),
+        pytest.param(True, id="outbox"),
+    ],
+)
+def test_process_entries_async_records_and_queues_like_process_entries(
+    mocker: MockerFixture,
+    tmp_path: Path,
+    *,
+    queued: bool,
+) -> None:
+    # arrange
+    rules = [
+        Rule(
+            name=rule_name,
+            source=SavedSource(),
+            condition=RegexPartialMatchCondition(
+                fields=("title",), patterns=(pattern,)
+            ),
+            action=LogAction(level=level),
+        )
+        for rule_name, pattern, level in (
+            ("rule1", "match", "info"),
+            ("rule2", "other", "debug"),
+        )
+    ]
+
+    def process(entry: Entry) -> None:
+        if entry.id == "entry3":
+            raise RuntimeError(entry.id)
+
+    mocker.patch.object(LogAction, "_process", side_effect=process)
+    entries = [
+        Entry(id=f"entry{i}", title="match" if i % 2 else "other") for i in range(7)
+    ]
+    entry_ids = [entry.id for entry in entries]
+
+    def run(engine: str) -> tuple[list[set[str]], list[tuple[str, str]]]:
+        ledger = Ledger(tmp_path / f"{engine}-ledger.sqlite3", ttl=3600)
+        outbox = Outbox(tmp_path / f"{engine}-outbox.sqlite3") if queued else None
+        if engine == "async":
+            asyncio.run(
+                process_entries_async(
+                    entries,
+                    rules,
+                    page_size=2,
+                    action_tasks=3,
+                    outbox=outbox,
+                    ledger=ledger,
+                )
+            )
+        else:
+            process_entries(entries, rules, page_size=2, outbox=outbox, ledger=ledger)
+        jobs = (
+            outbox.due([rule_key(rule) for rule in rules]) if outbox is not None else []
+        )
+        return (
+            [ledger.seen(rule, entry_ids) for rule in rules],
+            sorted((job.rule_key, job.entry.id) for job in jobs),
+        )
+
+    # act
+    serial = run("serial")
+    pipelined = run("async")
+
+    # assert
+    assert pipelined == serial
+    seen, jobs = serial
+    assert seen[0] == set(entry_ids) - ({"entry3"} if not queued else set())
+    assert len(jobs) == (len(entries) if queued else 0)
+
+
+def test_process_entries_async_matches_stream_id_globs_with_several_match_tasks(
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    lock = threading.Lock()
+    calls: set[tuple[str, str]] = set()
+    rules = [
+        Rule(
+            name=f"feed-{feed}",
+            source=SavedSource(),
+            condition=StreamIdGlobMatchCondition(
+                patterns=frozenset({f"feed/{feed}/*"})
+            ),
+            action=LogAction(level=level),
+        )
+        for feed, level in (("a", "info"), ("b", "debug"))
+    ]
+
+    def process(self: LogAction, entry: Entry) -> None:
+        with lock:
+            calls.add((entry.id, self.level))
+
+    mocker.patch.object(LogAction, "_process", autospec=True, side_effect=process)
+    entries = [
+        Entry(
+            id=f"entry{i}",
+            origin=Origin(
+                html_url="https://example.com",
+                stream_id=f"feed/{'ab'[i % 2]}/{i}",
+                title="Feed",
+            ),
+        )
+        for i in range(200)
+    ]
+
+    # act
+    asyncio.run(
+        process_entries_async(
+            entries, rules, page_size=3, match_tasks=8, action_tasks=4
+        )
+    )
+
+    # assert
+    assert calls == {
+        (entry.id, "info" if i % 2 == 0 else "debug") for i, entry in enumerate(entries)
+    }
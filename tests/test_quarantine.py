@@ -0,0 +1,142 @@
+"""Tests for the quarantine module."""
+
+from pathlib import Path
+
+import pytest
+
+from feedly_entries_processor.actions import LogAction
+from feedly_entries_processor.exceptions import (
+    ActionSkippedDueToPersistentError,
+    InvalidEntryError,
+    PartialFailureError,
+    TodoistApiError,
+)
+from feedly_entries_processor.feedly_client import Entry
+from feedly_entries_processor.quarantine import (
+    Quarantine,
+    QuarantineMatcher,
+    classify_batch_failure,
+    classify_failure,
+)
+from tests.helpers import FakeClock, FakeMatcher, make_rule
+
+TTL = 100.0
+
+
+def api_error(status_code: int) -> TodoistApiError:
+    return TodoistApiError("failed", details={"status_code": status_code})
+
+
+@pytest.fixture
+def quarantine(tmp_path: Path, clock: FakeClock) -> Quarantine:
+    """Fixture for a quarantine in a temporary directory."""
+    return Quarantine(tmp_path / "quarantine.sqlite3", ttl=TTL, clock=clock)
+
+
+@pytest.mark.parametrize(
+    ("error", "expected"),
+    [
+        pytest.param(InvalidEntryError("no URL"), "no URL", id="invalid_entry"),
+        pytest.param(api_error(400), "HTTP 400: failed", id="400"),
+        pytest.param(api_error(404), "HTTP 404: failed", id="404"),
+        pytest.param(api_error(401), None, id="401"),
+        pytest.param(api_error(429), None, id="429"),
+        pytest.param(api_error(503), None, id="503"),
+        pytest.param(TodoistApiError("no status"), None, id="no_status"),
+        pytest.param(
+            ValueError("TODOIST_API_TOKEN must be set"), None, id="value_error"
+        ),
+        pytest.param(ActionSkippedDueToPersistentError("skipped"), None, id="skipped"),
+        pytest.param(RuntimeError("boom"), None, id="other"),
+    ],
+)
+def test_classify_failure_returns_reason_only_for_deterministic_failures(
+    error: Exception,
+    expected: str | None,
+) -> None:
+    # act & assert
+    assert classify_failure(error) == expected
+
+
+def test_classify_batch_failure_classifies_per_entry_errors() -> None:
+    # arrange
+    entries = [Entry(id=entry_id) for entry_id in ["a", "b", "c", "d"]]
+    error = PartialFailureError(
+        "3 of 4 Todoist tasks could not be added",
+        errors={
+            "a": InvalidEntryError("Entry has no URL (canonical_url or alternate)."),
+            "b": api_error(400),
+            "c": api_error(429),
+        },
+    )
+
+    # act
+    result = classify_batch_failure(error, entries)
+
+    # assert
+    assert result == {
+        "a": "Entry has no URL (canonical_url or alternate).",
+        "b": "HTTP 400: failed",
+    }
+
+
+@pytest.mark.parametrize(
+    ("error", "expected"),
+    [
+        pytest.param(api_error(400), {"a", "b"}, id="deterministic"),
+        pytest.param(api_error(503), set(), id="transient"),
+    ],
+)
+def test_classify_batch_failure_applies_other_errors_to_every_entry(
+    error: Exception,
+    expected: set[str],
+) -> None:
+    # arrange
+    entries = [Entry(id="a"), Entry(id="b")]
+
+    # act & assert
+    assert set(classify_batch_failure(error, entries)) == expected
+
+
+def test_Quarantine_skips_pairs_until_expiry_or_rule_change(
+    tmp_path: Path,
+    quarantine: Quarantine,
+    clock: FakeClock,
+) -> None:
+    # arrange
+    rule = make_rule("rule")
+    changed = rule.model_copy(update={"action": LogAction(level="debug")})
+
+    # act
+    quarantine.add(rule, {"a": "no URL"})
+    reopened = Quarantine(tmp_path / "quarantine.sqlite3", ttl=TTL, clock=clock)
+    before_expiry = reopened.quarantined(rule, ["a", "b"])
+    for_changed_rule = reopened.quarantined(changed, ["a"])
+    clock.now += TTL
+    after_expiry = reopened.quarantined(rule, ["a"])
+
+    # assert
+    assert before_expiry == {"a"}
+    assert for_changed_rule == set()
+    assert after_expiry == set()
+    assert len(Quarantine(tmp_path / "quarantine.sqlite3", ttl=TTL, clock=clock)) == 0
+
+
+def test_QuarantineMatcher_skips_quarantined_pairs(quarantine: Quarantine) -> None:
+    # arrange
+    first = make_rule("first")
+    second = make_rule("second")
+    quarantine.add(first, {"a": "HTTP 400", "b": "HTTP 400"})
+    quarantine.add(second, {"a": "HTTP 400"})
+    inner = FakeMatcher(
+        [first, second], {("b", "first"), ("b", "second"), ("c", "first")}
+    )
+    matcher = QuarantineMatcher(inner, quarantine)
+    page = [Entry(id=entry_id) for entry_id in ["a", "b", "c"]]
+
+    # act
+    matched = matcher.match_page(page)
+
+    # assert
+    assert inner.pages == [["b", "c"]]
+    assert matched == [(1, second), (2, first)]
@@ -0,0 +1,289 @@
+"""Tests for the rate limiters."""
+
+import contextlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pytest_mock import MockerFixture
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import HTTPError, Timeout
+
+from feedly_entries_processor.rate_limit import (
+    AimdConcurrencyLimiter,
+    ConcurrencyStats,
+    RateLimiterRegistry,
+    RateLimiterStats,
+    ThrottledAdapter,
+    TokenBucket,
+    is_retryable_error,
+)
+from tests.helpers import FakeClock
+
+
+def test_TokenBucket_allows_a_burst_then_spaces_requests_at_the_rate(
+    clock: FakeClock,
+) -> None:
+    # arrange
+    bucket = TokenBucket(rate=2.0, burst=3, clock=clock, sleep=clock.sleep)
+
+    # act
+    waits = [bucket.acquire() for _ in range(5)]
+
+    # assert
+    assert waits == [0.0, 0.0, 0.0, 0.5, 1.0]
+    assert clock.sleeps == [0.5, 1.0]
+
+
+def test_TokenBucket_refills_over_time_up_to_the_burst(clock: FakeClock) -> None:
+    # arrange
+    bucket = TokenBucket(rate=1.0, burst=2, clock=clock, sleep=clock.sleep)
+    bucket.acquire()
+    bucket.acquire()
+
+    # act
+    clock.now = 100.0
+    waits = [bucket.acquire() for _ in range(3)]
+
+    # assert
+    assert waits == [0.0, 0.0, 1.0]
+
+
+def test_TokenBucket_stats_report_wait_times(clock: FakeClock) -> None:
+    # arrange
+    bucket = TokenBucket(rate=4.0, burst=1, clock=clock, sleep=clock.sleep)
+
+    # act
+    for _ in range(3):
+        bucket.acquire()
+
+    # assert
+    assert bucket.stats == RateLimiterStats(
+        acquisitions=3, waits=2, total_wait=0.75, max_wait=0.5
+    )
+
+
+def test_TokenBucket_reserves_distinct_slots_for_concurrent_callers(
+    clock: FakeClock,
+) -> None:
+    # arrange
+    bucket = TokenBucket(rate=10.0, burst=1, clock=clock, sleep=clock.sleep)
+
+    # act
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        waits = list(executor.map(lambda _: bucket.acquire(), range(20)))
+
+    # assert
+    assert sorted(waits) == pytest.approx([i / 10 for i in range(20)])
+
+
+def test_ThrottledAdapter_acquires_a_token_before_each_send(
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    limiter = mocker.create_autospec(TokenBucket, instance=True)
+    send = mocker.patch.object(HTTPAdapter, "send", autospec=True)
+    adapter = ThrottledAdapter(limiter, None)
+    request = PreparedRequest()
+
+    # act
+    adapter.send(request)
+    adapter.send(request)
+
+    # assert
+    assert limiter.acquire.call_count == 2
+    assert send.call_count == 2
+
+
+def test_RateLimiterRegistry_creates_limiters_from_settings(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # arrange
+    monkeypatch.setenv("FEEDLY_RATE_LIMIT", "5")
+    monkeypatch.setenv("FEEDLY_RATE_BURST", "2")
+    monkeypatch.delenv("TODOIST_RATE_LIMIT", raising=False)
+    registry = RateLimiterRegistry()
+
+    # act
+    feedly = registry.get("feedly")
+    todoist = registry.get("todoist")
+
+    # assert
+    assert isinstance(feedly, TokenBucket)
+    assert registry.get("feedly") is feedly
+    assert isinstance(todoist, TokenBucket)
+    assert isinstance(registry.adapter("feedly", max_retries=1), ThrottledAdapter)
+
+
+def test_RateLimiterRegistry_leaves_rate_of_unconfigured_api_unlimited(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # arrange
+    monkeypatch.delenv("FEEDLY_RATE_LIMIT", raising=False)
+    monkeypatch.setenv("FEEDLY_MAX_CONCURRENCY", "3")
+    registry = RateLimiterRegistry()
+
+    # act
+    limiter = registry.get("feedly")
+    concurrency = registry.concurrency("feedly")
+
+    # assert
+    assert limiter is None
+    assert concurrency.stats == ConcurrencyStats(limit=1, peak_limit=1, backoffs=0)
+
+
+def test_RateLimiterRegistry_log_stats_reports_limits_of_used_apis(
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    mock_logger_info = mocker.patch("feedly_entries_processor.rate_limit.logger.info")
+    registry = RateLimiterRegistry()
+    registry.concurrency("todoist")
+
+    # act
+    registry.log_stats()
+
+    # assert
+    mock_logger_info.assert_called_once()
+    message = mock_logger_info.call_args.args[0]
+    assert "Concurrency limit for 'todoist': 1" in message
+    assert "Rate limiter:" in message
+
+
+def test_AimdConcurrencyLimiter_increases_additively_up_to_the_maximum(
+    clock: FakeClock,
+) -> None:
+    # arrange
+    limiter = AimdConcurrencyLimiter("api", maximum=3, clock=clock)
+    limits = []
+
+    # act
+    for _ in range(8):
+        limiter.release(limiter.acquire(), overloaded=False)
+        limits.append(limiter.limit)
+
+    # assert
+    assert limits == [2, 2, 2, 3, 3, 3, 3, 3]
+
+
+def test_AimdConcurrencyLimiter_backs_off_once_per_congestion_episode(
+    clock: FakeClock,
+) -> None:
+    # arrange
+    limiter = AimdConcurrencyLimiter("api", maximum=64, clock=clock)
+    for _ in range(60):
+        clock.now += 1
+        limiter.release(limiter.acquire(), overloaded=False)
+    before = limiter.limit
+    clock.now += 1
+    in_flight = [limiter.acquire() for _ in range(3)]
+
+    # act: three requests of the same episode fail, then a later one fails
+    clock.now += 1
+    for started in in_flight:
+        limiter.release(started, overloaded=True)
+    clock.now += 1
+    limiter.release(limiter.acquire(), overloaded=True)
+
+    # assert
+    assert before == 11
+    assert limiter.stats == ConcurrencyStats(limit=2, peak_limit=11, backoffs=2)
+
+
+def test_AimdConcurrencyLimiter_holds_limit_for_slow_responses(
+    clock: FakeClock,
+) -> None:
+    # arrange
+    limiter = AimdConcurrencyLimiter("api", maximum=8, latency_target=1.0, clock=clock)
+
+    # act
+    started = limiter.acquire()
+    clock.now += 2.0
+    limiter.release(started, overloaded=False)
+
+    # assert
+    assert limiter.limit == 1
+
+
+def test_AimdConcurrencyLimiter_blocks_requests_above_the_limit() -> None:
+    # arrange
+    limiter = AimdConcurrencyLimiter("api", maximum=1)
+    started = limiter.acquire()
+    acquired = threading.Event()
+
+    def acquire_second() -> None:
+        limiter.release(limiter.acquire(), overloaded=False)
+        acquired.set()
+
+    thread = threading.Thread(target=acquire_second)
+
+    # act
+    thread.start()
+    blocked = not acquired.wait(timeout=0.1)
+    limiter.release(started, overloaded=False)
+    thread.join(timeout=5)
+
+    # assert
+    assert blocked
+    assert acquired.is_set()
+
+
+@pytest.mark.parametrize(
+    ("outcome", "expected_limit"),
+    [
+        pytest.param(200, 2, id="ok"),
+        pytest.param(429, 1, id="too_many_requests"),
+        pytest.param(503, 1, id="unavailable"),
+        pytest.param(Timeout(), 1, id="timeout"),
+    ],
+)
+def test_ThrottledAdapter_reports_outcome_to_concurrency_limiter(
+    mocker: MockerFixture,
+    outcome: int | Exception,
+    expected_limit: int,
+) -> None:
+    # arrange
+    concurrency = AimdConcurrencyLimiter("api", maximum=8)
+    concurrency.release(concurrency.acquire(), overloaded=False)
+    response = Response()
+    if isinstance(outcome, Exception):
+        mocker.patch.object(HTTPAdapter, "send", side_effect=outcome)
+    else:
+        response.status_code = outcome
+        mocker.patch.object(HTTPAdapter, "send", return_value=response)
+    adapter = ThrottledAdapter(None, concurrency)
+
+    # act
+    with contextlib.suppress(Timeout):
+        adapter.send(PreparedRequest())
+
+    # assert
+    assert concurrency.limit == expected_limit
+
+
+def _http_error(status_code: int) -> HTTPError:
+    response = Response()
+    response.status_code = status_code
+    return HTTPError(response=response)
+
+
+@pytest.mark.parametrize(
+    ("exc", "expected"),
+    [
+        pytest.param(_http_error(429), True, id="too_many_requests"),
+        pytest.param(_http_error(503), True, id="unavailable"),
+        pytest.param(_http_error(404), False, id="not_found"),
+        pytest.param(HTTPError(), False, id="http_error_without_response"),
+        pytest.param(Timeout(), True, id="timeout"),
+        pytest.param(RequestsConnectionError(), True, id="connection_error"),
+        pytest.param(ValueError(), False, id="other_error"),
+    ],
+)
+def test_is_retryable_error(*, exc: BaseException, expected: bool) -> None:
+    # act
+    result = is_retryable_error(exc)
+
+    # assert
+    assert result is expected
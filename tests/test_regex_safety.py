@@ -0,0 +1,38 @@
+"""Tests for the regex_safety module."""
+
+import pytest
+
+from feedly_entries_processor.regex_safety import has_nested_unbounded_quantifier
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        pytest.param(r"(a+)+", True, id="plus_of_plus"),
+        pytest.param(r"(\w+\s?)*", True, id="star_of_words"),
+        pytest.param(r"(?:a*)*", True, id="non_capturing_group"),
+        pytest.param(r"((a+))+", True, id="nested_groups"),
+        pytest.param(r"(?P<word>a+)*", True, id="named_group"),
+        pytest.param(r"(?i)(a+)+", True, id="after_inline_flags"),
+        pytest.param(r"(a{1,}){2,}", True, id="unbounded_braces"),
+        pytest.param(r"a+b+", False, id="sequential_quantifiers"),
+        pytest.param(r"(a+b)?", False, id="optional_group"),
+        pytest.param(r"(a+){3}", False, id="bounded_outer_repeat"),
+        pytest.param(r"(a{1,3})+", False, id="bounded_inner_repeat"),
+        pytest.param(r"(?>a+)+", False, id="atomic_group"),
+        pytest.param(r"(a++)+", False, id="possessive_inner"),
+        pytest.param(r"(a|b)*", False, id="alternation"),
+        pytest.param(r"\(a+\)+", False, id="escaped_parentheses"),
+        pytest.param(r"[(+]+", False, id="character_class"),
+        pytest.param(r"a{x}+", False, id="literal_braces"),
+    ],
+)
+def test_has_nested_unbounded_quantifier_returns_expected(
+    pattern: str,
+    expected: bool,
+) -> None:
+    # act
+    result = has_nested_unbounded_quantifier(pattern)
+
+    # assert
+    assert result is expected
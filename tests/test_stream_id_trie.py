@@ -0,0 +1,89 @@
+"""Tests for the StreamIdTrie."""
+
+import pytest
+
+from feedly_entries_processor.stream_id_trie import StreamIdTrie
+
+
+@pytest.fixture
+def trie() -> StreamIdTrie[str]:
+    """Fixture for a trie with exact, prefix and glob patterns."""
+    trie: StreamIdTrie[str] = StreamIdTrie()
+    trie.add("feed/https://example.com/rss", "exact")
+    trie.add("feed/https://example.com/*", "site")
+    trie.add("feed/https://example.com/*", "site-again")
+    trie.add("feed/*/atom.xml", "atom")
+    trie.add("feed/https://*.example.org/**", "subdomains")
+    trie.add("*", "everything")
+    return trie
+
+
+@pytest.mark.parametrize(
+    ("stream_id", "expected"),
+    [
+        pytest.param(
+            "feed/https://example.com/rss",
+            {"exact", "site", "site-again", "everything"},
+            id="exact_and_prefix",
+        ),
+        pytest.param(
+            "feed/https://example.com/",
+            {"site", "site-again", "everything"},
+            id="wildcard_matches_empty",
+        ),
+        pytest.param(
+            "feed/https://example.com/blog/atom.xml",
+            {"site", "site-again", "atom", "everything"},
+            id="wildcard_spans_slashes",
+        ),
+        pytest.param(
+            "feed/https://news.example.org/feed",
+            {"subdomains", "everything"},
+            id="wildcard_in_the_middle",
+        ),
+        pytest.param(
+            "feed/https://example.net/rss",
+            {"everything"},
+            id="only_catch_all",
+        ),
+        pytest.param(
+            "feed/https://example.com/atom.xml.bak",
+            {"site", "site-again", "everything"},
+            id="glob_must_match_to_the_end",
+        ),
+    ],
+)
+def test_StreamIdTrie_lookup_returns_values_of_matching_patterns(
+    trie: StreamIdTrie[str],
+    stream_id: str,
+    expected: set[str],
+) -> None:
+    # act
+    result = trie.lookup(stream_id)
+
+    # assert
+    assert result == expected
+
+
+def test_StreamIdTrie_has_globs_is_false_with_only_exact_patterns() -> None:
+    # arrange
+    trie: StreamIdTrie[int] = StreamIdTrie()
+    trie.add("feed/1", 1)
+
+    # act & assert
+    assert trie.has_globs is False
+    assert trie.lookup("feed/1") == {1}
+    assert trie.lookup("feed/10") == set()
+
+
+def test_StreamIdTrie_add_invalidates_memoised_lookups() -> None:
+    # arrange
+    trie: StreamIdTrie[int] = StreamIdTrie()
+    trie.add("feed/a*", 1)
+    assert trie.lookup("feed/ab") == {1}
+
+    # act
+    trie.add("feed/*b", 2)
+
+    # assert
+    assert trie.lookup("feed/ab") == {1, 2}
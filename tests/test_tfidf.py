@@ -0,0 +1,77 @@
+"""Tests for the tfidf module."""
+
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from feedly_entries_processor.tfidf import (
+    TfidfModel,
+    load_or_build,
+    model_key,
+    tokenize,
+)
+
+EXAMPLES = (
+    "Rust compiler release improves borrow checker diagnostics",
+    "New Rust release speeds up the compiler and cargo builds",
+)
+
+
+def test_tokenize_strips_tags_and_stop_words() -> None:
+    # act
+    result = tokenize("<p>The Rust &amp; Go compilers</p> a")
+
+    # assert
+    assert result == ["rust", "go", "compilers"]
+
+
+def test_score_batch_ranks_similar_texts_higher() -> None:
+    # arrange
+    model = TfidfModel.build(EXAMPLES)
+
+    # act
+    similar, unrelated, empty = model.score_batch(
+        ["Rust compiler release notes", "Gardening tips for spring", ""]
+    )
+
+    # assert
+    assert similar > 0.3
+    assert unrelated == 0.0
+    assert empty == 0.0
+
+
+def test_load_or_build_reuses_cached_model(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    # arrange
+    built = load_or_build(EXAMPLES, tmp_path)
+    build = mocker.spy(TfidfModel, "build")
+
+    # act
+    cached = load_or_build(EXAMPLES, tmp_path)
+
+    # assert
+    assert cached == built
+    build.assert_not_called()
+    assert (tmp_path / f"tfidf-{model_key(EXAMPLES)}.json").exists()
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        pytest.param("not json", id="invalid_json"),
+        pytest.param('{"idf": {}}', id="missing_fields"),
+    ],
+)
+def test_load_or_build_rebuilds_unreadable_cache(tmp_path: Path, content: str) -> None:
+    # arrange
+    path = tmp_path / f"tfidf-{model_key(EXAMPLES)}.json"
+    path.write_text(content, encoding="utf-8")
+
+    # act
+    model = load_or_build(EXAMPLES, tmp_path)
+
+    # assert
+    assert model == TfidfModel.build(EXAMPLES)
+    assert load_or_build(EXAMPLES, tmp_path) == model
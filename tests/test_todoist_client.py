@@ -1,12 +1,24 @@
 """Tests for the Todoist client."""
 
+import json
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock
 
 import pytest
+from pytest_mock import MockerFixture
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError as RequestsConnectionError
 
 from feedly_entries_processor.exceptions import TodoistApiError
-from feedly_entries_processor.todoist_client import add_task_with_retry
+from feedly_entries_processor.todoist_client import (
+    TODOIST_SYNC_URL,
+    TodoistClientRegistry,
+    add_task_with_retry,
+    build_item_add_command,
+    extract_urls,
+    fetch_task_urls,
+    sync_commands_with_retry,
+)
 from tests.helpers import make_http_error
 
 
@@ -91,3 +103,251 @@ def test_add_task_with_retry_raises_TodoistApiError_on_400() -> None:
     assert "Todoist API request failed" in exc_info.value.args[0]
     assert exc_info.value.details["status_code"] == 400
     mock_client.add_task.assert_called_once()
+
+
+@pytest.fixture
+def mock_post(mocker: MockerFixture) -> MagicMock:
+    """Fixture for mocking the shared session's post in the Todoist client."""
+    mock: MagicMock = mocker.patch(
+        "feedly_entries_processor.todoist_client.todoist_clients.session"
+    ).return_value.post
+    return mock
+
+
+def test_build_item_add_command_includes_only_given_args() -> None:
+    # act
+    minimal = build_item_add_command(content="content", project_id="proj_1")
+    full = build_item_add_command(
+        content="content",
+        project_id="proj_1",
+        priority=4,
+        due_string="today",
+        description="description",
+        labels=frozenset({"b", "a"}),
+    )
+
+    # assert
+    assert minimal["type"] == "item_add"
+    assert minimal["args"] == {"content": "content", "project_id": "proj_1"}
+    assert full["args"] == {
+        "content": "content",
+        "project_id": "proj_1",
+        "priority": 4,
+        "due": {"string": "today"},
+        "description": "description",
+        "labels": ["a", "b"],
+    }
+    assert len({minimal["uuid"], minimal["temp_id"], full["uuid"]}) == 3
+
+
+def test_build_item_add_command_uses_given_uuid() -> None:
+    # act
+    command = build_item_add_command(
+        content="content", project_id="proj_1", command_uuid="fixed"
+    )
+
+    # assert
+    assert command["uuid"] == "fixed"
+
+
+def test_sync_commands_with_retry_posts_commands_and_returns_sync_status(
+    mock_post: MagicMock,
+) -> None:
+    # arrange
+    commands = [build_item_add_command(content="content", project_id="proj_1")]
+    mock_post.return_value.json.return_value = {
+        "sync_status": {commands[0]["uuid"]: "ok"},
+        "temp_id_mapping": {commands[0]["temp_id"]: "task_1"},
+    }
+
+    # act
+    result = sync_commands_with_retry("token", commands, project_id="proj_1")
+
+    # assert
+    assert result == {commands[0]["uuid"]: "ok"}
+    mock_post.assert_called_once()
+    assert mock_post.call_args.args == (TODOIST_SYNC_URL,)
+    assert mock_post.call_args.kwargs["headers"] == {"Authorization": "Bearer token"}
+    assert json.loads(mock_post.call_args.kwargs["data"]["commands"]) == commands
+
+
+def test_sync_commands_with_retry_retries_on_retryable_error_then_succeeds(
+    mock_post: MagicMock,
+) -> None:
+    # arrange
+    failing = MagicMock()
+    failing.raise_for_status.side_effect = make_http_error(429)
+    succeeding = MagicMock()
+    succeeding.json.return_value = {"sync_status": {}}
+    mock_post.side_effect = [failing, succeeding]
+
+    # act
+    result = sync_commands_with_retry("token", [], project_id="proj_1")
+
+    # assert
+    assert result == {}
+    assert mock_post.call_count == 2
+
+
+def test_sync_commands_with_retry_raises_TodoistApiError_on_401(
+    mock_post: MagicMock,
+) -> None:
+    # arrange
+    mock_post.return_value.raise_for_status.side_effect = make_http_error(401)
+
+    # act & assert
+    with pytest.raises(TodoistApiError) as exc_info:
+        sync_commands_with_retry("token", [], project_id="proj_1")
+
+    assert exc_info.value.details["status_code"] == 401
+    mock_post.assert_called_once()
+
+
+def test_TodoistClientRegistry_shares_one_client_per_token() -> None:
+    # arrange
+    registry = TodoistClientRegistry(pool_size=4)
+
+    # act
+    first = registry.client("token_a")
+    second = registry.client("token_a")
+    other = registry.client("token_b")
+
+    # assert
+    assert first is second
+    assert other is not first
+    adapter = registry.session("token_a").get_adapter("https://api.todoist.com")
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter._pool_maxsize == 4  # type: ignore[attr-defined]  # noqa: SLF001
+
+
+def test_TodoistClientRegistry_shares_client_across_threads() -> None:
+    # arrange
+    registry = TodoistClientRegistry()
+
+    # act
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(registry.client, ["token"] * 32))
+
+    # assert
+    assert len({id(client) for client in clients}) == 1
+
+
+def test_TodoistClientRegistry_close_closes_sessions_and_forgets_clients(
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    registry = TodoistClientRegistry()
+    client = registry.client("token")
+    close = mocker.spy(registry.session("token"), "close")
+
+    # act
+    registry.close()
+
+    # assert
+    close.assert_called_once_with()
+    assert registry.client("token") is not client
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        pytest.param(
+            "Title - https://example.com/a?b=1",
+            {"https://example.com/a?b=1"},
+            id="plain",
+        ),
+        pytest.param(
+            "[Title](http://example.com/a) and <https://example.org/b>",
+            {"http://example.com/a", "https://example.org/b"},
+            id="markdown_and_brackets",
+        ),
+        pytest.param("No link here", set(), id="none"),
+    ],
+)
+def test_extract_urls_returns_urls_in_text(text: str, expected: set[str]) -> None:
+    # act & assert
+    assert extract_urls(text) == expected
+
+
+def test_fetch_task_urls_collects_urls_from_every_page() -> None:
+    # arrange
+    mock_client = MagicMock()
+    mock_client.get_tasks.return_value = iter(
+        [
+            [MagicMock(content="A - https://example.com/a")],
+            [MagicMock(content="B - https://example.com/b"), MagicMock(content="C")],
+        ]
+    )
+
+    # act
+    result = fetch_task_urls(mock_client, "proj_1")
+
+    # assert
+    assert result == {"https://example.com/a", "https://example.com/b"}
+    mock_client.get_tasks.assert_called_once_with(project_id="proj_1", limit=200)
+
+
+def test_fetch_task_urls_raises_TodoistApiError_when_request_fails() -> None:
+    # arrange
+    mock_client = MagicMock()
+    mock_client.get_tasks.side_effect = make_http_error(403)
+
+    # act & assert
+    with pytest.raises(TodoistApiError) as exc_info:
+        fetch_task_urls(mock_client, "proj_1")
+
+    assert exc_info.value.details["status_code"] == 403
+
+
+def test_TodoistClientRegistry_url_index_is_fetched_once_per_project_until_close(
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    fetch = mocker.patch(
+        "feedly_entries_processor.todoist_client.fetch_task_urls",
+        side_effect=lambda _client, project_id: {f"https://example.com/{project_id}"},
+    )
+    registry = TodoistClientRegistry()
+
+    # act
+    first = registry.url_index("token", "proj_1")
+    first.add("https://example.com/new")
+    second = registry.url_index("token", "proj_1")
+    other = registry.url_index("token", "proj_2")
+    registry.close()
+    after_close = registry.url_index("token", "proj_1")
+
+    # assert
+    assert second is first
+    assert "https://example.com/new" in second
+    assert other == {"https://example.com/proj_2"}
+    assert after_close == {"https://example.com/proj_1"}
+    assert fetch.call_count == 3
+
+
+def test_TodoistClientRegistry_reserve_url_grants_a_url_once_until_released(
+    mocker: MockerFixture,
+) -> None:
+    # arrange
+    mocker.patch(
+        "feedly_entries_processor.todoist_client.fetch_task_urls",
+        return_value={"https://example.com/existing"},
+    )
+    registry = TodoistClientRegistry()
+    url = "https://example.com/new"
+
+    # act
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        granted = list(
+            executor.map(
+                lambda _: registry.reserve_url("token", "proj_1", url), range(32)
+            )
+        )
+    existing = registry.reserve_url("token", "proj_1", "https://example.com/existing")
+    registry.release_url("token", "proj_1", url)
+    after_release = registry.reserve_url("token", "proj_1", url)
+
+    # assert
+    assert granted.count(True) == 1
+    assert not existing
+    assert after_release
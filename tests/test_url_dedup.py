@@ -0,0 +1,145 @@
+"""Tests for the url_dedup module."""
+
+from pathlib import Path
+
+import pytest
+
+from feedly_entries_processor.ledger import SECONDS_PER_DAY
+from feedly_entries_processor.url_dedup import (
+    UrlDeduplicator,
+    canonicalize_url,
+    url_fingerprint,
+)
+from tests.helpers import FakeClock, make_entry
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        pytest.param("https://example.com/post", "example.com/post", id="drops_scheme"),
+        pytest.param(
+            "http://WWW.Example.com/post/", "example.com/post", id="host_and_slash"
+        ),
+        pytest.param(
+            "https://example.com:443/post#comments", "example.com/post", id="fragment"
+        ),
+        pytest.param(
+            "https://example.com:8080/post", "example.com:8080/post", id="custom_port"
+        ),
+        pytest.param(
+            "https://example.com/post?utm_source=rss&id=3&fbclid=x&a=1",
+            "example.com/post?a=1&id=3",
+            id="tracking_parameters",
+        ),
+        pytest.param(
+            "https://example.com/Post?UTM_Medium=feed", "example.com/Post", id="case"
+        ),
+    ],
+)
+def test_canonicalize_url(url: str, expected: str) -> None:
+    # act
+    result = canonicalize_url(url)
+
+    # assert
+    assert result == expected
+
+
+def test_url_fingerprint_is_shared_by_url_variants() -> None:
+    # act
+    fingerprints = {
+        url_fingerprint("https://example.com/post?utm_source=a"),
+        url_fingerprint("http://www.example.com/post/#top"),
+    }
+
+    # assert
+    assert len(fingerprints) == 1
+    assert url_fingerprint("https://example.com/other") not in fingerprints
+
+
+def test_filter_drops_entries_whose_url_was_seen() -> None:
+    # arrange
+    deduplicator = UrlDeduplicator()
+    entries = [
+        make_entry("all-1", url="https://example.com/post?utm_source=feed1"),
+        make_entry("all-2", url="http://example.com/post?utm_source=feed2"),
+        make_entry("other", url="https://example.com/other"),
+        make_entry("no-url-1"),
+        make_entry("no-url-2"),
+    ]
+
+    # act
+    first = [entry.id for entry in deduplicator.filter(entries)]
+    second = [
+        entry.id
+        for entry in deduplicator.filter(
+            [make_entry("saved-1", url="https://example.com/post")]
+        )
+    ]
+
+    # assert
+    assert first == ["all-1", "other", "no-url-1", "no-url-2"]
+    assert second == []
+    assert deduplicator.dropped == 2
+
+
+def test_filter_keeps_entry_that_owns_its_url_when_seen_again() -> None:
+    # arrange
+    deduplicator = UrlDeduplicator()
+    entry = make_entry("a", url="https://example.com/post")
+    list(deduplicator.filter([entry]))
+
+    # act
+    result = [
+        entry.id
+        for entry in deduplicator.filter(
+            [entry, make_entry("b", url="https://example.com/post")]
+        )
+    ]
+
+    # assert
+    assert result == ["a"]
+    assert deduplicator.dropped == 1
+
+
+def test_filter_forgets_oldest_urls_beyond_capacity() -> None:
+    # arrange
+    deduplicator = UrlDeduplicator(capacity=2)
+    urls = ["https://example.com/1", "https://example.com/2", "https://example.com/3"]
+    list(deduplicator.filter(make_entry(url, url=url) for url in urls))
+
+    # act
+    result = [
+        entry.id
+        for entry in deduplicator.filter(
+            make_entry(f"again {url}", url=url) for url in (urls[0], urls[2])
+        )
+    ]
+
+    # assert
+    assert result == ["again https://example.com/1"]
+
+
+def test_persisted_urls_are_skipped_in_later_runs_until_they_expire(
+    tmp_path: Path,
+) -> None:
+    # arrange
+    clock = FakeClock()
+    path = tmp_path / "urls.sqlite3"
+    first_run = UrlDeduplicator(path=path, ttl=SECONDS_PER_DAY, clock=clock)
+    list(first_run.filter([make_entry("a", url="https://example.com/post")]))
+    first_run.flush()
+
+    # act
+    second_run = UrlDeduplicator(path=path, ttl=SECONDS_PER_DAY, clock=clock)
+    skipped = list(second_run.filter([make_entry("b", url="https://example.com/post")]))
+    refetched = list(
+        second_run.filter([make_entry("a", url="https://example.com/post")])
+    )
+    clock.now += 2 * SECONDS_PER_DAY
+    third_run = UrlDeduplicator(path=path, ttl=SECONDS_PER_DAY, clock=clock)
+    kept = list(third_run.filter([make_entry("c", url="https://example.com/post")]))
+
+    # assert
+    assert skipped == []
+    assert [entry.id for entry in refetched] == ["a"]
+    assert [entry.id for entry in kept] == ["c"]